@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+
+import argparse
+from time import perf_counter
+from typing import Tuple
+
+import psycopg2
+
+from sdu_qm_task.etl.delta_loader import COPY_FACT_LOADER, FACT_LOADERS, DeltaLoader
+from sdu_qm_task.queries import delta_loader_queries as dl_queries
+from sdu_qm_task.queries import table_names as tables
+
+# Define the savepoint, which each measured fact load is rolled back to.
+SAVEPOINT_CMD = "SAVEPOINT benchmark"
+ROLLBACK_CMD = "ROLLBACK TO SAVEPOINT benchmark"
+
+# Fingerprints the loaded fact entries, without their creation times.
+FACT_CHECKSUM_QUERY = f"""
+SELECT COUNT(*), MD5(STRING_AGG(
+    CONCAT_WS(
+        '|', hash_id, transaction_id, user_id, date_id, transaction_time, item_id,
+        item_quantity, cost_per_item, total_cost, location_id
+    ),
+    ',' ORDER BY hash_id
+))
+FROM {tables.FACT_TRANSLATION_TABLE}
+"""
+
+
+def parse_arguments() -> argparse.Namespace:
+    """Parses command line arguments to retrieve the benchmark parameters.
+
+    Returns:
+        argparse.Namespace: parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description=(
+            "A script to compare the set-based and the COPY-based fact load on the pending delta"
+            " of the database; all changes are rolled back."
+        ),
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+
+    parser.add_argument(
+        "-n", "--repeat",
+        type=int,
+        default=3,
+        help="number of repetitions; the best one is reported."
+    )
+
+    return parser.parse_args()
+
+
+def measure(
+        delta_loader: DeltaLoader, cur: psycopg2.extensions.cursor, batch_id: int, repeat: int
+    ) -> Tuple[float, Tuple[int, str]]:
+    """Measures the best wall time of the fact load, rolling back each repetition.
+
+    Args:
+        delta_loader (DeltaLoader): delta loader with the measured fact loader.
+        cur (psycopg2.extensions.cursor): database cursor, within the transaction of the
+            benchmark.
+        batch_id (int): batch id of the fact entries.
+        repeat (int): number of repetitions.
+
+    Returns:
+        Tuple[float, Tuple[int, str]]: best wall time in seconds, and the count and checksum of
+         the fact entries after the load.
+    """
+    timings = []
+    for _ in range(repeat):
+        cur.execute(SAVEPOINT_CMD)
+        start = perf_counter()
+        delta_loader._load_facts(cur, batch_id)
+        timings.append(perf_counter() - start)
+
+        cur.execute(FACT_CHECKSUM_QUERY)
+        checksum = cur.fetchone()
+        cur.execute(ROLLBACK_CMD)
+
+    return min(timings), checksum
+
+
+def main(repeat: int) -> None:
+    """Compares the fact loaders on the pending delta of the database; e.g. after running the
+     pre-loader. The dimensions are loaded once, and all changes are rolled back at the end.
+
+    Args:
+        repeat (int): number of repetitions.
+    """
+    delta_loaders = {loader: DeltaLoader(fact_loader=loader) for loader in FACT_LOADERS}
+
+    # Stage the delta, and resolve its new locations.
+    staging_loader = delta_loaders[COPY_FACT_LOADER]
+    unique_loc_df = staging_loader.transform(staging_loader.extract())
+    batch_id = staging_loader.delta_range["max_preload_id"]
+
+    with staging_loader.psql_connection as connection:
+        try:
+            with connection.cursor() as cur:
+                delta_count = staging_loader._get_delta_load_count(cur)
+                staging_loader._upsert_locations(cur, unique_loc_df)
+                staging_loader._upsert_aliases(cur, unique_loc_df)
+                staging_loader._execute_step(
+                    cur, tables.DIM_ITEM_TABLE, dl_queries.ITEM_INSERT_CMD
+                )
+                staging_loader._ensure_partitions(cur, *staging_loader._ensure_calendar(cur))
+
+                results = {
+                    loader: measure(delta_loader, cur, batch_id, repeat)
+                    for loader, delta_loader in delta_loaders.items()
+                }
+        finally:
+            connection.rollback()
+
+    print(f"{'loader':<10}{'seconds':>10}{'rows/s':>14}")
+    for loader, (timing, _) in results.items():
+        print(f"{loader:<10}{timing:>10.3f}{delta_count / timing:>14,.0f}")
+
+    checksums = {checksum for _, checksum in results.values()}
+    print(f"Delta of {delta_count} entries, identical output: {len(checksums) == 1}.")
+
+
+if __name__ == "__main__":
+    args = parse_arguments()
+
+    main(**vars(args))
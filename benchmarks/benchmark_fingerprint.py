@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+import argparse
+from hashlib import md5
+import json
+from time import perf_counter
+from typing import Callable, List
+
+from benchmarks.synthetic_data import generate_snapshot
+from sdu_qm_task.etl.fingerprint import BLAKE2B_ALGORITHM, MD5_ALGORITHM, Fingerprinter
+
+
+def parse_arguments() -> argparse.Namespace:
+    """Parses command line arguments to retrieve the benchmark parameters.
+
+    Returns:
+        argparse.Namespace: parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="A script to compare the fingerprinting of entries.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+
+    parser.add_argument(
+        "-r", "--rows",
+        type=int,
+        default=100_000,
+        help="number of generated entries to hash."
+    )
+    parser.add_argument(
+        "-n", "--repeat",
+        type=int,
+        default=3,
+        help="number of repetitions; the best one is reported."
+    )
+
+    return parser.parse_args()
+
+
+def measure(function: Callable[[], List[str]], repeat: int) -> float:
+    """Measures the best wall time of the given function.
+
+    Args:
+        function (Callable[[], List[str]]): function to measure.
+        repeat (int): number of repetitions.
+
+    Returns:
+        float: best wall time in seconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = perf_counter()
+        function()
+        timings.append(perf_counter() - start)
+
+    return min(timings)
+
+
+def main(rows: int, repeat: int) -> None:
+    """Compares the per-entry `json.dumps` hashing with the batched fingerprints.
+
+    Args:
+        rows (int): number of generated entries to hash.
+        repeat (int): number of repetitions.
+    """
+    df = generate_snapshot(rows)
+    entries = df.to_dict("records")
+
+    md5_fingerprinter = Fingerprinter(MD5_ALGORITHM)
+    blake2b_fingerprinter = Fingerprinter(BLAKE2B_ALGORITHM)
+
+    # The per-entry hashing of the entries, as done before the batched fingerprints.
+    per_entry = [md5(json.dumps(entry).encode()).hexdigest() for entry in entries]
+    assert md5_fingerprinter.hash_frame(df).tolist() == per_entry
+
+    timings = {
+        "json.dumps + md5": measure(
+            lambda: [md5(json.dumps(entry).encode()).hexdigest() for entry in entries], repeat
+        ),
+        "to_dict + json.dumps + md5": measure(
+            lambda: [
+                md5(json.dumps(entry).encode()).hexdigest() for entry in df.to_dict("records")
+            ],
+            repeat
+        ),
+        "batched md5": measure(lambda: md5_fingerprinter.hash_frame(df), repeat),
+        "batched blake2b": measure(lambda: blake2b_fingerprinter.hash_frame(df), repeat),
+    }
+
+    print(f"{'method':<28}{'seconds':>10}{'hashes/s':>14}")
+    for method, timing in timings.items():
+        print(f"{method:<28}{timing:>10.3f}{rows / timing:>14,.0f}")
+    print("Batched md5 hashes are identical to the per-entry ones: True.")
+
+
+if __name__ == "__main__":
+    args = parse_arguments()
+
+    main(**vars(args))
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+
+import argparse
+from importlib.util import find_spec
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Callable, Tuple
+
+import pandas as pd
+
+from benchmarks.synthetic_data import generate_snapshot
+from sdu_qm_task.etl.source_reader import C_ENGINE, PYARROW_ENGINE, SourceReader
+
+# Define the name of the benchmarked source file.
+SOURCE_FILE = "benchmark.csv"
+
+
+def parse_arguments() -> argparse.Namespace:
+    """Parses command line arguments to retrieve the benchmark parameters.
+
+    Returns:
+        argparse.Namespace: parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="A script to compare the reading of source files with and without schema.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+
+    parser.add_argument(
+        "-r", "--rows",
+        type=int,
+        default=1_000_000,
+        help="number of generated entries to read."
+    )
+    parser.add_argument(
+        "-n", "--repeat",
+        type=int,
+        default=3,
+        help="number of repetitions; the best one is reported."
+    )
+
+    return parser.parse_args()
+
+
+def measure(function: Callable[[], pd.DataFrame], repeat: int) -> Tuple[float, pd.DataFrame]:
+    """Measures the best wall time of the given function.
+
+    Args:
+        function (Callable[[], pd.DataFrame]): function to measure.
+        repeat (int): number of repetitions.
+
+    Returns:
+        Tuple[float, pd.DataFrame]: best wall time in seconds, and the result of the function.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = perf_counter()
+        result = function()
+        timings.append(perf_counter() - start)
+
+    return min(timings), result
+
+
+def main(rows: int, repeat: int) -> None:
+    """Compares the parse time and the memory usage of a generated snapshot, read with inferred
+     dtypes, pruned to the source columns, and typed by the ingestion schema.
+
+    Args:
+        rows (int): number of generated entries to read.
+        repeat (int): number of repetitions.
+    """
+    with TemporaryDirectory() as folder:
+        source_file = Path(folder, SOURCE_FILE)
+        generate_snapshot(rows).to_csv(source_file, index=False)
+
+        readers = {"inferred (c)": lambda: pd.read_csv(source_file)}
+        readers[f"source ({C_ENGINE})"] = lambda: SourceReader(C_ENGINE).read(source_file)
+        if find_spec(PYARROW_ENGINE) is not None:
+            readers[f"source ({PYARROW_ENGINE})"] = (
+                lambda: SourceReader(PYARROW_ENGINE).read(source_file)
+            )
+        readers[f"schema ({C_ENGINE})"] = (
+            lambda: SourceReader.to_typed(SourceReader(C_ENGINE).read(source_file))[0]
+        )
+
+        results = {name: measure(reader, repeat) for name, reader in readers.items()}
+
+    print(f"{'reader':<20}{'seconds':>10}{'rows/s':>14}{'memory (MB)':>14}")
+    for name, (timing, df) in results.items():
+        memory = df.memory_usage(deep=True).sum() / 1024 ** 2
+        print(f"{name:<20}{timing:>10.3f}{rows / timing:>14,.0f}{memory:>14.1f}")
+
+
+if __name__ == "__main__":
+    args = parse_arguments()
+
+    main(**vars(args))
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+
+import argparse
+from time import perf_counter
+from typing import Callable, Tuple
+
+import pandas as pd
+
+from benchmarks.synthetic_data import generate_snapshot
+from sdu_qm_task.etl.pre_loader import COLUMNAR_TRANSFORM, ROW_TRANSFORM, PreLoader
+
+# Define the name of the benchmarked source file.
+SOURCE_FILE = "benchmark.csv"
+
+
+def parse_arguments() -> argparse.Namespace:
+    """Parses command line arguments to retrieve the benchmark parameters.
+
+    Returns:
+        argparse.Namespace: parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="A script to compare the row-wise and the columnar transformation.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+
+    parser.add_argument(
+        "-r", "--rows",
+        type=int,
+        default=100_000,
+        help="number of generated entries to transform."
+    )
+    parser.add_argument(
+        "-n", "--repeat",
+        type=int,
+        default=3,
+        help="number of repetitions; the best one is reported."
+    )
+
+    return parser.parse_args()
+
+
+class BenchmarkPreLoader(PreLoader):
+    """PreLoader, which does not write archives during the benchmark.
+    """
+    def _send_to_archive(self, entries) -> None:
+        pass
+
+
+def measure(function: Callable[[], pd.DataFrame], repeat: int) -> Tuple[float, pd.DataFrame]:
+    """Measures the best wall time of the given function.
+
+    Args:
+        function (Callable[[], pd.DataFrame]): function to measure.
+        repeat (int): number of repetitions.
+
+    Returns:
+        Tuple[float, pd.DataFrame]: best wall time in seconds, and the result of the function.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = perf_counter()
+        result = function()
+        timings.append(perf_counter() - start)
+
+    return min(timings), result
+
+
+def main(rows: int, repeat: int) -> None:
+    """Compares the row-wise and the columnar transformation on a generated snapshot.
+
+    Args:
+        rows (int): number of generated entries to transform.
+        repeat (int): number of repetitions.
+    """
+    df = generate_snapshot(rows)
+
+    row_loader = BenchmarkPreLoader(".", transform_mode=ROW_TRANSFORM)
+    columnar_loader = BenchmarkPreLoader(".", transform_mode=COLUMNAR_TRANSFORM)
+    columnar_loader.created_at = row_loader.created_at
+
+    # The row-wise path transforms the dictionaries created by the extraction.
+    row_time, row_df = measure(
+        lambda: row_loader.transform({SOURCE_FILE: df.to_dict("records")}), repeat
+    )
+    columnar_time, columnar_df = measure(
+        lambda: columnar_loader.transform({SOURCE_FILE: df}), repeat
+    )
+
+    pd.testing.assert_frame_equal(columnar_df, row_df)
+
+    print(f"{'mode':<10}{'seconds':>10}{'rows/s':>14}")
+    for mode, timing in [(ROW_TRANSFORM, row_time), (COLUMNAR_TRANSFORM, columnar_time)]:
+        print(f"{mode:<10}{timing:>10.3f}{rows / timing:>14,.0f}")
+    print(f"Speed-up: {row_time / columnar_time:.1f}x, identical output: True.")
+
+
+if __name__ == "__main__":
+    args = parse_arguments()
+
+    main(**vars(args))
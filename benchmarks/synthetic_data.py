@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+
+from datetime import datetime, timedelta
+import random
+
+import pandas as pd
+
+# Define the building blocks of the synthetic transaction snapshots.
+COUNTRIES = ["United Kingdom", "France", "Germany", "EIRE", "Australia", "Japan", "USA", "Unspecified"]
+DESCRIPTIONS = [
+    "RETROSPOT BABUSHKA DOORSTOP",
+    "LANTERN CREAM GAZEBO ",
+    "PINK REGENCY TEACUP AND SAUCER",
+    "ZINC WIRE KITCHEN ORGANISER",
+    None
+]
+TIMEZONES = ["IST"] * 18 + ["GMT", "UTC", "XST"]
+QUANTITIES = [-6, 1, 2, 3, 6, 12, 24]
+COSTS = [0.0, 1.25, 5.18, 6.84, 10.0]
+
+# Define the first (minute-granular) timestamp of the snapshots.
+START_TIME = datetime(2018, 1, 1)
+
+
+def generate_snapshot(rows: int, seed: int=0) -> pd.DataFrame:
+    """Generates a transaction snapshot, shaped like the source CSV files.
+
+    Args:
+        rows (int): number of entries to generate.
+        seed (int, optional): seed of the random generator. Defaults to 0.
+
+    Returns:
+        pd.DataFrame: DataFrame of the generated entries.
+    """
+    rng = random.Random(seed)
+
+    entries = []
+    for _ in range(rows):
+        transaction_time = START_TIME + timedelta(minutes=rng.randrange(0, 400 * 24 * 60, 30))
+        entries.append({
+            "UserId": rng.randint(250_000, 380_000),
+            "TransactionId": rng.randint(5_900_000, 6_400_000),
+            "TransactionTime": transaction_time.strftime(
+                f"%a %b %d %H:%M:%S {rng.choice(TIMEZONES)} %Y"
+            ),
+            "ItemCode": rng.randint(420_000, 480_000),
+            "ItemDescription": rng.choice(DESCRIPTIONS),
+            "NumberOfItemsPurchased": rng.choice(QUANTITIES),
+            "CostPerItem": rng.choice(COSTS),
+            "Country": rng.choice(COUNTRIES)
+        })
+
+    return pd.DataFrame(entries)
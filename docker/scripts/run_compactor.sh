@@ -0,0 +1,13 @@
+#!/bin/bash
+
+# Set environment variables
+source /etc/environment
+
+# Set working directory
+cd /app
+
+# Set PYTHONPATH
+export PYTHONPATH=/app/sdu_qm_task
+
+# Execute script with logging
+/usr/local/bin/python -m sdu_qm_task.etl.compactor >> /var/log/cron.log 2>&1
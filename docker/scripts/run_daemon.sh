@@ -0,0 +1,13 @@
+#!/bin/bash
+
+# Set environment variables
+source /etc/environment
+
+# Set working directory
+cd /app
+
+# Set PYTHONPATH
+export PYTHONPATH=/app/sdu_qm_task
+
+# Execute the daemon in the foreground; it handles SIGTERM on container stop
+exec /usr/local/bin/python -m sdu_qm_task.daemon
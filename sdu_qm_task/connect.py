@@ -1,16 +1,81 @@
 #!/usr/bin/env python3
 
 import os
+from threading import Lock
+from typing import Dict, Optional
 
 import psycopg2
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.pool import PoolProxiedConnection
 
 from sdu_qm_task.logger_conf import get_logger
 
 logger = get_logger(__file__)
 
+# Define the default number of pooled connections per database, and the seconds to wait for a
+#  free one.
+DEFAULT_POOL_SIZE = 5
+POOL_TIMEOUT = 30
+
+# Keep a single engine, and thus a single connection pool, per database in the process.
+_engines: Dict[str, Engine] = {}
+_engines_lock = Lock()
+
+
+def _reset_connection(dbapi_connection: psycopg2.extensions.connection, *_) -> None:
+    """Resets a connection returned to the pool; reverting its session settings and its
+     autocommit mode to the defaults, for the next user.
+
+    Args:
+        dbapi_connection (psycopg2.extensions.connection): returned database connection.
+    """
+    if dbapi_connection is not None and not dbapi_connection.closed:
+        dbapi_connection.reset()
+        dbapi_connection.autocommit = False
+
+
+def get_engine(connection_string: str, pool_size: int=DEFAULT_POOL_SIZE) -> Engine:
+    """Retrieves the process-wide engine of a database; created at first use.
+    Its connection pool is shared by the engine and all `PSQLConnection` contexts of the
+     database. The connections are health checked on checkout, and reset on return.
+
+    Args:
+        connection_string (str): connection string of the database.
+        pool_size (int, optional): number of pooled connections; only used, when the engine is
+            created. Defaults to DEFAULT_POOL_SIZE.
+
+    Returns:
+        Engine: SQLAlchemy engine of the database.
+    """
+    with _engines_lock:
+        engine = _engines.get(connection_string)
+        if engine is None:
+            engine = create_engine(
+                connection_string,
+                pool_size=pool_size,
+                max_overflow=0,
+                pool_timeout=POOL_TIMEOUT,
+                pool_pre_ping=True
+            )
+            event.listen(engine, "checkin", _reset_connection)
+            _engines[connection_string] = engine
+
+    return engine
+
+
+def dispose_engines() -> None:
+    """Disposes the engines of the process, closing their pooled connections.
+    """
+    with _engines_lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+
 
 class PSQLConnection():
     """Context manager class for managing connections to a PostgreSQL database.
+    The connections are checked out from the process-wide connection pool of the database, and
+     returned to it when exiting the context; instead of connecting each time.
     """
     def __init__(
             self,
@@ -18,7 +83,9 @@ class PSQLConnection():
             user: str=None,
             password: str=None,
             host: str=None,
-            port: str=None
+            port: str=None,
+            persistent: bool=False,
+            pool_size: Optional[int]=None
         ) -> None:
         """Initializes the PSQLConnection class with database connection parameters.
 
@@ -28,6 +95,11 @@ class PSQLConnection():
             password (str, optional): database password. Defaults to None.
             host (str, optional): database host. Defaults to None.
             port (str, optional): database port. Defaults to None.
+            persistent (bool, optional): keep the connection open when exiting the context, to
+                reuse it in the next one; e.g. in a long-running process. Defaults to False.
+            pool_size (Optional[int], optional): number of pooled connections of the database.
+                Defaults to None; read from the POSTGRES_POOL_SIZE environment variable, or
+                DEFAULT_POOL_SIZE.
         """
         logger.debug(f"Initiated {self.__class__.__name__} class.")
 
@@ -45,18 +117,57 @@ class PSQLConnection():
             "port": self.port
         }
 
+        self.persistent = persistent
+        self.pool_size = (
+            pool_size if pool_size else int(os.environ.get("POSTGRES_POOL_SIZE", DEFAULT_POOL_SIZE))
+        )
+        self.connection = None
+        self.pooled_connection: Optional[PoolProxiedConnection] = None
+
     def __enter__(self) -> psycopg2.extensions.connection:
-        """Establishes a connection to the PostgreSQL database when entering the context.
+        """Checks out a connection to the PostgreSQL database when entering the context.
+        A persistent connection is reused, as long as it responds; as the pool only health
+         checks the connections on checkout. A lost one is invalidated, freeing its slot of the
+         pool, and replaced by a new checkout.
 
         Returns:
             psycopg2.extensions.connection: database connection object.
         """
-        logger.info(f"Connecting to PostgreSQL database: {self.dbname}")
+        if self.persistent and self.pooled_connection is not None:
+            if self._ping():
+                logger.debug(f"Reusing connection to PostgreSQL database: {self.dbname}")
+                return self.connection
+
+            logger.warning(f"Lost connection to PostgreSQL database: {self.dbname}; reconnecting.")
+            self.pooled_connection.invalidate()
+            self.pooled_connection = None
+            self.connection = None
+
+        logger.debug(f"Checking out connection to PostgreSQL database: {self.dbname}")
         return self.connect()
 
+    def _ping(self) -> bool:
+        """Checks if the current database connection responds.
+
+        Returns:
+            bool: True, if the connection is open and responds to a query; False otherwise.
+        """
+        if self.connection.closed:
+            return False
+
+        try:
+            with self.connection.cursor() as cur:
+                cur.execute("SELECT 1")
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            return False
+
+        return True
+
     def __exit__(self, exception_type, exception_value, exception_traceback) -> None:
         """Handles cleanup upon exiting the context.
-        Commits any pending transactions and closes the connection.
+        Commits any pending transactions and returns the connection to the pool; or rolls them
+         back on exception. A persistent connection is only committed, or rolled back on
+         exception, and kept.
         Logs the exception details if any occurred.
 
         Args:
@@ -65,11 +176,20 @@ class PSQLConnection():
             exception_traceback (_type_): trceback of exception, if occured.
         """
         if exception_type is not None:
+            if self.connection is not None and not self.connection.closed:
+                self.connection.rollback()
+                if not self.persistent:
+                    self._release()
             raise exception_type(
                 f"{exception_type.__name__}: {exception_value}.\nTraceback: {exception_traceback}."
             )
 
-        logger.info(f"Committing and closing connection for database: {self.dbname}")
+        if self.persistent:
+            logger.debug(f"Committing connection for database: {self.dbname}")
+            self.connection.commit()
+            return
+
+        logger.debug(f"Committing and returning connection for database: {self.dbname}")
         self.close()
 
     def _get_connection(self) -> psycopg2.extensions.connection:
@@ -80,21 +200,40 @@ class PSQLConnection():
         """
         return self.connection
 
+    def get_engine(self) -> Engine:
+        """Retrieves the process-wide engine of the database, drawing from the same connection
+         pool as the contexts.
+
+        Returns:
+            Engine: SQLAlchemy engine of the database.
+        """
+        return get_engine(self.get_connection_string(), self.pool_size)
+
     def connect(self) -> psycopg2.extensions.connection:
-        """Establishes a connection to the PostgreSQL database.
+        """Checks out a connection to the PostgreSQL database from the pool.
 
         Returns:
-            psycopg2.extensions.connection: established database connection.
+            psycopg2.extensions.connection: checked out database connection.
         """
-        self.connection = psycopg2.connect(**self.config)
+        self.pooled_connection = self.get_engine().raw_connection()
+        self.connection = self.pooled_connection.dbapi_connection
         return self.connection
 
     def close(self) -> None:
-        """Commits any pending transactions and closes the database connection.
+        """Commits any pending transactions and returns the database connection to the pool.
         """
         connection = self._get_connection()
-        connection.commit()
-        connection.close()
+        if not connection.closed:
+            connection.commit()
+
+        self._release()
+
+    def _release(self) -> None:
+        """Returns the database connection to the pool, as it is.
+        """
+        self.pooled_connection.close()
+        self.pooled_connection = None
+        self.connection = None
 
     def get_connection_string(self) -> str:
         """Generates a PostgreSQL connection string.
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+
+import argparse
+import fcntl
+from pathlib import Path
+import signal
+from threading import Event
+from time import monotonic, perf_counter
+from typing import Callable, Dict, Optional, TextIO
+
+from sdu_qm_task.connect import PSQLConnection, dispose_engines
+from sdu_qm_task.etl.compactor import RETENTION_DAYS, PreloadCompactor
+from sdu_qm_task.etl.delta_loader import FACT_LOADERS, SQL_FACT_LOADER, DeltaLoader
+from sdu_qm_task.etl.fingerprint import HASH_ALGORITHMS, MD5_ALGORITHM
+from sdu_qm_task.etl.pre_loader import (
+    COPY_LOADER,
+    LOADERS,
+    ROW_TRANSFORM,
+    TRANSFORM_MODES,
+    PreLoader
+)
+from sdu_qm_task.etl.source_reader import C_ENGINE, CSV_ENGINES
+from sdu_qm_task.feeder import feeder
+from sdu_qm_task.logger_conf import get_logger
+
+logger = get_logger(__file__)
+
+# Define the base folder path relative to this script's location.
+BASE_FOLDER = Path(__file__).parents[1]
+
+# Define the default lock file, which prevents overlapping daemons.
+LOCK_FILE = "/tmp/sdu_qm_task_daemon.lock"
+
+
+def parse_arguments() -> argparse.Namespace:
+    """Parses command line arguments to retrieve the schedule and the options of the stages.
+
+    Returns:
+        argparse.Namespace: parsed arguments, containing the interval of the ticks, the number of
+         ticks, the lock file, the folders of the feeder, and the options of the pre-loader,
+         of the delta-loader and of the compactor.
+    """
+    parser = argparse.ArgumentParser(
+        description=(
+            "A daemon to run the feeder, the pre-loader, the delta-loader and the compactor"
+            " periodically, within a single long-running process."
+        ),
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+
+    parser.add_argument(
+        "-i", "--interval",
+        type=float,
+        default=60.0,
+        help="seconds between the starts of two ticks."
+    )
+    parser.add_argument(
+        "-n", "--ticks",
+        type=int,
+        default=None,
+        help="number of ticks to run; runs until stopped, if not given."
+    )
+    parser.add_argument(
+        "--lock_file",
+        type=str,
+        default=LOCK_FILE,
+        help="path/to/the lock file, which prevents overlapping daemons."
+    )
+    parser.add_argument(
+        "-s", "--source_folder",
+        type=str,
+        default=Path(BASE_FOLDER, "data_folder_source").as_posix(),
+        help="path/to/the source folder of the feeder."
+    )
+    parser.add_argument(
+        "-f", "--folder",
+        type=str,
+        default=Path(BASE_FOLDER, "data_folder_monitor").as_posix(),
+        help="path/to/the monitored folder; destination of the feeder, source of the pre-loader."
+    )
+    parser.add_argument(
+        "-t", "--transform_mode",
+        type=str,
+        choices=TRANSFORM_MODES,
+        default=ROW_TRANSFORM,
+        help="transform the entries row by row, or whole columns at once."
+    )
+    parser.add_argument(
+        "-c", "--chunk_size",
+        type=int,
+        default=None,
+        help="number of entries to read, transform, archive and load at once."
+    )
+    parser.add_argument(
+        "-l", "--loader",
+        type=str,
+        choices=LOADERS,
+        default=COPY_LOADER,
+        help="load the entries with PostgreSQL's COPY, or with row-by-row INSERTs (to_sql)."
+    )
+    parser.add_argument(
+        "-w", "--workers",
+        type=int,
+        default=1,
+        help="number of worker processes to extract and transform the source files with."
+    )
+    parser.add_argument(
+        "-a", "--hash_algorithm",
+        type=str,
+        choices=HASH_ALGORITHMS,
+        default=MD5_ALGORITHM,
+        help="algorithm of the entry fingerprints (hash_id)."
+    )
+    parser.add_argument(
+        "-e", "--csv_engine",
+        type=str,
+        choices=CSV_ENGINES,
+        default=C_ENGINE,
+        help="parser of the source files."
+    )
+    parser.add_argument(
+        "-p", "--pipeline",
+        action="store_true",
+        help="overlap the reading, transforming and loading of the pre-loader with asyncio."
+    )
+    parser.add_argument(
+        "--fact_loader",
+        type=str,
+        choices=FACT_LOADERS,
+        default=SQL_FACT_LOADER,
+        help="load the fact entries with INSERT ... SELECT, or assembled on the client with COPY."
+    )
+    parser.add_argument(
+        "--delta_workers",
+        type=int,
+        default=1,
+        help="number of connections to promote the fact entries with in parallel."
+    )
+    parser.add_argument(
+        "-r", "--retention_days",
+        type=float,
+        default=RETENTION_DAYS,
+        help="number of days to keep the promoted preload entries for, before compacting them."
+    )
+
+    return parser.parse_args()
+
+
+class PipelineDaemon():
+    """Class responsible for running the feeder, the pre-loader, the delta-loader and the
+     compactor stages periodically, within a single long-running process.
+    Imported modules, database connections and the caches of the stages are kept across the
+     ticks; a lock file prevents overlapping daemons, and the ticks of a daemon never overlap.
+    The compactor only runs after a successful delta-loader stage of the same tick.
+    """
+    def __init__(
+            self,
+            source_folder: str,
+            folder: str,
+            interval: float=60.0,
+            lock_file: str=LOCK_FILE,
+            fact_loader: str=SQL_FACT_LOADER,
+            delta_workers: int=1,
+            retention_days: float=RETENTION_DAYS,
+            **pre_loader_options
+        ) -> None:
+        """Initializes the PipelineDaemon class with the schedule and the options of the stages.
+
+        Args:
+            source_folder (str): path to the source folder of the feeder.
+            folder (str): path to the monitored folder; destination of the feeder, and source of
+                the pre-loader.
+            interval (float, optional): seconds between the starts of two ticks. Defaults to 60.
+            lock_file (str, optional): path to the lock file. Defaults to LOCK_FILE.
+            fact_loader (str, optional): fact loader of the delta-loader; either "sql" or
+                "copy". Defaults to "sql".
+            delta_workers (int, optional): number of connections of the delta-loader, to promote
+                the fact entries with in parallel. Defaults to 1.
+            retention_days (float, optional): number of days to keep the promoted preload
+                entries for, before compacting them. Defaults to RETENTION_DAYS.
+            **pre_loader_options: options of the pre-loader; see `PreLoader`.
+
+        Raises:
+            ValueError: raised if the interval is not positive.
+        """
+        logger.debug(f"Initiated {self.__class__.__name__} class.")
+
+        if interval <= 0:
+            raise ValueError(f"Interval must be positive, got: {interval}.")
+
+        self.source_folder = source_folder
+        self.folder = folder
+        self.interval = interval
+        self.lock_file = lock_file
+        self.stop_event = Event()
+
+        # Share a single, persistent database connection among the stages.
+        self.psql_connection = PSQLConnection(persistent=True)
+        self.pre_loader = PreLoader(folder, **pre_loader_options)
+        self.pre_loader.psql_connection = self.psql_connection
+        self.delta_loader = DeltaLoader(fact_loader=fact_loader, workers=delta_workers)
+        self.delta_loader.psql_connection = self.psql_connection
+        self.compactor = PreloadCompactor(retention_days)
+        self.compactor.psql_connection = self.psql_connection
+        self.delta_loaded = False
+
+    def _acquire_lock(self) -> Optional[TextIO]:
+        """Acquires the lock file, to prevent overlapping daemons.
+
+        Returns:
+            Optional[TextIO]: the opened lock file, holding the lock; or None, if another daemon
+             holds it.
+        """
+        lock = open(self.lock_file, "w")
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock.close()
+            return None
+
+        return lock
+
+    def _feed(self) -> None:
+        """Runs the feeder stage; moving the next source file into the monitored folder.
+        """
+        feeder.main(self.source_folder, self.folder)
+
+    def _pre_load(self) -> None:
+        """Runs the pre-loader stage, as a new ETL process.
+        """
+        self.pre_loader.refresh()
+        self.pre_loader.run()
+
+    def _delta_load(self) -> None:
+        """Runs the delta-loader stage; and records if it succeeded.
+        """
+        self.delta_loaded = False
+        self.delta_loader.run()
+        self.delta_loaded = True
+
+    def _compact(self) -> None:
+        """Runs the compactor stage; if the delta-loader stage succeeded.
+        """
+        if not self.delta_loaded:
+            logger.warning("Skipping the compaction, as the delta-loader stage did not succeed.")
+            return
+
+        self.compactor.run()
+
+    def _get_stages(self) -> Dict[str, Callable[[], None]]:
+        """Returns the stages of a tick, in order of execution.
+        """
+        return {
+            "feeder": self._feed,
+            "pre_loader": self._pre_load,
+            "delta_loader": self._delta_load,
+            "compactor": self._compact
+        }
+
+    def tick(self, tick_number: int) -> Dict[str, float]:
+        """Runs the stages once; a failing stage is logged, and the next stage is run.
+
+        Args:
+            tick_number (int): sequence number of the tick.
+
+        Returns:
+            Dict[str, float]: seconds spent by each stage, and in total.
+        """
+        timings = {}
+        tick_start = perf_counter()
+
+        for name, stage in self._get_stages().items():
+            stage_start = perf_counter()
+            try:
+                stage()
+            except Exception as e:
+                logger.exception(f"Stage '{name}' of tick {tick_number} failed: {e}")
+            timings[name] = perf_counter() - stage_start
+
+        timings["total"] = perf_counter() - tick_start
+        logger.info(
+            f"Tick {tick_number} finished: "
+            + ", ".join(f"{name} {seconds:.2f} s" for name, seconds in timings.items())
+            + "."
+        )
+
+        return timings
+
+    def stop(self, *_) -> None:
+        """Stops the daemon after the current tick; usable as a signal handler.
+        """
+        logger.info("Stopping the daemon after the current tick.")
+        self.stop_event.set()
+
+    def run(self, ticks: Optional[int]=None) -> None:
+        """Runs the ticks on schedule, until stopped or the given number of ticks is reached.
+        A tick, which overruns the interval, is followed by the next one immediately; the missed
+         ticks are skipped, not caught up with.
+
+        Args:
+            ticks (Optional[int], optional): number of ticks to run. Defaults to None; running
+                until stopped.
+        """
+        lock = self._acquire_lock()
+        if lock is None:
+            logger.error(f"Another daemon holds the lock: '{self.lock_file}'; exiting.")
+            return
+
+        logger.info(f"Starting the daemon with an interval of {self.interval} s.")
+        tick_number = 0
+        try:
+            next_start = monotonic()
+            while not self.stop_event.is_set() and (ticks is None or tick_number < ticks):
+                tick_number += 1
+                timings = self.tick(tick_number)
+
+                if timings["total"] > self.interval:
+                    logger.warning(
+                        f"Tick {tick_number} overran the interval of {self.interval} s."
+                    )
+
+                next_start = max(next_start + self.interval, monotonic())
+                if ticks is None or tick_number < ticks:
+                    self.stop_event.wait(next_start - monotonic())
+        finally:
+            self.pre_loader.close()
+            connection = self.psql_connection.connection
+            if connection is not None and not connection.closed:
+                self.psql_connection.close()
+            dispose_engines()
+            lock.close()
+
+        logger.info(f"Stopped the daemon after {tick_number} ticks.")
+
+
+def main(ticks: Optional[int]=None, **daemon_options) -> None:
+    """Main entry point for the script.
+    Runs the daemon until stopped by SIGTERM/SIGINT, or the given number of ticks is reached.
+
+    Args:
+        ticks (Optional[int], optional): number of ticks to run. Defaults to None.
+        **daemon_options: options of the daemon; see `PipelineDaemon`.
+    """
+    daemon = PipelineDaemon(**daemon_options)
+
+    signal.signal(signal.SIGTERM, daemon.stop)
+    signal.signal(signal.SIGINT, daemon.stop)
+
+    daemon.run(ticks)
+
+
+if __name__ == "__main__":
+    args = parse_arguments()
+
+    main(**vars(args))
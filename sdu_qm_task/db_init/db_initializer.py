@@ -1,25 +1,115 @@
 #!/usr/bin/env python3
 
+import argparse
+from datetime import date
+from time import perf_counter
 import psycopg2
-from typing import List
+from typing import Dict, List
 
 from sdu_qm_task.connect import PSQLConnection
 from sdu_qm_task.logger_conf import get_logger
+from sdu_qm_task.queries import calendar_queries as cal_queries
 from sdu_qm_task.queries import create_table_queries as ct_queries
+from sdu_qm_task.queries import index_queries as ix_queries
+from sdu_qm_task.queries import partition_queries as pt_queries
+from sdu_qm_task.queries import table_names as tables
 
 logger = get_logger(__file__)
 
+# Define the default range of the pre-generated calendar.
+CALENDAR_START = "2000-01-01"
+CALENDAR_END = "2049-12-31"
+
+# Define the default number of monthly fact partitions to create ahead of the current month.
+PARTITIONS_AHEAD = 3
+
+
+def parse_arguments() -> argparse.Namespace:
+    """Parses command line arguments to retrieve the range of the calendar and of the partitions,
+     and whether to check the indexes.
+
+    Returns:
+        argparse.Namespace: parsed arguments, containing the first and last day of the calendar,
+         the number of fact partitions to create ahead, and the index check flag.
+    """
+    parser = argparse.ArgumentParser(
+        description="A script to initialize the tables of the database.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+
+    parser.add_argument(
+        "-s", "--calendar_start",
+        type=str,
+        default=CALENDAR_START,
+        help="first day of the pre-generated calendar, in YYYY-MM-DD format."
+    )
+    parser.add_argument(
+        "-e", "--calendar_end",
+        type=str,
+        default=CALENDAR_END,
+        help="last day of the pre-generated calendar, in YYYY-MM-DD format."
+    )
+    parser.add_argument(
+        "-p", "--partitions_ahead",
+        type=int,
+        default=PARTITIONS_AHEAD,
+        help="number of monthly fact partitions to create ahead of the current month."
+    )
+    parser.add_argument(
+        "-c", "--check_indexes",
+        action="store_true",
+        help="only report the missing and unused secondary indexes, without initializing."
+    )
+
+    return parser.parse_args()
+
 
 class DBInitializer():
     """Class responsible for initializing the PostgreSQL database by creating
      the necessary tables.
-    It executes a set of predefined SQL commands to set up the schema.
+    It executes a set of predefined SQL commands to set up the schema,
+     pre-generates the calendar of the date dimension table, and creates the
+     monthly partitions of the fact table ahead of the incoming entries.
+    Afterwards, it builds the pending versions of the secondary indexes
+     concurrently; without blocking the writes to the tables of an existing
+     database.
     """
-    def __init__(self) -> None:
-        """Initializes the DBInitializer class.
+    def __init__(
+            self,
+            calendar_start: str=CALENDAR_START,
+            calendar_end: str=CALENDAR_END,
+            partitions_ahead: int=PARTITIONS_AHEAD
+        ) -> None:
+        """Initializes the DBInitializer class with the range of the calendar and of the
+         partitions.
+
+        Args:
+            calendar_start (str, optional): first day of the pre-generated calendar, in
+                YYYY-MM-DD format. Defaults to CALENDAR_START.
+            calendar_end (str, optional): last day of the pre-generated calendar, in YYYY-MM-DD
+                format. Defaults to CALENDAR_END.
+            partitions_ahead (int, optional): number of monthly fact partitions to create ahead
+                of the current month. Defaults to PARTITIONS_AHEAD.
+
+        Raises:
+            ValueError: raised if a day is invalid, the calendar range is empty, or the number of
+                partitions ahead is negative.
         """
         logger.debug(f"Initiated {self.__class__.__name__} class.")
 
+        self.calendar_start = date.fromisoformat(calendar_start)
+        self.calendar_end = date.fromisoformat(calendar_end)
+        if self.calendar_start > self.calendar_end:
+            raise ValueError(
+                f"Calendar start must not be after its end, got: {calendar_start} - {calendar_end}."
+            )
+
+        if partitions_ahead < 0:
+            raise ValueError(
+                f"Partitions ahead must not be negative, got: {partitions_ahead}."
+            )
+        self.partitions_ahead = partitions_ahead
+
         self.psql_connection = PSQLConnection()
 
     def _get_commands(self) -> List[str]:
@@ -27,12 +117,253 @@ class DBInitializer():
         """
         return [
             ct_queries.CREATE_PRELOAD_TRANSACTION,
+            ct_queries.CREATE_DUPLICATE_TRANSACTION,
+            ct_queries.CREATE_PRELOAD_MANIFEST,
+            ct_queries.ALTER_PRELOAD_MANIFEST_DUPLICATE_COUNT,
+            ct_queries.ALTER_PRELOAD_MANIFEST_CHECKPOINT_ROW,
+            ct_queries.CREATE_PRELOAD_MANIFEST_CHECKSUM_INDEX,
+            ct_queries.BACKFILL_PRELOAD_MANIFEST,
+            ct_queries.CREATE_PRELOAD_HASH_INDEX,
+            ct_queries.BACKFILL_PRELOAD_HASH_INDEX,
             ct_queries.CREATE_DIM_DATE,
             ct_queries.CREATE_DIM_ITEM,
             ct_queries.CREATE_DIM_LOCATION,
-            ct_queries.CREATE_FACT_TRANSCTION
+            ct_queries.CREATE_DIM_LOCATION_COUNTRY_NAME_INDEX,
+            ct_queries.CREATE_LOCATION_ALIAS,
+            ct_queries.BACKFILL_LOCATION_ALIAS,
+            ct_queries.CREATE_FACT_TRANSCTION,
+            ct_queries.ALTER_FACT_TRANSACTION_BATCH_ID,
+            pt_queries.CREATE_FACT_PARTITIONS_FUNCTION,
+            ct_queries.CREATE_DELTA_LOAD_STATE,
+            ct_queries.BACKFILL_DELTA_LOAD_STATE,
+            ct_queries.CREATE_CHANGE_FEED_OFFSET,
+            ct_queries.CREATE_UNIQUE_DELTA_PRELOAD,
+            ix_queries.CREATE_SECONDARY_INDEX_VERSION
+        ]
+
+    def generate_calendar(self, cur: psycopg2.extensions.cursor) -> None:
+        """Pre-generates the days of the calendar range into the date dimension table, in one
+         bulk statement; the existing days are kept.
+
+        Args:
+            cur (psycopg2.extensions.cursor): database cursor for executing queries.
+        """
+        cur.execute(
+            cal_queries.GENERATE_DIM_DATE_CMD,
+            {"start_date": self.calendar_start, "end_date": self.calendar_end}
+        )
+        logger.info(
+            f"Generated {cur.rowcount} days into '{tables.DIM_DATE_TABLE}', "
+            f"from {self.calendar_start} to {self.calendar_end}."
+        )
+
+    def create_partitions(self, cur: psycopg2.extensions.cursor) -> None:
+        """Creates the default partition of the fact table, and its monthly partitions from the
+         current month, and the given number of months ahead; the existing partitions are kept.
+
+        Args:
+            cur (psycopg2.extensions.cursor): database cursor for executing queries.
+        """
+        today = date.today()
+        month_index = today.year * 12 + today.month - 1 + self.partitions_ahead
+        start_date = today.replace(day=1)
+        end_date = date(month_index // 12, month_index % 12 + 1, 1)
+
+        cur.execute(
+            pt_queries.CREATE_FACT_PARTITIONS_CMD,
+            {"start_date": start_date, "end_date": end_date}
+        )
+        created_count = cur.fetchone()[0]
+
+        if created_count is None:
+            logger.warning(
+                f"'{tables.FACT_TRANSLATION_TABLE}' is not partitioned; it was created before "
+                "its partitioning, and has not been migrated."
+            )
+        else:
+            logger.info(
+                f"Created {created_count} partitions of '{tables.FACT_TRANSLATION_TABLE}', "
+                f"from {start_date:%Y-%m} to {end_date:%Y-%m}."
+            )
+
+    def migrate_fact_table(self, cur: psycopg2.extensions.cursor) -> None:
+        """Migrates a fact table created before its partitioning into a partitioned one; the
+         partitioned table is created, the partitions covering the dates of the entries are
+         created, the entries are copied, and the former table is dropped.
+        Runs within the transaction of the table creation, which holds the former table locked
+         until the copy is committed; so a failed migration leaves the former table in place.
+         As its secondary indexes are dropped along with it, the versions introducing indexes of
+         the fact table are built again.
+
+        Args:
+            cur (psycopg2.extensions.cursor): database cursor for executing queries.
+        """
+        cur.execute(ix_queries.TABLE_KIND_QUERY, {"table": tables.FACT_TRANSLATION_TABLE})
+        table_kind = cur.fetchone()
+        if table_kind is None or table_kind[0] != "r":
+            return
+
+        start = perf_counter()
+        logger.warning(
+            f"'{tables.FACT_TRANSLATION_TABLE}' is not partitioned; migrating it into a "
+            "partitioned table."
+        )
+
+        cur.execute(pt_queries.RENAME_UNPARTITIONED_FACT_CMD)
+        cur.execute(ct_queries.CREATE_FACT_TRANSCTION)
+
+        cur.execute(pt_queries.UNPARTITIONED_FACT_DATE_RANGE_QUERY)
+        start_date, end_date = cur.fetchone()
+        if start_date is not None:
+            cur.execute(
+                pt_queries.CREATE_FACT_PARTITIONS_CMD,
+                {"start_date": start_date, "end_date": end_date}
+            )
+
+        cur.execute(pt_queries.COPY_UNPARTITIONED_FACT_CMD)
+        copied_count = cur.rowcount
+        cur.execute(pt_queries.DROP_UNPARTITIONED_FACT_CMD)
+
+        cur.execute(
+            ix_queries.RESET_INDEX_VERSION_CMD,
+            {
+                "version": min(
+                    version for version, indexes in ix_queries.SECONDARY_INDEXES.items()
+                    if any(table == tables.FACT_TRANSLATION_TABLE for table, _ in indexes)
+                )
+            }
+        )
+
+        logger.info(
+            f"Migrated {copied_count} entries into the partitioned "
+            f"'{tables.FACT_TRANSLATION_TABLE}' in {perf_counter() - start:.2f} s."
+        )
+
+    @staticmethod
+    def _get_index_name(table: str, columns: List[str]) -> str:
+        """Returns the name of a secondary index; e.g. `idx_dim_date_date`.
+        """
+        return f"idx_{table}_{'_'.join(columns)}"
+
+    @staticmethod
+    def _build_index(
+            cur: psycopg2.extensions.cursor, index_name: str, table: str, columns: List[str]
+        ) -> None:
+        """Builds an index concurrently, if it does not exist; an invalid index, left by a failed
+         build, is dropped and rebuilt.
+
+        Args:
+            cur (psycopg2.extensions.cursor): database cursor of a connection in autocommit mode.
+            index_name (str): name of the index.
+            table (str): name of the indexed table.
+            columns (List[str]): indexed columns.
+        """
+        cur.execute(ix_queries.INVALID_INDEX_QUERY, {"index_name": index_name})
+        invalid = cur.fetchone()
+        if invalid is not None and invalid[0]:
+            logger.warning(f"Dropping invalid index '{index_name}' to rebuild it.")
+            cur.execute(ix_queries.DROP_INDEX_CONCURRENTLY_CMD.format(index_name=index_name))
+
+        cur.execute(
+            ix_queries.CREATE_INDEX_CONCURRENTLY_CMD.format(
+                index_name=index_name, table=table, columns=", ".join(columns)
+            )
+        )
+
+    def _create_index(
+            self, cur: psycopg2.extensions.cursor, table: str, columns: List[str]
+        ) -> None:
+        """Creates a secondary index concurrently.
+        As partitioned tables can not be indexed concurrently, their index is created on the
+         parent only; and the index of each partition is built concurrently, and attached to it.
+
+        Args:
+            cur (psycopg2.extensions.cursor): database cursor of a connection in autocommit mode.
+            table (str): name of the indexed table.
+            columns (List[str]): indexed columns.
+        """
+        start = perf_counter()
+        index_name = self._get_index_name(table, columns)
+
+        cur.execute(ix_queries.TABLE_KIND_QUERY, {"table": table})
+        if cur.fetchone()[0] != "p":
+            self._build_index(cur, index_name, table, columns)
+        else:
+            cur.execute(
+                ix_queries.CREATE_PARTITIONED_INDEX_CMD.format(
+                    index_name=index_name, table=table, columns=", ".join(columns)
+                )
+            )
+            cur.execute(
+                ix_queries.UNINDEXED_PARTITIONS_QUERY, {"table": table, "index_name": index_name}
+            )
+            for (partition, ) in cur.fetchall():
+                partition_index_name = self._get_index_name(partition, columns)
+                self._build_index(cur, partition_index_name, partition, columns)
+                cur.execute(
+                    ix_queries.ATTACH_INDEX_CMD.format(
+                        index_name=index_name, partition_index_name=partition_index_name
+                    )
+                )
+
+        logger.info(f"\tIndex '{index_name}' in {perf_counter() - start:.2f} s.")
+
+    def create_indexes(self) -> None:
+        """Creates the secondary indexes of the versions, which have not been applied yet; and
+         records each version, once all of its indexes are built.
+        Concurrent builds can not run inside a transaction, thus the connection is switched to
+         autocommit mode.
+        """
+        with self.psql_connection as conn:
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute(ix_queries.APPLIED_INDEX_VERSION_QUERY)
+                applied_version = cur.fetchone()[0]
+
+                for version, indexes in sorted(ix_queries.SECONDARY_INDEXES.items()):
+                    if version <= applied_version:
+                        continue
+
+                    logger.info(f"Creating the secondary indexes of version {version}.")
+                    for table, columns in indexes:
+                        self._create_index(cur, table, columns)
+
+                    cur.execute(ix_queries.RECORD_INDEX_VERSION_CMD, {"version": version})
+
+    def check_indexes(self) -> Dict[str, List[str]]:
+        """Reports the secondary indexes, which are missing or invalid, and the ones, which have
+         not been scanned since the statistics were last reset.
+
+        Returns:
+            Dict[str, List[str]]: names of the missing and of the unused indexes.
+        """
+        index_names = [
+            self._get_index_name(table, columns)
+            for indexes in ix_queries.SECONDARY_INDEXES.values()
+            for table, columns in indexes
         ]
 
+        with self.psql_connection as conn:
+            with conn.cursor() as cur:
+                cur.execute(ix_queries.INDEX_STATUS_QUERY, {"index_names": index_names})
+                index_status = cur.fetchall()
+
+        report = {
+            "missing": [name for name, is_valid, _ in index_status if not is_valid],
+            "unused": [name for name, is_valid, scans in index_status if is_valid and scans == 0]
+        }
+
+        for name in report["missing"]:
+            logger.warning(f"Secondary index '{name}' is missing or invalid.")
+        for name in report["unused"]:
+            logger.warning(f"Secondary index '{name}' has not been used.")
+        logger.info(
+            f"Checked {len(index_names)} secondary indexes: {len(report['missing'])} missing, "
+            f"{len(report['unused'])} unused."
+        )
+
+        return report
+
     def create_tables(self) -> None:
         """Executes the table creation commands in the PostgreSQL database.
         """
@@ -45,17 +376,45 @@ class DBInitializer():
                         logger.debug(command)
                         cur.execute(command)
 
+                    self.generate_calendar(cur)
+                    self.migrate_fact_table(cur)
+                    self.create_partitions(cur)
+
+            self.create_indexes()
+
         except (psycopg2.DatabaseError, Exception) as e:
             logger.exception(e)
 
 
-def main():
+def main(
+        calendar_start: str=CALENDAR_START,
+        calendar_end: str=CALENDAR_END,
+        partitions_ahead: int=PARTITIONS_AHEAD,
+        check_indexes: bool=False
+    ):
     """Main entry point for the script.
     Creates an instance of DBInitializer and runs the create_tables method
-     to set up the database schema.
+     to set up the database schema; or only checks the secondary indexes.
+
+    Args:
+        calendar_start (str, optional): first day of the pre-generated calendar.
+            Defaults to CALENDAR_START.
+        calendar_end (str, optional): last day of the pre-generated calendar.
+            Defaults to CALENDAR_END.
+        partitions_ahead (int, optional): number of monthly fact partitions to create ahead of
+            the current month. Defaults to PARTITIONS_AHEAD.
+        check_indexes (bool, optional): only report the missing and unused secondary indexes.
+            Defaults to False.
     """
-    DBInitializer().create_tables()
+    db_initializer = DBInitializer(calendar_start, calendar_end, partitions_ahead)
+
+    if check_indexes:
+        db_initializer.check_indexes()
+    else:
+        db_initializer.create_tables()
 
 
 if __name__ == '__main__':
-    main()
+    args = parse_arguments()
+
+    main(**vars(args))
@@ -44,13 +44,17 @@ class Archiver():
     @staticmethod
     def _save_to_archive(archive_file: Path, entries: List[dict]) -> None:
         """Saves the list of entries to a CSV file in the archive folder.
+        Appends to the file, if it was already created during the same process.
 
         Args:
             archive_file (Path): file path to save the data.
             entries (List[dict]): list of unconvertible entries.
         """
         archive_df = pd.DataFrame(entries)
-        archive_df.to_csv(archive_file, index=False)
+        if archive_file.exists():
+            archive_df.to_csv(archive_file, index=False, mode="a", header=False)
+        else:
+            archive_df.to_csv(archive_file, index=False)
         logger.info(f"Archived unconvertibles entries to: {archive_file.as_posix()}.")
 
     def _create_file_name(self) -> str:
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+
+import argparse
+import gzip
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+import pandas as pd
+import psycopg2
+
+from sdu_qm_task.connect import PSQLConnection
+from sdu_qm_task.etl.archiver import ARCHIVE_FOLDER
+from sdu_qm_task.logger_conf import get_logger
+from sdu_qm_task.queries import change_feed_queries as cf_queries
+from sdu_qm_task.queries import table_names as tables
+
+logger = get_logger(__file__)
+
+# Define the folder of the incremental exports; a subfolder per consumer.
+EXPORT_FOLDER = Path(ARCHIVE_FOLDER, "change_feed")
+
+# Define the default number of fact entries to fetch per round trip, and per yielded batch.
+DEFAULT_ITERSIZE = 10_000
+
+# Define the offset of a new consumer; before the batch 0 of the fact entries, which were
+#  promoted before the change feed existed.
+START_OFFSET = -1
+
+# Define the name of the server-side cursor; a single feed is read per connection.
+CURSOR_NAME = "change_feed"
+
+# Define the maximal length of a consumer name, as stored in the offset table.
+MAX_CONSUMER_LENGTH = 100
+
+# Define the available formats of the yielded batches; DataFrames, or lists of records.
+FRAME_OUTPUT = "frame"
+RECORDS_OUTPUT = "records"
+OUTPUTS = [FRAME_OUTPUT, RECORDS_OUTPUT]
+
+
+def parse_arguments() -> argparse.Namespace:
+    """Parses command line arguments to retrieve the consumer and the export folder.
+
+    Returns:
+        argparse.Namespace: parsed arguments, containing the consumer, the fetch size and the
+         export folder.
+    """
+    parser = argparse.ArgumentParser(
+        description=(
+            "A script to export the fact entries, which were promoted since the last export of"
+            " the consumer, into a compressed CSV file."
+        ),
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+
+    parser.add_argument(
+        "-c", "--consumer",
+        type=str,
+        default="export",
+        help="name of the consumer, whose offset is read and advanced."
+    )
+    parser.add_argument(
+        "-i", "--itersize",
+        type=int,
+        default=DEFAULT_ITERSIZE,
+        help="number of fact entries to fetch per round trip."
+    )
+    parser.add_argument(
+        "-f", "--folder",
+        type=str,
+        default=EXPORT_FOLDER.as_posix(),
+        help="path/to/the export folder."
+    )
+
+    return parser.parse_args()
+
+
+class ChangeFeed():
+    """Class responsible for streaming the fact entries, which were promoted since the offset of
+     a consumer.
+    Each delta_loader run tags its fact entries with its batch id (its upper preload id), and
+     advances the watermark to it, once all of them are committed. The entries of the batches
+     after the offset of the consumer, up to the watermark, are read through a server-side
+     cursor, `itersize` entries per round trip; keeping the memory of the consumer bounded.
+    The offset is only advanced by `commit`, after all batches are consumed; an interrupted
+     read is delivered again by the next one (at-least-once).
+    """
+    def __init__(
+            self,
+            consumer: str,
+            itersize: int=DEFAULT_ITERSIZE,
+            output: str=FRAME_OUTPUT
+        ) -> None:
+        """Initializes the ChangeFeed class for a consumer.
+
+        Args:
+            consumer (str): name of the consumer; its offset is kept in the database.
+            itersize (int, optional): number of fact entries to fetch per round trip, and per
+                yielded batch. Defaults to DEFAULT_ITERSIZE.
+            output (str, optional): format of the yielded batches; either "frame" or "records".
+                Defaults to "frame".
+
+        Raises:
+            ValueError: raised if the consumer name is empty or too long, the fetch size is not
+                positive, or the output format is unknown.
+        """
+        logger.debug(f"Initiated {self.__class__.__name__} class.")
+
+        if not consumer or len(consumer) > MAX_CONSUMER_LENGTH:
+            raise ValueError(
+                f"Consumer name must have 1 to {MAX_CONSUMER_LENGTH} characters, got: "
+                f"'{consumer}'."
+            )
+        if itersize < 1:
+            raise ValueError(f"Itersize must be a positive integer, got: {itersize}.")
+        if output not in OUTPUTS:
+            raise ValueError(f"Unknown output: '{output}', expected one of: {OUTPUTS}.")
+
+        self.consumer = consumer
+        self.itersize = itersize
+        self.output = output
+        self.psql_connection = PSQLConnection()
+        self.pending_range: Optional[Dict[str, Union[str, int]]] = None
+
+    def _get_batch_range(self, cur: psycopg2.extensions.cursor) -> Dict[str, Union[str, int]]:
+        """Retrieves the range of the batches to read; from the offset of the consumer to the
+         last committed batch.
+
+        Args:
+            cur (psycopg2.extensions.cursor): database cursor for executing queries.
+
+        Returns:
+            Dict[str, Union[str, int]]: the consumer, its offset as "last_batch_id" (exclusive),
+             and the last committed batch as "upper_batch_id" (inclusive).
+        """
+        cur.execute(cf_queries.CONSUMER_OFFSET_QUERY, {"consumer": self.consumer})
+        row = cur.fetchone()
+        last_batch_id = row[0] if row is not None else START_OFFSET
+
+        cur.execute(cf_queries.COMMITTED_BATCH_QUERY)
+        upper_batch_id = cur.fetchone()[0]
+
+        return {
+            "consumer": self.consumer,
+            "last_batch_id": last_batch_id,
+            "upper_batch_id": upper_batch_id
+        }
+
+    def _to_batch(
+            self, rows: List[tuple], columns: List[str]
+        ) -> Union[pd.DataFrame, List[dict]]:
+        """Converts the fetched fact entries into the output format.
+
+        Args:
+            rows (List[tuple]): fetched fact entries.
+            columns (List[str]): column names of the fact entries.
+
+        Returns:
+            Union[pd.DataFrame, List[dict]]: DataFrame, or list of records of the fact entries.
+        """
+        if self.output == RECORDS_OUTPUT:
+            return [dict(zip(columns, row)) for row in rows]
+
+        return pd.DataFrame(rows, columns=columns)
+
+    def read(self) -> Iterator[Union[pd.DataFrame, List[dict]]]:
+        """Streams the fact entries of the batches after the offset of the consumer, in order of
+         their batches. Once all of them are consumed, their range is pending for `commit`.
+
+        Yields:
+            Iterator[Union[pd.DataFrame, List[dict]]]: batches of at most `itersize` fact
+             entries.
+        """
+        self.pending_range = None
+
+        with self.psql_connection as conn:
+            with conn.cursor() as cur:
+                batch_range = self._get_batch_range(cur)
+
+            if batch_range["upper_batch_id"] <= batch_range["last_batch_id"]:
+                logger.info(f"No new fact entries for consumer '{self.consumer}'.")
+                return
+
+            logger.info(
+                f"Reading '{tables.FACT_TRANSLATION_TABLE}' for consumer '{self.consumer}': "
+                f"batches {batch_range['last_batch_id']} (exclusive) to "
+                f"{batch_range['upper_batch_id']}."
+            )
+
+            read_count = 0
+            with conn.cursor(name=CURSOR_NAME) as feed_cur:
+                feed_cur.itersize = self.itersize
+                feed_cur.execute(cf_queries.CHANGE_FEED_QUERY, batch_range)
+                while True:
+                    rows = feed_cur.fetchmany(self.itersize)
+                    if not rows:
+                        break
+
+                    read_count += len(rows)
+                    yield self._to_batch(rows, [desc[0] for desc in feed_cur.description])
+
+        logger.info(f"Read {read_count} fact entries for consumer '{self.consumer}'.")
+        self.pending_range = batch_range
+
+    def commit(self) -> None:
+        """Advances the offset of the consumer past the batches of the last completed read.
+        """
+        if self.pending_range is None:
+            return
+
+        with self.psql_connection as conn:
+            with conn.cursor() as cur:
+                cur.execute(cf_queries.UPDATE_OFFSET_CMD, self.pending_range)
+
+        logger.info(
+            f"Advanced the offset of consumer '{self.consumer}' to batch "
+            f"{self.pending_range['upper_batch_id']}."
+        )
+        self.pending_range = None
+
+    def export(self, folder: str=EXPORT_FOLDER.as_posix()) -> Optional[Path]:
+        """Exports the new fact entries of the consumer into a gzip-compressed CSV file, named
+         after their batch range; and advances the offset, once the file is complete.
+
+        Args:
+            folder (str, optional): path to the export folder. Defaults to EXPORT_FOLDER.
+
+        Returns:
+            Optional[Path]: path of the export file; or None, if there is no new fact entry.
+        """
+        export_folder = Path(folder, self.consumer)
+        export_folder.mkdir(parents=True, exist_ok=True)
+        temporary_file = Path(export_folder, f".{tables.FACT_TRANSLATION_TABLE}.csv.gz.tmp")
+
+        first_batch_id = last_batch_id = None
+        with gzip.open(temporary_file, "wt", newline="") as file:
+            for batch in self.read():
+                df = batch if self.output == FRAME_OUTPUT else pd.DataFrame(batch)
+                df.to_csv(file, header=first_batch_id is None, index=False)
+
+                if first_batch_id is None:
+                    first_batch_id = df["batch_id"].iloc[0]
+                last_batch_id = df["batch_id"].iloc[-1]
+
+        if first_batch_id is None:
+            temporary_file.unlink()
+            self.commit()
+            return None
+
+        export_file = Path(
+            export_folder,
+            f"{tables.FACT_TRANSLATION_TABLE}_{first_batch_id:010d}-{last_batch_id:010d}.csv.gz"
+        )
+        temporary_file.replace(export_file)
+        logger.info(f"Exported the new fact entries into: {export_file.as_posix()}.")
+        self.commit()
+
+        return export_file
+
+
+def main(
+        consumer: str="export",
+        itersize: int=DEFAULT_ITERSIZE,
+        folder: str=EXPORT_FOLDER.as_posix()
+    ):
+    """Main entry point for the script.
+    Creates an instance of ChangeFeed and exports the new fact entries of the consumer.
+
+    Args:
+        consumer (str, optional): name of the consumer. Defaults to "export".
+        itersize (int, optional): number of fact entries to fetch per round trip. Defaults to
+            DEFAULT_ITERSIZE.
+        folder (str, optional): path to the export folder. Defaults to EXPORT_FOLDER.
+    """
+    ChangeFeed(consumer, itersize).export(folder)
+
+
+if __name__ == "__main__":
+    args = parse_arguments()
+
+    main(**vars(args))
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+
+import argparse
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+import psycopg2
+
+from sdu_qm_task.connect import PSQLConnection
+from sdu_qm_task.etl.archiver import ARCHIVE_FOLDER
+from sdu_qm_task.logger_conf import get_logger
+from sdu_qm_task.queries import compactor_queries as cp_queries
+from sdu_qm_task.queries import table_names as tables
+
+logger = get_logger(__file__)
+
+# Define the cold store of the compacted preload entries, next to the archived unconvertibles.
+COLD_STORE_FOLDER = Path(ARCHIVE_FOLDER, tables.PRELOAD_TRANSACTION_TABLE)
+
+# Define the default number of days to keep the promoted preload entries for.
+RETENTION_DAYS = 7
+
+# Define the default number of preload entries to compact per batch (and cold store file).
+DEFAULT_BATCH_SIZE = 100_000
+
+
+def parse_arguments() -> argparse.Namespace:
+    """Parses command line arguments to retrieve the retention window and the cold store.
+
+    Returns:
+        argparse.Namespace: parsed arguments, containing the retention window, the batch size and
+         the cold store folder.
+    """
+    parser = argparse.ArgumentParser(
+        description=(
+            "A script to move the promoted preload entries, which are older than the retention"
+            " window, into compressed cold store files."
+        ),
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+
+    parser.add_argument(
+        "-r", "--retention_days",
+        type=float,
+        default=RETENTION_DAYS,
+        help="number of days to keep the promoted preload entries for."
+    )
+    parser.add_argument(
+        "-b", "--batch_size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help="number of preload entries to compact per batch, and per cold store file."
+    )
+    parser.add_argument(
+        "-f", "--folder",
+        type=str,
+        default=COLD_STORE_FOLDER.as_posix(),
+        help="path/to/the cold store folder."
+    )
+
+    return parser.parse_args()
+
+
+class PreloadCompactor():
+    """Class responsible for keeping the preload table sized to its working set.
+    The preload entries, which are promoted into the fact table (below the watermark of the
+     delta-loader) and are older than the retention window, are moved into gzip-compressed CSV
+     files of the cold store, in batches. Each batch is deleted and returned by a single
+     statement, and committed only after its file is written; a failed batch is kept in the
+     preload table.
+    """
+    def __init__(
+            self,
+            retention_days: float=RETENTION_DAYS,
+            batch_size: int=DEFAULT_BATCH_SIZE,
+            folder: str=COLD_STORE_FOLDER.as_posix()
+        ) -> None:
+        """Initializes the PreloadCompactor class with the retention window and the cold store.
+
+        Args:
+            retention_days (float, optional): number of days to keep the promoted preload
+                entries for. Defaults to RETENTION_DAYS.
+            batch_size (int, optional): number of preload entries to compact per batch.
+                Defaults to DEFAULT_BATCH_SIZE.
+            folder (str, optional): path to the cold store folder. Defaults to COLD_STORE_FOLDER.
+
+        Raises:
+            ValueError: raised if the retention window is negative, or the batch size is not
+                positive.
+        """
+        logger.debug(f"Initiated {self.__class__.__name__} class.")
+
+        if retention_days < 0:
+            raise ValueError(f"Retention days must not be negative, got: {retention_days}.")
+        if batch_size < 1:
+            raise ValueError(f"Batch size must be a positive integer, got: {batch_size}.")
+
+        self.retention_days = retention_days
+        self.batch_size = batch_size
+        self.folder = Path(folder)
+        self.psql_connection = PSQLConnection()
+
+    def _write_cold_store(self, df: pd.DataFrame) -> Path:
+        """Writes compacted preload entries into a cold store file, named after their id range.
+        The file is written under a temporary name first, so a partially written file is never
+         taken for a complete one.
+
+        Args:
+            df (pd.DataFrame): compacted preload entries, in order of their ids.
+
+        Returns:
+            Path: path of the cold store file.
+        """
+        self.folder.mkdir(parents=True, exist_ok=True)
+
+        file_name = (
+            f"{tables.PRELOAD_TRANSACTION_TABLE}_{df['id'].iloc[0]:010d}"
+            f"-{df['id'].iloc[-1]:010d}.csv.gz"
+        )
+        cold_store_file = Path(self.folder, file_name)
+        temporary_file = cold_store_file.with_name(f".{file_name}.tmp")
+
+        df.to_csv(temporary_file, index=False, compression="gzip")
+        temporary_file.replace(cold_store_file)
+
+        return cold_store_file
+
+    def _compact_batch(self, cur: psycopg2.extensions.cursor, cutoff: datetime) -> int:
+        """Moves a batch of compactable preload entries into the cold store.
+
+        Args:
+            cur (psycopg2.extensions.cursor): database cursor for executing queries.
+            cutoff (datetime): creation time, before which the promoted entries are compacted.
+
+        Returns:
+            int: number of compacted entries.
+        """
+        cur.execute(
+            cp_queries.COMPACT_PRELOAD_CMD, {"cutoff": cutoff, "batch_size": self.batch_size}
+        )
+        rows = cur.fetchall()
+        if not rows:
+            return 0
+
+        df = pd.DataFrame(rows, columns=[desc[0] for desc in cur.description])
+        df = df.sort_values("id", ignore_index=True)
+
+        cold_store_file = self._write_cold_store(df)
+        logger.info(f"Compacted {len(df)} preload entries into: {cold_store_file.as_posix()}.")
+
+        return len(df)
+
+    def run(self) -> int:
+        """Compacts the promoted preload entries, which are older than the retention window.
+
+        Returns:
+            int: number of compacted entries.
+        """
+        cutoff = datetime.now() - timedelta(days=self.retention_days)
+        logger.info(
+            f"Compacting '{tables.PRELOAD_TRANSACTION_TABLE}' entries promoted and created "
+            f"before {cutoff:%Y-%m-%d %H:%M:%S}."
+        )
+
+        compacted_count = 0
+        with self.psql_connection as conn:
+            with conn.cursor() as cur:
+                while True:
+                    batch_count = self._compact_batch(cur, cutoff)
+                    conn.commit()
+
+                    compacted_count += batch_count
+                    if batch_count < self.batch_size:
+                        break
+
+        logger.info(f"Compacted {compacted_count} preload entries in total.")
+
+        return compacted_count
+
+
+def main(
+        retention_days: float=RETENTION_DAYS,
+        batch_size: int=DEFAULT_BATCH_SIZE,
+        folder: str=COLD_STORE_FOLDER.as_posix()
+    ):
+    """Main entry point for the script.
+    Creates an instance of PreloadCompactor and runs the compaction.
+
+    Args:
+        retention_days (float, optional): number of days to keep the promoted preload entries
+            for. Defaults to RETENTION_DAYS.
+        batch_size (int, optional): number of preload entries to compact per batch. Defaults to
+            DEFAULT_BATCH_SIZE.
+        folder (str, optional): path to the cold store folder. Defaults to COLD_STORE_FOLDER.
+    """
+    PreloadCompactor(retention_days, batch_size, folder).run()
+
+
+if __name__ == "__main__":
+    args = parse_arguments()
+
+    main(**vars(args))
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+
+from datetime import datetime, timezone
+from io import StringIO
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import numpy as np
+import pandas as pd
+import psycopg2
+
+from sdu_qm_task.logger_conf import get_logger
+
+logger = get_logger(__file__)
+
+# Define the NULL marker and the separators of PostgreSQL's text COPY format.
+NULL_MARKER = "\\N"
+COLUMN_SEPARATOR = "\t"
+ROW_SEPARATOR = "\n"
+
+# Define the characters to escape in text COPY format; the backslash comes first.
+ESCAPED_CHARACTERS = {"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"}
+
+COPY_CMD = "COPY {table_name} ({columns}) FROM STDIN"
+
+
+class CopyLoader():
+    """Class responsible for bulk loading DataFrames into PostgreSQL tables with
+     `COPY ... FROM STDIN`, encoding the DataFrames in the text COPY format.
+    """
+    def __init__(self, cursor: psycopg2.extensions.cursor) -> None:
+        """Initializes the CopyLoader class with a database cursor.
+
+        Args:
+            cursor (psycopg2.extensions.cursor): database cursor for executing the COPY command.
+
+        Raises:
+            ValueError: raised if the time zone of the database session is not known by Python.
+        """
+        logger.debug(f"Initiated {self.__class__.__name__} class.")
+
+        self.cursor = cursor
+        self.session_timezone = self._get_session_timezone()
+
+    def _get_session_timezone(self) -> ZoneInfo:
+        """Retrieves the time zone of the database session.
+
+        Raises:
+            ValueError: raised if the time zone of the database session is not known by Python.
+
+        Returns:
+            ZoneInfo: time zone of the database session.
+        """
+        self.cursor.execute("SHOW TIME ZONE;")
+        session_timezone = self.cursor.fetchone()[0]
+
+        try:
+            return ZoneInfo(session_timezone)
+        except (ZoneInfoNotFoundError, ValueError) as e:
+            raise ValueError(f"Unsupported session time zone: '{session_timezone}'.") from e
+
+    @staticmethod
+    def _escape_text(column: pd.Series) -> pd.Series:
+        """Escapes the special characters of the text COPY format in a column of strings.
+
+        Args:
+            column (pd.Series): column of strings.
+
+        Returns:
+            pd.Series: column of escaped strings.
+        """
+        for character, escaped_character in ESCAPED_CHARACTERS.items():
+            column = column.str.replace(character, escaped_character, regex=False)
+
+        return column
+
+    @staticmethod
+    def _is_timestamp_column(column: pd.Series) -> bool:
+        """Checks if the column holds timestamps; either as datetime64 or as Python objects.
+
+        Args:
+            column (pd.Series): column to check.
+
+        Returns:
+            bool: True if the column holds timestamps; otherwise, False.
+        """
+        if column.dtype.kind == "M":
+            return True
+
+        first_valid_index = column.first_valid_index()
+        return (
+            column.dtype == object
+            and first_valid_index is not None
+            and isinstance(column[first_valid_index], datetime)
+        )
+
+    def _to_session_time(self, timestamp: datetime) -> datetime:
+        """Converts a timestamp to the wall time of the database session.
+        Timezone-aware timestamps are shifted, like PostgreSQL casts a TIMESTAMPTZ to a TIMESTAMP;
+         naive timestamps are kept, like PostgreSQL reads them for a TIMESTAMP column.
+
+        Args:
+            timestamp (datetime): (timezone-aware) timestamp.
+
+        Returns:
+            datetime: naive timestamp in the time zone of the database session.
+        """
+        if timestamp.tzinfo is None:
+            return timestamp
+
+        utc_time = (timestamp.replace(tzinfo=None) - timestamp.utcoffset()).replace(
+            tzinfo=timezone.utc
+        )
+        return utc_time.astimezone(self.session_timezone).replace(tzinfo=None)
+
+    def _encode_timestamps(self, column: pd.Series) -> pd.Series:
+        """Encodes a column of (timezone-aware) timestamps, converting each distinct value once.
+
+        Args:
+            column (pd.Series): column of (timezone-aware) timestamps.
+
+        Returns:
+            pd.Series: column of ISO 8601 formatted timestamps.
+        """
+        if column.dtype.kind == "M":
+            # Hand over the same Python objects as `DataFrame.to_sql` does.
+            values = np.asarray(column.array.to_pydatetime(), dtype=object)
+        else:
+            values = column.to_numpy(dtype=object)
+
+        codes, distinct_values = pd.factorize(values, use_na_sentinel=True)
+        encoded_values = np.array(
+            [self._to_session_time(value).isoformat(sep=" ") for value in distinct_values]
+            + [NULL_MARKER],
+            dtype=object
+        )
+
+        # The NA sentinel (-1) points to the NULL marker at the end.
+        return pd.Series(encoded_values[codes], index=column.index, dtype=object)
+
+    @staticmethod
+    def _encode_numbers(column: pd.Series) -> pd.Series:
+        """Encodes a numeric column; a float column of whole numbers without their fractions.
+        pandas reads an integer column with a missing value as floats; `DataFrame.to_sql` loads
+         them into an INTEGER column by an assignment cast, whereas COPY rejects e.g. `6.0`.
+
+        Args:
+            column (pd.Series): numeric column to encode.
+
+        Returns:
+            pd.Series: column of encoded values.
+        """
+        if column.dtype.kind == "f":
+            values = column.dropna().to_numpy()
+            if (
+                np.isfinite(values).all()
+                and (values == np.trunc(values)).all()
+                and (np.abs(values) < 2 ** 63).all()
+            ):
+                return column.astype("Int64").astype(str)
+
+        return column.astype(str)
+
+    def _encode_column(self, column: pd.Series) -> pd.Series:
+        """Encodes a column in the text COPY format.
+
+        Args:
+            column (pd.Series): column to encode.
+
+        Returns:
+            pd.Series: column of encoded values.
+        """
+        if self._is_timestamp_column(column):
+            return self._encode_timestamps(column)
+
+        missing = column.isna()
+
+        if column.dtype.kind in "iuf":
+            encoded_column = self._encode_numbers(column)
+        else:
+            encoded_column = self._escape_text(column.astype(object).astype(str))
+
+        return encoded_column.mask(missing, NULL_MARKER)
+
+    def _encode_frame(self, df: pd.DataFrame) -> StringIO:
+        """Encodes a DataFrame in the text COPY format.
+
+        Args:
+            df (pd.DataFrame): DataFrame to encode.
+
+        Returns:
+            StringIO: in-memory buffer of the encoded DataFrame.
+        """
+        encoded_columns = [self._encode_column(df[column]) for column in df.columns]
+
+        rows = encoded_columns[0]
+        if len(encoded_columns) > 1:
+            rows = rows.str.cat(encoded_columns[1:], sep=COLUMN_SEPARATOR)
+
+        buffer = StringIO()
+        buffer.write(ROW_SEPARATOR.join(rows))
+        buffer.write(ROW_SEPARATOR)
+        buffer.seek(0)
+
+        return buffer
+
+    def copy(self, df: pd.DataFrame, table_name: str) -> int:
+        """Bulk loads a DataFrame into a specified SQL table.
+
+        Args:
+            df (pd.DataFrame): DataFrame to load; its columns name the columns of the table.
+            table_name (str): name of the table to load the data into.
+
+        Returns:
+            int: number of loaded entries.
+        """
+        if df.empty:
+            return 0
+
+        buffer = self._encode_frame(df)
+        self.cursor.copy_expert(
+            COPY_CMD.format(table_name=table_name, columns=", ".join(df.columns)), buffer
+        )
+
+        return len(df)
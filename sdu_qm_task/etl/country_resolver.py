@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+
+from functools import lru_cache
+import unicodedata
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+import pycountry as pyc
+import pycountry_convert as pyc_c
+
+from sdu_qm_task.logger_conf import get_logger
+
+logger = get_logger(__file__)
+
+# Define the location of the country names, which can not be resolved.
+UNKNOWN_LOCATION = ("UNKNOWN", "N/A", "UNKNOWN")
+
+# Define the fields of the countries to index, in order of precedence; as `pycountry` looks them up.
+INDEX_FIELDS = ["alpha_2", "alpha_3", "name", "numeric", "official_name", "common_name"]
+
+# Define the columns of the resolved locations.
+RESOLVED_COLUMNS = ["country_name", "country_code", "continent"]
+
+
+class CountryResolver():
+    """Class responsible for resolving raw country names to locations.
+    Instead of looking up each name with `pycountry`, the names, official and common names,
+     alpha-2, alpha-3 and numeric codes of all countries, along with the configured aliases, are
+     normalized into an in-memory index once; each distinct raw name is resolved by a single
+     dictionary lookup, and cached.
+    """
+    def __init__(self, aliases: Optional[Dict[str, str]]=None) -> None:
+        """Initializes the CountryResolver class, and builds its index.
+
+        Args:
+            aliases (Optional[Dict[str, str]], optional): mapping of additional country names to
+                any indexed form of their countries; e.g. {"EIRE": "IRL"}. Defaults to None.
+
+        Raises:
+            ValueError: raised if an alias refers to an unknown country.
+        """
+        logger.debug(f"Initiated {self.__class__.__name__} class.")
+
+        self.index = self._build_index(aliases or {})
+        self.cache: Dict[str, Tuple[str, str, str]] = {}
+
+    @staticmethod
+    def _normalize(country_name: str) -> str:
+        """Normalizes a country name to its index key; case-folded, without accents, punctuation
+         and whitespace.
+
+        Args:
+            country_name (str): country name to normalize.
+
+        Returns:
+            str: index key of the country name.
+        """
+        decomposed_name = unicodedata.normalize("NFKD", country_name.casefold())
+        return "".join(character for character in decomposed_name if character.isalnum())
+
+    @staticmethod
+    def _get_continent(country_code_a2: str) -> Optional[str]:
+        """Converts a two-letter country code to its corresponding continent name.
+
+        Args:
+            country_code_a2 (str): two-letter country code (ISO 3166-1 alpha-2).
+
+        Returns:
+            Optional[str]: name of the continent; or None, if the country has no continent.
+        """
+        try:
+            continent_code = pyc_c.country_alpha2_to_continent_code(country_code_a2)
+            return pyc_c.convert_continent_code_to_continent_name(continent_code)
+        except KeyError:
+            return None
+
+    def _build_index(self, aliases: Dict[str, str]) -> Dict[str, Tuple[str, str, str]]:
+        """Builds the index of the normalized country names and codes.
+        Countries without a continent are left out, thus resolved as unknown.
+
+        Args:
+            aliases (Dict[str, str]): mapping of additional country names to any indexed form of
+             their countries.
+
+        Raises:
+            ValueError: raised if an alias refers to an unknown country.
+
+        Returns:
+            Dict[str, Tuple[str, str, str]]: mapping of the index keys to the name, alpha-3 code
+             and continent of the countries.
+        """
+        countries = []
+        for country in pyc.countries:
+            continent = self._get_continent(country.alpha_2)
+            if continent is not None:
+                countries.append((country, (country.name, country.alpha_3, continent)))
+
+        index = {}
+        for field in INDEX_FIELDS:
+            for country, location in countries:
+                value = getattr(country, field, None)
+                if value:
+                    index.setdefault(self._normalize(value), location)
+
+        for alias, target in aliases.items():
+            location = index.get(self._normalize(target))
+            if location is None:
+                raise ValueError(f"Unknown country of alias '{alias}': '{target}'.")
+            index[self._normalize(alias)] = location
+
+        logger.info(f"Indexed {len(index)} country names and codes.")
+
+        return index
+
+    def resolve(self, country_name: str) -> Tuple[str, str, str]:
+        """Resolves a raw country name; unknown names are warned about once.
+        A resolved country keeps its raw name, as the locations are stored by it.
+
+        Args:
+            country_name (str): raw country name.
+
+        Returns:
+            Tuple[str, str, str]: tuple of the country name, country code, and continent name.
+        """
+        if country_name in self.cache:
+            return self.cache[country_name]
+
+        entry = None
+        if isinstance(country_name, str):
+            entry = self.index.get(self._normalize(country_name))
+
+        if entry is None:
+            logger.warning(
+                f"Lookup failed for country: '{country_name}', marking it as 'UNKNOWN'"
+            )
+            location = UNKNOWN_LOCATION
+        else:
+            _, country_code, continent = entry
+            location = (country_name, country_code, continent)
+
+        self.cache[country_name] = location
+
+        return location
+
+    def resolve_series(self, country_names: pd.Series) -> pd.DataFrame:
+        """Resolves a Series of raw country names; each distinct name once.
+
+        Args:
+            country_names (pd.Series): raw country names.
+
+        Returns:
+            pd.DataFrame: country names, country codes and continent names, aligned with the
+             index of the Series.
+        """
+        codes, distinct_names = pd.factorize(country_names, use_na_sentinel=False)
+        locations = pd.DataFrame(
+            [self.resolve(country_name) for country_name in distinct_names],
+            columns=RESOLVED_COLUMNS
+        )
+
+        return locations.iloc[codes].set_index(country_names.index)
+
+
+@lru_cache(maxsize=1)
+def get_default_resolver() -> CountryResolver:
+    """Retrieves the resolver without aliases; built once per process.
+
+    Returns:
+        CountryResolver: the shared resolver.
+    """
+    return CountryResolver()
@@ -1,38 +1,189 @@
 #!/usr/bin/env python3
 
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
 import psycopg2
+from psycopg2.extras import execute_values
 
 from sdu_qm_task.connect import PSQLConnection
 from sdu_qm_task.logger_conf import get_logger
+from sdu_qm_task.queries import calendar_queries as cal_queries
 from sdu_qm_task.queries import delta_loader_queries as dl_queries
+from sdu_qm_task.queries import partition_queries as pt_queries
 from sdu_qm_task.queries import table_names as tables
-from sdu_qm_task.etl.location import Location
+from sdu_qm_task.etl.copy_loader import CopyLoader
+from sdu_qm_task.etl.country_resolver import CountryResolver, get_default_resolver
+from sdu_qm_task.etl.dimension_cache import DimensionCache
 
 logger = get_logger(__file__)
 
+# Define the columns of the location entries, in order of insertion.
+LOCATION_COLUMNS = ["country_code", "country_name", "continent"]
+
+# Define the columns of the location aliases; mapping the raw country names to the locations.
+ALIAS_COLUMNS = ["raw_country", "country_name"]
+
+# Define the columns of the fact entries, in order of the fact table.
+FACT_COLUMNS = [
+    "hash_id",
+    "transaction_id",
+    "user_id",
+    "date_id",
+    "transaction_time",
+    "item_id",
+    "item_quantity",
+    "cost_per_item",
+    "total_cost",
+    "location_id",
+    "created_at",
+    "batch_id"
+]
+
+# Define the available fact loaders; the set-based INSERT ... SELECT on the server, or the
+#  assembly of the fact entries on the client, loaded with COPY.
+SQL_FACT_LOADER = "sql"
+COPY_FACT_LOADER = "copy"
+FACT_LOADERS = [SQL_FACT_LOADER, COPY_FACT_LOADER]
+
+
+def parse_arguments() -> argparse.Namespace:
+    """Parses command line arguments to retrieve the fact loader and the number of workers.
+
+    Returns:
+        argparse.Namespace: parsed arguments, containing the fact loader and the number of
+         workers.
+    """
+    parser = argparse.ArgumentParser(
+        description="A script to load the new preload entries into the dimension and fact tables.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+
+    parser.add_argument(
+        "-f", "--fact_loader",
+        type=str,
+        choices=FACT_LOADERS,
+        default=SQL_FACT_LOADER,
+        help=(
+            "load the fact entries with a set-based INSERT ... SELECT, or assemble them on the"
+            " client and load them with COPY."
+        )
+    )
+    parser.add_argument(
+        "-w", "--workers",
+        type=int,
+        default=1,
+        help=(
+            "number of connections to promote the fact entries with in parallel; in shards of"
+            " the delta. Requires the 'sql' fact loader."
+        )
+    )
+
+    return parser.parse_args()
+
 
 class DeltaLoader():
     """Class responsible for loading delta data into the PostgreSQL database.
     It follows the Extract-Transform-Load (ETL) pattern; extracting new entries
      from a source table, transforming the data as needed, and loading
      it into the target tables.
+    New entries are found by a watermark; the id of the last preload entry promoted into the
+     fact table, kept in the delta load state table and advanced within the transaction of the
+     fact insert. Each run reads only the entries, which arrived after the watermark; and
+     materializes their unique set once into a staging table, read by all later steps.
+    The fact entries are loaded by a set-based INSERT ... SELECT; or assembled on the client,
+     with the keys of a dimension cache kept across runs, and loaded with COPY.
+    With multiple workers, the delta is split into disjoint preload id ranges, promoted in
+     parallel on their own connections, once the dimensions are committed. The watermark is
+     only advanced, if all shards succeeded; as the promotion skips the already loaded entries,
+     the shards committed by a failed run are skipped by the next one.
+    As the runs share the staging table, overlapping runs are serialized; each stages and
+     promotes its delta, while the others wait.
     """
-    def __init__(self) -> None:
+    def __init__(
+            self,
+            country_aliases: Optional[Dict[str, str]]=None,
+            fact_loader: str=SQL_FACT_LOADER,
+            workers: int=1
+        ) -> None:
         """Initializes the DeltaLoader class.
+
+        Args:
+            country_aliases (Optional[Dict[str, str]], optional): mapping of additional country
+                names to any form of their countries known by the country resolver; e.g.
+                {"EIRE": "IRL"}. Defaults to None.
+            fact_loader (str, optional): fact loader; either "sql" or "copy". Defaults to "sql".
+            workers (int, optional): number of connections to promote the fact entries with in
+                parallel. Defaults to 1.
+
+        Raises:
+            ValueError: raised if the fact loader is unknown, the number of workers is not
+                positive, multiple workers plus 2 exceed the connection pool size, or multiple
+                workers are combined with the "copy" fact loader.
         """
         logger.debug(f"Initiated {self.__class__.__name__} class.")
 
+        if fact_loader not in FACT_LOADERS:
+            raise ValueError(
+                f"Unknown fact loader: '{fact_loader}', expected one of: {FACT_LOADERS}."
+            )
+        if workers < 1:
+            raise ValueError(f"Number of workers must be a positive integer, got: {workers}.")
+        if workers > 1 and fact_loader != SQL_FACT_LOADER:
+            raise ValueError(
+                f"Multiple workers require the '{SQL_FACT_LOADER}' fact loader, got: "
+                f"'{fact_loader}'."
+            )
+
         self.psql_connection = PSQLConnection()
+        # The shards are promoted while the dimensions connection and the connection holding the
+        #  lock of the run are held; each needs its own.
+        if workers > 1 and workers + 2 > self.psql_connection.pool_size:
+            raise ValueError(
+                f"Number of workers plus 2 must not exceed the connection pool size "
+                f"({self.psql_connection.pool_size}), got: {workers} workers."
+            )
+        self.country_resolver = (
+            CountryResolver(country_aliases) if country_aliases else get_default_resolver()
+        )
+        self.delta_range: Optional[Dict[str, int]] = None
+        self.fact_loader = fact_loader
+        self.workers = workers
+        self.dimension_cache = DimensionCache()
+
+    @staticmethod
+    def _lock_run(cur: psycopg2.extensions.cursor) -> None:
+        """Acquires the lock of the delta_loader runs; waiting for a run in progress to finish.
+
+        Args:
+            cur (psycopg2.extensions.cursor): database cursor of a connection in autocommit mode.
+        """
+        cur.execute(dl_queries.TRY_LOCK_DELTA_RUN_QUERY)
+        if not cur.fetchone()[0]:
+            logger.info("Another delta_loader run is in progress; waiting for it to finish.")
+            cur.execute(dl_queries.LOCK_DELTA_RUN_CMD)
 
     def run(self) -> None:
         """Executes the ETL process.
+        Overlapping runs, e.g. of the daemon and of the cron job, are serialized by the lock of
+         the delta_loader runs; held by a connection of its own in autocommit mode, so it does
+         not keep a transaction open. The lock is released at the end of the run; or by the
+         server, if the connection is lost.
         """
-        delta_loc_df = self.extract()
-        unique_loc_df = self.transform(delta_loc_df)
-        self.load(unique_loc_df)
+        with PSQLConnection(**self.psql_connection.config) as lock_conn:
+            lock_conn.autocommit = True
+            with lock_conn.cursor() as cur:
+                self._lock_run(cur)
+                try:
+                    delta_loc_df = self.extract()
+                    unique_loc_df = self.transform(delta_loc_df)
+                    self.load(unique_loc_df)
+                finally:
+                    cur.execute(dl_queries.UNLOCK_DELTA_RUN_CMD)
 
     @staticmethod
     def _get_dateid_from_date(date: date) -> int:
@@ -46,6 +197,336 @@ class DeltaLoader():
         """
         return int(str(date).replace("-", ""))
 
+    @staticmethod
+    def _get_delta_range(cur: psycopg2.extensions.cursor) -> Dict[str, int]:
+        """Retrieves the range of the preload entries to promote; from the watermark to the last
+         preload entry. The range is fixed for the whole run, so entries arriving meanwhile are
+         left for the next run.
+        As the preload ids become visible at commit, not in their order, the upper bound is read
+         once the pre-loads in flight are committed; holding the new ones back, until the
+         transaction ends. Thus no entry below the upper bound is committed afterwards, and
+         skipped by the watermark.
+
+        Args:
+            cur (psycopg2.extensions.cursor): database cursor for executing queries.
+
+        Returns:
+            Dict[str, int]: the watermark as "last_preload_id" (exclusive), and the id of the last
+             preload entry as "max_preload_id" (inclusive).
+        """
+        cur.execute(dl_queries.LOCK_PRELOAD_COMMITS_CMD)
+        cur.execute(dl_queries.DELTA_RANGE_QUERY)
+        last_preload_id, max_preload_id = cur.fetchone()
+        logger.info(
+            f"Delta range of '{tables.PRELOAD_TRANSACTION_TABLE}': "
+            f"ids {last_preload_id} (exclusive) to {max_preload_id}."
+        )
+
+        return {"last_preload_id": last_preload_id, "max_preload_id": max_preload_id}
+
+    @staticmethod
+    def _execute_step(
+            cur: psycopg2.extensions.cursor,
+            step: str,
+            query: str,
+            params: Optional[dict]=None
+        ) -> None:
+        """Executes a step of the run, and reports its timing.
+
+        Args:
+            cur (psycopg2.extensions.cursor): database cursor for executing queries.
+            step (str): name of the step; e.g. the table it writes.
+            query (str): query of the step.
+            params (Optional[dict], optional): parameters of the query. Defaults to None.
+        """
+        start = perf_counter()
+        cur.execute(query, params)
+        logger.info(f"\t'{step}' in {perf_counter() - start:.2f} s ({cur.rowcount} rows).")
+
+    def _stage_delta(self, cur: psycopg2.extensions.cursor) -> Dict[str, int]:
+        """Materializes the unique entries of the delta range into the staging table, and
+         analyzes it for the planner of the later steps.
+
+        Args:
+            cur (psycopg2.extensions.cursor): database cursor for executing queries.
+
+        Returns:
+            Dict[str, int]: range of the staged preload entries.
+        """
+        delta_range = self._get_delta_range(cur)
+        # Release the pre-loads held back; the entries of the range are all committed.
+        cur.connection.commit()
+
+        logger.info(f"Staging the delta into '{tables.UNIQUE_DELTA_PRELOAD_TABLE}'.")
+        cur.execute(dl_queries.TRUNCATE_DELTA_CMD)
+        self._execute_step(
+            cur, tables.UNIQUE_DELTA_PRELOAD_TABLE, dl_queries.STAGE_DELTA_CMD, delta_range
+        )
+        cur.execute(dl_queries.ANALYZE_DELTA_CMD)
+
+        return delta_range
+
+    @staticmethod
+    def _upsert_locations(cur: psycopg2.extensions.cursor, unique_loc_df: pd.DataFrame) -> None:
+        """Inserts the new locations in a single parameterized statement; a single round trip,
+         whatever the number of locations.
+
+        Args:
+            cur (psycopg2.extensions.cursor): database cursor for executing queries.
+            unique_loc_df (pd.DataFrame): DataFrame containing unique location entries to load.
+        """
+        start = perf_counter()
+
+        locations = [
+            (position, *location) for position, location in enumerate(
+                unique_loc_df.reindex(columns=LOCATION_COLUMNS).drop_duplicates().itertuples(
+                    index=False, name=None
+                )
+            )
+        ]
+        if locations:
+            execute_values(
+                cur, dl_queries.LOCATION_UPSERT_CMD, locations, page_size=len(locations)
+            )
+
+        logger.info(
+            f"\t'{tables.DIM_LOCATION_TABLE}' in {perf_counter() - start:.2f} s "
+            f"({cur.rowcount if locations else 0} rows)."
+        )
+
+    @staticmethod
+    def _upsert_aliases(cur: psycopg2.extensions.cursor, unique_loc_df: pd.DataFrame) -> None:
+        """Maps the newly resolved raw country names to their locations in a single parameterized
+         statement; resolved or not, each raw country name is resolved only once.
+
+        Args:
+            cur (psycopg2.extensions.cursor): database cursor for executing queries.
+            unique_loc_df (pd.DataFrame): DataFrame containing unique location entries, with their
+             raw country names.
+        """
+        start = perf_counter()
+
+        aliases = list(
+            unique_loc_df.reindex(columns=ALIAS_COLUMNS).itertuples(index=False, name=None)
+        )
+        if aliases:
+            execute_values(cur, dl_queries.ALIAS_UPSERT_CMD, aliases, page_size=len(aliases))
+
+        logger.info(
+            f"\t'{tables.LOCATION_ALIAS_TABLE}' in {perf_counter() - start:.2f} s "
+            f"({cur.rowcount if aliases else 0} rows)."
+        )
+
+    def _ensure_calendar(
+            self, cur: psycopg2.extensions.cursor
+        ) -> Tuple[Optional[date], Optional[date]]:
+        """Checks if the pre-generated calendar covers every day in the date range of the staged
+         delta; and generates the missing days, if not. The existing days are kept.
+
+        Args:
+            cur (psycopg2.extensions.cursor): database cursor for executing queries.
+
+        Returns:
+            Tuple[Optional[date], Optional[date]]: first and last date of the staged delta; or
+             None, if the delta is empty.
+        """
+        cur.execute(dl_queries.CALENDAR_COVERAGE_QUERY)
+        min_date, max_date, missing_day_count = cur.fetchone()
+
+        if min_date is None:
+            return min_date, max_date
+
+        if missing_day_count > 0:
+            logger.warning(
+                f"The calendar misses {missing_day_count} days of the delta from {min_date} to "
+                f"{max_date}; generating them."
+            )
+            self._execute_step(
+                cur, tables.DIM_DATE_TABLE, cal_queries.GENERATE_DIM_DATE_CMD,
+                {"start_date": min_date, "end_date": max_date}
+            )
+
+        return min_date, max_date
+
+    @staticmethod
+    def _ensure_partitions(
+            cur: psycopg2.extensions.cursor, min_date: Optional[date], max_date: Optional[date]
+        ) -> None:
+        """Creates the monthly partitions of the fact table, which the dates of the staged delta
+         fall into, and which do not exist yet.
+
+        Args:
+            cur (psycopg2.extensions.cursor): database cursor for executing queries.
+            min_date (Optional[date]): first date of the staged delta.
+            max_date (Optional[date]): last date of the staged delta.
+        """
+        if min_date is None:
+            return
+
+        cur.execute(
+            pt_queries.CREATE_FACT_PARTITIONS_CMD,
+            {"start_date": min_date, "end_date": max_date}
+        )
+        created_count = cur.fetchone()[0]
+
+        if created_count:
+            logger.info(
+                f"Created {created_count} partitions of '{tables.FACT_TRANSLATION_TABLE}' "
+                f"for the delta from {min_date} to {max_date}."
+            )
+
+    def _assemble_facts(
+            self, cur: psycopg2.extensions.cursor, delta_df: pd.DataFrame, batch_id: int
+        ) -> pd.DataFrame:
+        """Assembles the fact entries of the staged delta on the client; computing their foreign
+         keys and total costs column-wise, with the keys of the dimension cache.
+
+        Args:
+            cur (psycopg2.extensions.cursor): database cursor for executing queries.
+            delta_df (pd.DataFrame): entries of the staged delta.
+            batch_id (int): batch id of the run.
+
+        Returns:
+            pd.DataFrame: fact entries, in the columns of the fact table.
+        """
+        self.dimension_cache.refresh(cur, delta_df["country"])
+
+        fact_df = delta_df.assign(
+            date_id=self.dimension_cache.get_date_ids(delta_df["transaction_time"]),
+            item_id=delta_df["item_code"],
+            # The costs are exact decimals; multiplied like the DECIMAL columns of the database.
+            total_cost=delta_df["item_quantity"] * delta_df["cost_per_item"],
+            location_id=self.dimension_cache.get_location_ids(delta_df["country"]),
+            batch_id=batch_id
+        )
+
+        return fact_df[FACT_COLUMNS]
+
+    def _copy_facts(self, cur: psycopg2.extensions.cursor, batch_id: int) -> None:
+        """Loads the fact entries of the staged delta with COPY, after assembling them on the
+         client. If any of them is already loaded, the COPY is rolled back, and the entries are
+         loaded with the conflict-skipping insert instead.
+
+        Args:
+            cur (psycopg2.extensions.cursor): database cursor for executing queries.
+            batch_id (int): batch id of the run.
+        """
+        start = perf_counter()
+
+        cur.execute(dl_queries.FACT_SOURCE_QUERY)
+        delta_df = pd.DataFrame(cur.fetchall(), columns=[desc[0] for desc in cur.description])
+        fact_df = self._assemble_facts(cur, delta_df, batch_id)
+
+        cur.execute(dl_queries.FACT_COPY_SAVEPOINT_CMD)
+        try:
+            loaded_count = CopyLoader(cur).copy(fact_df, tables.FACT_TRANSLATION_TABLE)
+        except psycopg2.errors.UniqueViolation:
+            logger.warning(
+                f"Some entries are already loaded into '{tables.FACT_TRANSLATION_TABLE}'; "
+                "loading the delta with the conflict-skipping insert instead."
+            )
+            cur.execute(dl_queries.ROLLBACK_FACT_COPY_CMD)
+            self._execute_step(
+                cur, tables.FACT_TRANSLATION_TABLE, dl_queries.FACT_INSERT_CMD,
+                {"batch_id": batch_id}
+            )
+            return
+
+        cur.execute(dl_queries.RELEASE_FACT_COPY_CMD)
+        logger.info(
+            f"\t'{tables.FACT_TRANSLATION_TABLE}' in {perf_counter() - start:.2f} s "
+            f"({loaded_count} rows, with COPY)."
+        )
+
+    def _load_facts(self, cur: psycopg2.extensions.cursor, batch_id: int) -> None:
+        """Loads the fact entries of the staged delta with the configured fact loader.
+
+        Args:
+            cur (psycopg2.extensions.cursor): database cursor for executing queries.
+            batch_id (int): batch id of the run; its upper preload id.
+        """
+        if self.fact_loader == COPY_FACT_LOADER:
+            self._copy_facts(cur, batch_id)
+        else:
+            self._execute_step(
+                cur, tables.FACT_TRANSLATION_TABLE, dl_queries.FACT_INSERT_CMD,
+                {"batch_id": batch_id}
+            )
+
+    def _get_shards(self, delta_range: Dict[str, int]) -> List[Dict[str, int]]:
+        """Splits the preload id range of the delta into disjoint shards of equal width; one per
+         worker.
+
+        Args:
+            delta_range (Dict[str, int]): watermark and upper bound of the delta.
+
+        Returns:
+            List[Dict[str, int]]: exclusive lower and inclusive upper preload id of each shard.
+        """
+        lower_id = delta_range["last_preload_id"]
+        width = delta_range["max_preload_id"] - lower_id
+        bounds = [lower_id + width * shard // self.workers for shard in range(self.workers + 1)]
+
+        return [
+            {"lower_id": lower, "upper_id": upper}
+            for lower, upper in zip(bounds[:-1], bounds[1:])
+            if upper > lower
+        ]
+
+    def _promote_shard(self, shard: Dict[str, int], batch_id: int) -> int:
+        """Promotes a shard of the staged delta into the fact table; on its own connection, and
+         in its own transaction.
+
+        Args:
+            shard (Dict[str, int]): preload id range of the shard.
+            batch_id (int): batch id of the run.
+
+        Returns:
+            int: number of promoted entries.
+        """
+        with PSQLConnection(**self.psql_connection.config) as conn:
+            with conn.cursor() as cur:
+                cur.execute(dl_queries.FACT_SHARD_INSERT_CMD, {**shard, "batch_id": batch_id})
+                return cur.rowcount
+
+    def _promote_shards(self, delta_range: Dict[str, int]) -> None:
+        """Promotes the shards of the staged delta in parallel, and waits for all of them.
+
+        Args:
+            delta_range (Dict[str, int]): watermark and upper bound of the delta.
+
+        Raises:
+            RuntimeError: raised if any of the shards failed; the committed shards are kept.
+        """
+        start = perf_counter()
+        shards = self._get_shards(delta_range)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = [
+                executor.submit(self._promote_shard, shard, delta_range["max_preload_id"])
+                for shard in shards
+            ]
+
+        promoted_count = 0
+        failures = []
+        for shard, future in zip(shards, futures):
+            try:
+                promoted_count += future.result()
+            except Exception as e:
+                logger.error(f"Promotion of shard {shard} failed: {e}")
+                failures.append(e)
+
+        if failures:
+            raise RuntimeError(
+                f"{len(failures)} of {len(shards)} shards of '{tables.FACT_TRANSLATION_TABLE}' "
+                "failed; the watermark is kept."
+            ) from failures[0]
+
+        logger.info(
+            f"\t'{tables.FACT_TRANSLATION_TABLE}' in {perf_counter() - start:.2f} s "
+            f"({promoted_count} rows, in {len(shards)} shards)."
+        )
+
     @staticmethod
     def _get_delta_load_count(cur: psycopg2.extensions.cursor) -> int:
         """Retrieves the count of new entries in the delta table.
@@ -74,6 +555,7 @@ class DeltaLoader():
 
         with self.psql_connection as conn:
             with conn.cursor() as cur:
+                self.delta_range = self._stage_delta(cur)
                 cur.execute(dl_queries.LOCATION_QUERY)
                 delta_loc_extract = [item for item in cur.fetchall()]
                 delta_loc_cols = [desc[0] for desc in cur.description]
@@ -94,7 +576,8 @@ class DeltaLoader():
             delta_loc_df (pd.DataFrame): DataFrame containing extracted location entries.
 
         Returns:
-            pd.DataFrame: DataFrame with transformed, unique location entries.
+            pd.DataFrame: DataFrame with transformed, unique location entries, along with their
+             raw country names.
         """
         if delta_loc_df.empty:
             logger.info("No location entry to be transformed.")
@@ -103,68 +586,71 @@ class DeltaLoader():
         else:
             logger.info("Transforming new location entries.")
 
-            location_data = []
-            for _, row in delta_loc_df.iterrows():
-                location = Location(row.country)
-
-                location_data.append({
-                    "country_code": location.country_code,
-                    "country_name": location.country_name,
-                    "continent": location.continent
-                })
-
-            loc_df = pd.DataFrame(data=location_data, columns=list(location_data[0].keys()))
-            unique_loc_df = loc_df[loc_df.duplicated() == False]
+            # Resolve each distinct raw country name once, with the in-memory index.
+            loc_df = self.country_resolver.resolve_series(delta_loc_df["country"])
+            loc_df.insert(0, "raw_country", delta_loc_df["country"])
+            unique_loc_df = loc_df.drop_duplicates(subset="raw_country")
 
             logger.info(f"Transformed {len(unique_loc_df)} new, unique location entries.")
 
-            return unique_loc_df.reindex()
+            return unique_loc_df.reset_index(drop=True)
 
     def load(self, unique_loc_df: pd.DataFrame) -> None:
         """Loads the transformed DataFrame into the PostgreSQL database.
 
         Args:
-            unique_loc_df (pd.DataFrame): DataFrame containing unique location entries to load.
+            unique_loc_df (pd.DataFrame): DataFrame containing unique location entries to load,
+             along with their raw country names.
         """
-        unique_countries = unique_loc_df[unique_loc_df.duplicated() == False]
-
         with self.psql_connection as conn:
             with conn.cursor() as cur:
+                # Keep the staged delta of the extraction; or stage it, if not extracted before.
+                delta_range = self.delta_range or self._stage_delta(cur)
+                self.delta_range = None
+
                 # Check for new entries before loading.
                 if self._get_delta_load_count(cur) == 0:
                     logger.info("Skipping insertion as there is no new entry.")
                 else:
                     logger.info("Starting insertion into tables.")
 
-                    logger.info(f"\t'{tables.DIM_LOCATION_TABLE}'")
-                    for _, row in unique_countries.iterrows():
-                        cur.execute(dl_queries.LOCATION_INSERT_CMD.format(
-                            columns=f"{', '.join(unique_countries.columns)}",
-                            values=f"{"', '".join([t for t in row.values])}",
-                            country_name=row.country_name
-                        ))
-
-                    logger.info(f"\t'{tables.DIM_ITEM_TABLE}'")
-                    cur.execute(dl_queries.ITEM_INSERT_CMD)
+                    self._upsert_locations(cur, unique_loc_df)
+                    self._upsert_aliases(cur, unique_loc_df)
+                    self._execute_step(cur, tables.DIM_ITEM_TABLE, dl_queries.ITEM_INSERT_CMD)
+                    min_date, max_date = self._ensure_calendar(cur)
+                    self._ensure_partitions(cur, min_date, max_date)
 
-                    logger.info(f"\t'{tables.DIM_DATE_TABLE}'")
-                    cur.execute(dl_queries.DATE_INSERT_CMD)
-
-                    # Commit changes to be available for the fact table.
+                    # Commit changes to be available for the fact table; and for the shards.
                     conn.commit()
 
-                    logger.info(f"\t'{tables.FACT_TRANSLATION_TABLE}'")
-                    cur.execute(dl_queries.FACT_INSERT_CMD)
+                    if self.workers > 1:
+                        self._promote_shards(delta_range)
+                    else:
+                        self._load_facts(cur, delta_range["max_preload_id"])
+
+                    # Advance the watermark within the transaction of the fact insert; or once
+                    #  all shards are committed.
+                    self._execute_step(
+                        cur, tables.DELTA_LOAD_STATE_TABLE, dl_queries.UPDATE_WATERMARK_CMD,
+                        delta_range
+                    )
 
                     logger.info("Insertion finished.")
 
 
-def main():
+def main(fact_loader: str=SQL_FACT_LOADER, workers: int=1):
     """Main entry point for the script.
     Creates an instance of DeltaLoader and runs the ETL process.
+
+    Args:
+        fact_loader (str, optional): fact loader; either "sql" or "copy". Defaults to "sql".
+        workers (int, optional): number of connections to promote the fact entries with in
+            parallel. Defaults to 1.
     """
-    DeltaLoader().run()
+    DeltaLoader(fact_loader=fact_loader, workers=workers).run()
 
 
 if __name__ == "__main__":
-    main()
+    args = parse_arguments()
+
+    main(**vars(args))
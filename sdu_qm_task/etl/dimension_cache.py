@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+
+from typing import Dict, Optional
+
+import pandas as pd
+import psycopg2
+
+from sdu_qm_task.logger_conf import get_logger
+from sdu_qm_task.queries import delta_loader_queries as dl_queries
+
+logger = get_logger(__file__)
+
+
+class DimensionCache():
+    """Class responsible for keeping the keys of the dimension tables in memory, to assemble the
+     fact entries on the client.
+    The item ids are the item codes, and the date ids are computed from the transaction times;
+     only the location ids of the raw country names have to be looked up. They are kept across
+     the runs of a long-running process, and only the raw country names, which are not cached
+     yet, are looked up in the location alias table.
+    """
+    def __init__(self) -> None:
+        """Initializes the DimensionCache class with empty maps.
+        """
+        logger.debug(f"Initiated {self.__class__.__name__} class.")
+
+        self.location_ids: Dict[str, int] = {}
+        self.unknown_location_id: Optional[int] = None
+
+    def refresh(self, cur: psycopg2.extensions.cursor, raw_countries: pd.Series) -> None:
+        """Looks up the location ids of the raw country names, which are not cached yet; and the
+         id of the unknown location, if not cached yet.
+        Raw country names without an alias are not cached, as they may be mapped later.
+
+        Args:
+            cur (psycopg2.extensions.cursor): database cursor for executing queries.
+            raw_countries (pd.Series): raw country names of the fact entries.
+        """
+        missing_countries = [
+            country for country in raw_countries.dropna().unique()
+            if country not in self.location_ids
+        ]
+        if missing_countries:
+            cur.execute(dl_queries.LOCATION_KEYS_QUERY, {"raw_countries": missing_countries})
+            self.location_ids.update(cur.fetchall())
+
+        if self.unknown_location_id is None:
+            cur.execute(dl_queries.UNKNOWN_LOCATION_KEY_QUERY)
+            row = cur.fetchone()
+            self.unknown_location_id = row[0] if row is not None else None
+
+        logger.info(
+            f"Looked up {len(missing_countries)} raw country names; "
+            f"{len(self.location_ids)} location keys are cached."
+        )
+
+    def get_location_ids(self, raw_countries: pd.Series) -> pd.Series:
+        """Maps the raw country names to their location ids; the names without an alias, and the
+         missing ones, to the unknown location.
+
+        Args:
+            raw_countries (pd.Series): raw country names of the fact entries.
+
+        Returns:
+            pd.Series: location ids, aligned with the index of the Series.
+        """
+        location_ids = raw_countries.map(self.location_ids).astype("Int64")
+
+        if self.unknown_location_id is None:
+            return location_ids
+
+        return location_ids.fillna(self.unknown_location_id)
+
+    @staticmethod
+    def get_date_ids(transaction_times: pd.Series) -> pd.Series:
+        """Computes the YYYYMMDD date ids of the transaction times.
+
+        Args:
+            transaction_times (pd.Series): transaction times of the fact entries.
+
+        Returns:
+            pd.Series: date ids, aligned with the index of the Series.
+        """
+        timestamps = pd.to_datetime(transaction_times).dt
+
+        return timestamps.year * 10000 + timestamps.month * 100 + timestamps.day
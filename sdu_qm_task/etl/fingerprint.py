@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+
+from functools import partial
+import hashlib
+import json
+from json.encoder import encode_basestring_ascii
+from typing import Callable, List
+
+import numpy as np
+import pandas as pd
+
+from sdu_qm_task.logger_conf import get_logger
+
+logger = get_logger(__file__)
+
+# Define the available hash algorithms.
+MD5_ALGORITHM = "md5"
+BLAKE2B_ALGORITHM = "blake2b"
+HASH_ALGORITHMS = [MD5_ALGORITHM, BLAKE2B_ALGORITHM]
+
+# Define the digest size of blake2b in bytes; its hex digest fits the CHAR(32) hash_id columns.
+BLAKE2B_DIGEST_SIZE = 16
+
+# Define the JSON representation of missing values; as pandas infers NaN for them.
+NAN_JSON = json.dumps(float("nan"))
+
+# Define the separators `json.dumps` uses by default.
+ITEM_SEPARATOR = ", "
+KEY_SEPARATOR = ": "
+
+
+class Fingerprinter():
+    """Class responsible for computing the `hash_id` fingerprints of entries.
+    The entries are serialized column by column into the exact JSON document `json.dumps` would
+     produce for each of them, and hashed in a single pass over the serialized rows.
+    The "md5" algorithm keeps the keys in source order, reproducing the historical MD5 hashes;
+     the "blake2b" algorithm sorts the keys, so its hashes do not depend on the column order.
+    """
+    def __init__(self, algorithm: str=MD5_ALGORITHM) -> None:
+        """Initializes the Fingerprinter class with the hash algorithm.
+
+        Args:
+            algorithm (str, optional): hash algorithm; either "md5" or "blake2b".
+                Defaults to "md5".
+
+        Raises:
+            ValueError: raised if the hash algorithm is unknown.
+        """
+        logger.debug(f"Initiated {self.__class__.__name__} class.")
+
+        if algorithm not in HASH_ALGORITHMS:
+            raise ValueError(
+                f"Unknown hash algorithm: '{algorithm}', expected one of: {HASH_ALGORITHMS}."
+            )
+
+        self.algorithm = algorithm
+        self.sort_keys = algorithm != MD5_ALGORITHM
+        self._hash = self._get_hash_function(algorithm)
+
+    @staticmethod
+    def _get_hash_function(algorithm: str) -> Callable[[bytes], "hashlib._Hash"]:
+        """Selects the constructor of the hash object of a serialized entry.
+
+        Args:
+            algorithm (str): hash algorithm; either "md5" or "blake2b".
+
+        Returns:
+            Callable[[bytes], hashlib._Hash]: constructor of the hash object, whose hex digest is
+             32 characters long.
+        """
+        if algorithm == BLAKE2B_ALGORITHM:
+            return partial(hashlib.blake2b, digest_size=BLAKE2B_DIGEST_SIZE)
+
+        return hashlib.md5
+
+    @staticmethod
+    def _serialize_column(column: pd.Series) -> List[str]:
+        """Serializes the values of a column, as `json.dumps` serializes them.
+
+        Args:
+            column (pd.Series): column to serialize.
+
+        Returns:
+            List[str]: JSON representations of the values.
+        """
+        if column.dtype.kind in "iu" and column.hasnans:
+            # Nullable integers with missing values are hashed as the float64 values pandas
+            #  infers for such columns without an ingestion schema.
+            return Fingerprinter._serialize_column(column.astype("float64"))
+
+        # `tolist` hands over the same Python objects as `DataFrame.to_dict` does.
+        values = column.tolist()
+
+        if column.dtype.kind in "iu":
+            return list(map(str, values))
+
+        if column.dtype.kind == "f":
+            serialized_values = list(map(float.__repr__, values))
+            # Non-finite floats are spelled as NaN/Infinity by `json.dumps`.
+            for position in np.flatnonzero(~np.isfinite(column.to_numpy())):
+                serialized_values[position] = json.dumps(values[position])
+            return serialized_values
+
+        try:
+            return list(map(encode_basestring_ascii, values))
+        except TypeError:
+            # Not only strings, e.g. missing values; serialize the other values one by one.
+            return [
+                encode_basestring_ascii(value) if type(value) is str
+                else NAN_JSON if value is pd.NA
+                else json.dumps(value)
+                for value in values
+            ]
+
+    def _get_template(self, columns: List[str]) -> str:
+        """Creates the %-format template of the JSON document of an entry.
+
+        Args:
+            columns (List[str]): keys of the entries, in order of serialization.
+
+        Returns:
+            str: template with a placeholder for the serialized value of each key.
+        """
+        items = [
+            (encode_basestring_ascii(str(column)) + KEY_SEPARATOR).replace("%", "%%") + "%s"
+            for column in columns
+        ]
+        return "{" + ITEM_SEPARATOR.join(items) + "}"
+
+    def _serialize_frame(self, df: pd.DataFrame) -> List[str]:
+        """Serializes the entries of a DataFrame, column by column.
+
+        Args:
+            df (pd.DataFrame): entries to serialize.
+
+        Returns:
+            List[str]: JSON documents of the entries.
+        """
+        columns = sorted(df.columns) if self.sort_keys else list(df.columns)
+        if not columns:
+            return ["{}"] * len(df)
+
+        template = self._get_template(columns)
+        serialized_columns = [self._serialize_column(df[column]) for column in columns]
+
+        return [template % values for values in zip(*serialized_columns)]
+
+    def hash_entry(self, entry: dict) -> str:
+        """Computes the fingerprint of a single entry.
+
+        Args:
+            entry (dict): entry to hash.
+
+        Returns:
+            str: hex digest of the entry.
+        """
+        return self._hash(json.dumps(entry, sort_keys=self.sort_keys).encode()).hexdigest()
+
+    def hash_frame(self, df: pd.DataFrame) -> pd.Series:
+        """Computes the fingerprints of all entries of a DataFrame.
+
+        Args:
+            df (pd.DataFrame): entries to hash.
+
+        Returns:
+            pd.Series: hex digests of the entries, aligned with the index of the DataFrame.
+        """
+        hash_function = self._hash
+        return pd.Series(
+            [
+                hash_function(document.encode()).hexdigest()
+                for document in self._serialize_frame(df)
+            ],
+            index=df.index,
+            dtype=object
+        )
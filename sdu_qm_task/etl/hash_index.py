@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+
+from datetime import datetime
+
+import pandas as pd
+import psycopg2
+
+from sdu_qm_task.logger_conf import get_logger
+from sdu_qm_task.queries import pre_loader_queries as pl_queries
+
+logger = get_logger(__file__)
+
+# Define the default number of fingerprints to look up and register per query.
+DEFAULT_BATCH_SIZE = 10_000
+
+
+class HashIndex():
+    """Class responsible for rejecting duplicate entries at ingest time, by their fingerprints.
+    The fingerprints of all loaded entries are kept in the hash index table, whose primary key
+     decides which entries are new: the fingerprints are inserted in batches with
+     `ON CONFLICT DO NOTHING`, and only the inserted ones are returned; looking up and
+     registering them in a single round trip per batch.
+    """
+    def __init__(self, created_at: datetime, batch_size: int=DEFAULT_BATCH_SIZE) -> None:
+        """Initializes the HashIndex class with the timestamp of the current ETL process.
+
+        Args:
+            created_at (datetime): timestamp of current ETL process.
+            batch_size (int, optional): number of fingerprints to look up and register per
+                query. Defaults to DEFAULT_BATCH_SIZE.
+
+        Raises:
+            ValueError: raised if the batch size is not positive.
+        """
+        logger.debug(f"Initiated {self.__class__.__name__} class.")
+
+        if batch_size < 1:
+            raise ValueError(f"Batch size must be a positive integer, got: {batch_size}.")
+
+        self.created_at = created_at
+        self.batch_size = batch_size
+
+    def register(self, cursor: psycopg2.extensions.cursor, df: pd.DataFrame) -> pd.Series:
+        """Registers the fingerprints of the entries in the hash index table, and determines which
+         entries are new. An entry is a duplicate, if its fingerprint has already been loaded, or
+         if it occurs earlier in the same DataFrame.
+        Executed within the transaction of the load, the registered fingerprints and the loaded
+         entries are committed or rolled back together.
+
+        Args:
+            cursor (psycopg2.extensions.cursor): database cursor for executing queries.
+            df (pd.DataFrame): transformed entries, with `hash_id` and `source_file` columns.
+
+        Returns:
+            pd.Series: boolean mask of the new entries, aligned with the index of the DataFrame.
+        """
+        is_first = ~df["hash_id"].duplicated()
+        candidates = df.loc[is_first, ["hash_id", "source_file"]]
+
+        new_hash_ids = set()
+        for start in range(0, len(candidates), self.batch_size):
+            batch = candidates.iloc[start:start + self.batch_size]
+            cursor.execute(
+                pl_queries.INSERT_HASH_INDEX_QUERY,
+                {
+                    "hash_ids": batch["hash_id"].tolist(),
+                    "source_files": batch["source_file"].tolist(),
+                    "created_at": self.created_at
+                }
+            )
+            new_hash_ids.update(item[0] for item in cursor.fetchall())
+
+        return is_first & df["hash_id"].isin(new_hash_ids)
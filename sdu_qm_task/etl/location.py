@@ -2,9 +2,7 @@
 
 from typing import Tuple
 
-import pycountry as pyc
-import pycountry_convert as pyc_c
-
+from sdu_qm_task.etl.country_resolver import get_default_resolver
 from sdu_qm_task.logger_conf import get_logger
 
 logger = get_logger(__file__)
@@ -26,38 +24,11 @@ class Location():
 
         self.country_name, self.country_code, self.continent = self.get_location_info()
 
-    @staticmethod
-    def _code_to_continent(country_code_a2: str) -> str:
-        """Converts a two-letter country code to its corresponding continent name.
-
-        Args:
-            country_code_a2 (str): two-letter country code (ISO 3166-1 alpha-2).
-
-        Returns:
-            str: name of the continent corresponding to the provided country code.
-        """
-        country_continent_code = pyc_c.country_alpha2_to_continent_code(country_code_a2)
-        return pyc_c.convert_continent_code_to_continent_name(country_continent_code)
-
     def get_location_info(self) -> Tuple[str, str, str]:
         """Retrieves location information including the country name, country code, and continent.
+        The country name is resolved by the shared country resolver of the process.
 
         Returns:
             Tuple[str, str, str]: tuple of the country name, country code, and continent name.
         """
-        try:
-            info = pyc.countries.lookup(self.country_name_arg)
-            country_code = info.alpha_3
-            continent = self._code_to_continent(info.alpha_2)
-            country_name = self.country_name_arg
-
-        except LookupError:
-            country_name = "UNKNOWN"
-            country_code = "N/A"
-            continent = "UNKNOWN"
-
-            logger.warning(
-                f"Lookup failed for country: '{self.country_name_arg}', marking it as 'UNKNOWN'"
-            )
-
-        return country_name, country_code, continent
+        return get_default_resolver().resolve(self.country_name_arg)
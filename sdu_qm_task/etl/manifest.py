@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+
+from datetime import datetime
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+import psycopg2
+
+from sdu_qm_task.logger_conf import get_logger
+from sdu_qm_task.queries import pre_loader_queries as pl_queries
+
+logger = get_logger(__file__)
+
+
+class Manifest():
+    """Class responsible for the bookkeeping of the source files in the manifest table.
+    It records the size, modification time, content checksum, entry and duplicate entry counts
+     of each source file, along with its load status and timings, so new source files are found
+     by looking up their names and checksums in this small indexed table.
+    A source file loaded in chunks is checkpointed as "loading" along with each chunk, with the
+     number of its entries consumed so far; an interrupted load is resumed after its checkpoint.
+    """
+    def __init__(self, created_at: datetime) -> None:
+        """Initializes the Manifest class with the timestamp of the current ETL process.
+
+        Args:
+            created_at (datetime): timestamp of current ETL process.
+        """
+        logger.debug(f"Initiated {self.__class__.__name__} class.")
+
+        self.created_at = created_at
+        self.entries: Dict[str, dict] = {}
+
+    @staticmethod
+    def _get_checksum(file: Path) -> str:
+        """Computes the MD5 checksum of the content of a file, reading it block by block.
+
+        Args:
+            file (Path): file to compute the checksum of.
+
+        Returns:
+            str: MD5 checksum of the file content.
+        """
+        with open(file, "rb") as f:
+            return hashlib.file_digest(f, "md5").hexdigest()
+
+    def register(self, file: Path) -> dict:
+        """Collects the properties of a new source file, to be recorded after its load.
+
+        Args:
+            file (Path): new source file.
+
+        Returns:
+            dict: manifest entry of the source file.
+        """
+        stat = file.stat()
+        self.entries[file.name] = {
+            "source_file": file.name,
+            "file_size": stat.st_size,
+            "file_mtime": datetime.fromtimestamp(stat.st_mtime),
+            "checksum": self._get_checksum(file),
+            "row_count": None,
+            "duplicate_count": None,
+            "checkpoint_row": None,
+            "load_status": None,
+            "duplicate_of": None,
+            "started_at": None,
+            "finished_at": None,
+            "created_at": self.created_at
+        }
+
+        return self.entries[file.name]
+
+    def start(self, source_file: str) -> None:
+        """Marks the start of processing a source file.
+
+        Args:
+            source_file (str): name of the source file.
+        """
+        self.entries[source_file]["started_at"] = datetime.now()
+        self.entries[source_file]["row_count"] = 0
+        self.entries[source_file]["duplicate_count"] = 0
+        self.entries[source_file]["checkpoint_row"] = 0
+
+    def resume(self, source_file: str, checkpoint: dict) -> bool:
+        """Marks the resumption of processing a partially loaded source file, from its
+         checkpoint. A source file, whose content changed since its checkpoint, is started over.
+
+        Args:
+            source_file (str): name of the source file.
+            checkpoint (dict): checkpoint of the source file, as in the manifest table.
+
+        Returns:
+            bool: True if the source file is resumed from its checkpoint; False if started over.
+        """
+        entry = self.entries[source_file]
+        if checkpoint["checksum"] != entry["checksum"]:
+            logger.warning(
+                f"Source file '{source_file}' changed since its checkpoint; starting it over."
+            )
+            self.start(source_file)
+            return False
+
+        entry["started_at"] = checkpoint["started_at"]
+        entry["row_count"] = checkpoint["checkpoint_row"]
+        entry["duplicate_count"] = checkpoint["duplicate_count"]
+        entry["checkpoint_row"] = checkpoint["checkpoint_row"]
+
+        return True
+
+    def add_row_count(self, source_file: str, row_count: int) -> None:
+        """Adds to the number of entries read from a source file.
+
+        Args:
+            source_file (str): name of the source file.
+            row_count (int): number of entries read.
+        """
+        self.entries[source_file]["row_count"] += row_count
+
+    def add_duplicate_count(self, source_file: str, duplicate_count: int) -> None:
+        """Adds to the number of duplicate entries rejected from a source file.
+
+        Args:
+            source_file (str): name of the source file.
+            duplicate_count (int): number of duplicate entries.
+        """
+        self.entries[source_file]["duplicate_count"] += duplicate_count
+
+    @staticmethod
+    def get_loaded_files(cursor: psycopg2.extensions.cursor, source_files: List[str]) -> Set[str]:
+        """Retrieves which of the source files are already in the manifest table.
+
+        Args:
+            cursor (psycopg2.extensions.cursor): database cursor for executing queries.
+            source_files (List[str]): names of the source files to look up.
+
+        Returns:
+            Set[str]: names of the source files, which are already in the manifest table.
+        """
+        cursor.execute(pl_queries.MANIFEST_SOURCE_FILE_QUERY, {"source_files": source_files})
+        return {item[0] for item in cursor.fetchall()}
+
+    @staticmethod
+    def get_checkpoints(
+            cursor: psycopg2.extensions.cursor, source_files: List[str]
+        ) -> Dict[str, dict]:
+        """Retrieves the checkpoints of the partially loaded source files.
+
+        Args:
+            cursor (psycopg2.extensions.cursor): database cursor for executing queries.
+            source_files (List[str]): names of the source files to look up.
+
+        Returns:
+            Dict[str, dict]: mapping of the partially loaded source files to their checkpoints.
+        """
+        cursor.execute(pl_queries.MANIFEST_CHECKPOINT_QUERY, {"source_files": source_files})
+        columns = [desc[0] for desc in cursor.description]
+        return {row[0]: dict(zip(columns, row)) for row in cursor.fetchall()}
+
+    @staticmethod
+    def get_loaded_checksums(
+            cursor: psycopg2.extensions.cursor, checksums: List[str]
+        ) -> Dict[str, str]:
+        """Retrieves which of the checksums belong to already loaded source files.
+
+        Args:
+            cursor (psycopg2.extensions.cursor): database cursor for executing queries.
+            checksums (List[str]): checksums to look up.
+
+        Returns:
+            Dict[str, str]: mapping of the found checksums to the names of the loaded files.
+        """
+        cursor.execute(pl_queries.MANIFEST_CHECKSUM_QUERY, {"checksums": checksums})
+        return {checksum: source_file for checksum, source_file in cursor.fetchall()}
+
+    def checkpoint(
+            self, cursor: psycopg2.extensions.cursor, source_file: str, checkpoint_row: int
+        ) -> None:
+        """Checkpoints a partially loaded source file in the manifest table.
+        Executed within the transaction of a loaded chunk, the checkpoint and the chunk are
+         committed or rolled back together.
+
+        Args:
+            cursor (psycopg2.extensions.cursor): database cursor for executing queries.
+            source_file (str): name of the source file.
+            checkpoint_row (int): number of entries of the source file consumed so far.
+        """
+        entry = self.entries[source_file]
+        entry["load_status"] = pl_queries.LOADING_STATUS
+        entry["checkpoint_row"] = checkpoint_row
+
+        cursor.execute(pl_queries.INSERT_MANIFEST_QUERY, entry)
+        logger.debug(f"Checkpointed source file '{source_file}' after {checkpoint_row} entries.")
+
+    def record(
+            self,
+            cursor: psycopg2.extensions.cursor,
+            source_files: List[str],
+            load_status: str,
+            duplicate_of: Optional[Dict[str, str]]=None
+        ) -> None:
+        """Records the source files in the manifest table with the given load status.
+        Executed within the transaction of the load, the manifest and the loaded data are
+         committed or rolled back together.
+
+        Args:
+            cursor (psycopg2.extensions.cursor): database cursor for executing queries.
+            source_files (List[str]): names of the source files to record.
+            load_status (str): load status of the source files; "loaded" or "duplicate".
+            duplicate_of (Optional[Dict[str, str]], optional): mapping of duplicate source files
+                to the names of the loaded files with the same content. Defaults to None.
+        """
+        finished_at = datetime.now()
+        for source_file in source_files:
+            entry = self.entries[source_file]
+            entry["load_status"] = load_status
+            entry["checkpoint_row"] = entry["row_count"]
+            entry["duplicate_of"] = (duplicate_of or {}).get(source_file)
+            entry["finished_at"] = finished_at
+
+        cursor.executemany(
+            pl_queries.INSERT_MANIFEST_QUERY, [self.entries[file] for file in source_files]
+        )
+        logger.info(f"Recorded {len(source_files)} source files as '{load_status}' in manifest.")
@@ -1,19 +1,32 @@
 #!/usr/bin/env python3
 
 import argparse
+import asyncio
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
-from dateutil import tz
+from functools import lru_cache
 from hashlib import md5
+from itertools import islice
 import json
+import multiprocessing
 from pathlib import Path
-from typing import Dict, List, NewType, Optional, Set, Union
+from time import perf_counter
+from typing import Dict, Iterator, List, NewType, Optional, Set, Tuple, Union
 
+import numpy as np
 import pandas as pd
-from sqlalchemy import create_engine, Engine
+from sqlalchemy import Connection, Engine
 
 from sdu_qm_task.connect import PSQLConnection
 from sdu_qm_task.logger_conf import get_logger
 from sdu_qm_task.etl.archiver import Archiver
+from sdu_qm_task.etl.copy_loader import CopyLoader
+from sdu_qm_task.etl.fingerprint import Fingerprinter, HASH_ALGORITHMS, MD5_ALGORITHM
+from sdu_qm_task.etl.hash_index import HashIndex
+from sdu_qm_task.etl.manifest import Manifest
+from sdu_qm_task.etl.source_reader import C_ENGINE, CSV_ENGINES, SourceReader
+from sdu_qm_task.etl.timestamp_parser import DT_WO_TZ_FORMAT, TIMEZONES, TimestampParser
 from sdu_qm_task.queries import pre_loader_queries as pl_queries
 from sdu_qm_task.queries import table_names as tables
 
@@ -22,25 +35,64 @@ DeltaPreLoadType = NewType(
     'DeltaPreLoadType',
     Dict[str, List[Dict[str, Union[int, str, float]]]]
 )
+# Define a new type for the columnar structure of the delta pre-load data.
+DeltaPreLoadFrameType = NewType('DeltaPreLoadFrameType', Dict[str, pd.DataFrame])
 
 logger = get_logger(__file__)
 
 # Define the base folder path relative to this script's location.
 BASE_FOLDER = Path(__file__).parents[2]
 
-# Define date/time formats for parsing.
-DT_WO_TZ_FORMAT = "%a %b %d %H:%M:%S %Y"
-DT_WITH_TZ_FORMAT = "%a %b %d %H:%M:%S %Z %Y"
-
-# Define a mapping of known and handled timezones.
-TIMEZONES = {" IST ": tz.gettz('Europe/Dublin')}
-
-
-def parse_arguments() -> str:
-    """Parses command line arguments to retrieve the folder path.
+# Define the available transformation modes.
+ROW_TRANSFORM = "row"
+COLUMNAR_TRANSFORM = "columnar"
+TRANSFORM_MODES = [ROW_TRANSFORM, COLUMNAR_TRANSFORM]
+
+# Define the available loader backends.
+COPY_LOADER = "copy"
+TO_SQL_LOADER = "to_sql"
+LOADERS = [COPY_LOADER, TO_SQL_LOADER]
+
+# Define the number of batches, which may wait between two stages of the pipeline; bounding the
+#  memory usage of the pipelined pre-loader.
+PIPELINE_QUEUE_SIZE = 2
+
+# Define a mapping of source columns to preload table columns.
+COLUMN_MAPPING = {
+    "TransactionId": "transaction_id",
+    "UserId": "user_id",
+    "TransactionTime": "transaction_time",
+    "ItemCode": "item_code",
+    "ItemDescription": "item_description",
+    "NumberOfItemsPurchased": "item_quantity",
+    "CostPerItem": "cost_per_item",
+    "Country": "country"
+}
+
+# Define the column order of the preload table.
+PRELOAD_COLUMNS = [
+    "hash_id",
+    "source_file",
+    "transaction_id",
+    "user_id",
+    "transaction_time",
+    "item_code",
+    "item_description",
+    "item_quantity",
+    "cost_per_item",
+    "country",
+    "created_at"
+]
+
+
+def parse_arguments() -> argparse.Namespace:
+    """Parses command line arguments to retrieve the folder path and the processing options.
 
     Returns:
-        str: path to the folder containing source files to load into the database.
+        argparse.Namespace: parsed arguments, containing the path to the folder of source files
+         to load into the database, the selected transformation mode, the chunk size, the
+         selected loader backend, the number of worker processes, the hash algorithm, the CSV
+         parser engine, and whether to pipeline the stages.
     """
     parser = argparse.ArgumentParser(
         description="A script to handle the processing of source files in the database.",
@@ -53,9 +105,58 @@ def parse_arguments() -> str:
         default=Path(BASE_FOLDER, "data_folder_monitor").as_posix(),
         help="/path/to/folder; to load source file(s) to the Database."
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "-t", "--transform_mode",
+        type=str,
+        choices=TRANSFORM_MODES,
+        default=ROW_TRANSFORM,
+        help="transform the entries row by row, or whole columns at once."
+    )
+    parser.add_argument(
+        "-c", "--chunk_size",
+        type=int,
+        default=None,
+        help="number of entries to read, transform, archive and load at once; "
+             "streams the source files chunk by chunk to keep memory usage bounded."
+    )
+    parser.add_argument(
+        "-l", "--loader",
+        type=str,
+        choices=LOADERS,
+        default=COPY_LOADER,
+        help="load the entries with PostgreSQL's COPY, or with row-by-row INSERTs (to_sql)."
+    )
+    parser.add_argument(
+        "-w", "--workers",
+        type=int,
+        default=1,
+        help="number of worker processes to extract and transform the source files with; "
+             "one source file per task."
+    )
+    parser.add_argument(
+        "-a", "--hash_algorithm",
+        type=str,
+        choices=HASH_ALGORITHMS,
+        default=MD5_ALGORITHM,
+        help="algorithm of the entry fingerprints (hash_id); md5 keeps the existing hashes, "
+             "blake2b is faster but its hashes do not match the ones loaded with md5."
+    )
+    parser.add_argument(
+        "-e", "--csv_engine",
+        type=str,
+        choices=CSV_ENGINES,
+        default=C_ENGINE,
+        help="parser of the source files; pyarrow is multithreaded, but needs to be installed, "
+             "and is not used for streaming in chunks."
+    )
+    parser.add_argument(
+        "-p", "--pipeline",
+        action="store_true",
+        help="overlap the reading, transforming and loading of the batches (whole files, or "
+             "chunks of the chunk size) with an asyncio pipeline."
+    )
 
-    return args.folder
+    return parser.parse_args()
 
 
 class PreLoader():
@@ -63,26 +164,118 @@ class PreLoader():
     It follows the Extract-Transform-Load (ETL) pattern; extracting data from newly available
      source files, transforming the data as needed, and loading it into the preload tables.
     """
-    def __init__(self, folder: str) -> None:
+    def __init__(
+            self,
+            folder: str,
+            transform_mode: str=ROW_TRANSFORM,
+            chunk_size: Optional[int]=None,
+            loader: str=COPY_LOADER,
+            workers: int=1,
+            hash_algorithm: str=MD5_ALGORITHM,
+            csv_engine: str=C_ENGINE,
+            pipeline: bool=False
+        ) -> None:
         """Initializes the PreLoader with the specified folder.
 
         Args:
             folder (str): path to the folder containing source files.
+            transform_mode (str, optional): transformation mode; either "row" or "columnar".
+                Defaults to "row".
+            chunk_size (Optional[int], optional): number of entries to process at once, streaming
+                the source files chunk by chunk. Defaults to None; processing whole files.
+            loader (str, optional): loader backend; either "copy" or "to_sql". Defaults to "copy".
+            workers (int, optional): number of worker processes to extract and transform the
+                source files with; or to transform the batches of the pipeline with. Defaults to
+                1; processing in the current process.
+            hash_algorithm (str, optional): algorithm of the entry fingerprints; either "md5" or
+                "blake2b". Defaults to "md5".
+            csv_engine (str, optional): parser of the source files; either "c" or "pyarrow".
+                Defaults to "c".
+            pipeline (bool, optional): whether to overlap the reading, transforming and loading
+                of the batches with an asyncio pipeline. Defaults to False.
         """
         logger.debug(f"Initiated {self.__class__.__name__} class.")
 
+        if transform_mode not in TRANSFORM_MODES:
+            raise ValueError(
+                f"Unknown transform mode: '{transform_mode}', expected one of: {TRANSFORM_MODES}."
+            )
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError(f"Chunk size must be a positive integer, got: {chunk_size}.")
+        if loader not in LOADERS:
+            raise ValueError(f"Unknown loader: '{loader}', expected one of: {LOADERS}.")
+        if workers < 1:
+            raise ValueError(f"Number of workers must be a positive integer, got: {workers}.")
+        if workers > 1 and chunk_size is not None and not pipeline:
+            raise ValueError(
+                "Streaming in chunks can only be combined with multiple workers in the pipeline."
+            )
+
         self.folder = folder
+        self.transform_mode = transform_mode
+        self.chunk_size = chunk_size
+        self.loader = loader
+        self.workers = workers
+        self.hash_algorithm = hash_algorithm
+        self.csv_engine = csv_engine
+        self.pipeline = pipeline
         self.created_at = datetime.now()
 
         self.psql_connection = PSQLConnection()
         self.archiver = Archiver(self.created_at)
+        self.timestamp_parser = TimestampParser()
+        self.fingerprinter = Fingerprinter(hash_algorithm)
+        self.manifest = Manifest(self.created_at)
+        self.hash_index = HashIndex(self.created_at)
+        self.source_reader = SourceReader(csv_engine)
+        self.engine: Optional[Engine] = None
+        self.checkpoints: Dict[str, dict] = {}
+
+    def refresh(self) -> None:
+        """Prepares a new ETL process; with a new timestamp, archive file and manifest, while
+         keeping the caches and the database engine of the previous processes.
+        """
+        self.created_at = datetime.now()
+        self.archiver = Archiver(self.created_at)
+        self.manifest = Manifest(self.created_at)
+        self.hash_index = HashIndex(self.created_at)
+
+    def close(self) -> None:
+        """Releases the database engine; its pooled connections are kept by the process-wide
+         pool, shared with the other loaders.
+        """
+        self.engine = None
+
+    def _get_engine(self) -> Engine:
+        """Retrieves the database engine; the process-wide engine of the database, drawing from
+         the same connection pool as the database connections of the loaders.
+
+        Returns:
+            Engine: SQLAlchemy engine of the database.
+        """
+        if self.engine is None:
+            self.engine = self.psql_connection.get_engine()
+
+        return self.engine
 
     def run(self) -> None:
         """Executes the ETL proces.
         """
+        if self.pipeline:
+            asyncio.run(self.run_pipeline())
+            return
+
+        if self.chunk_size is not None:
+            self.stream()
+            return
+
+        if self.workers > 1:
+            self.run_parallel()
+            return
+
         delta_load = self.extract()
         delta_df = self.transform(delta_load)
-        self.load(delta_df)
+        self.load(delta_df, list(delta_load.keys()))
 
     @staticmethod
     def _get_md5_hash(entry: dict) -> str:
@@ -140,27 +333,41 @@ class PreLoader():
         Returns:
             bool: True if the timezone is known; otherwise, False.
         """
-        return True if (
-            transaction_time.find("GMT") != -1
-            or transaction_time.find("UTC") != -1
-        ) else False
+        return TimestampParser._has_known_timezone(transaction_time)
 
     @staticmethod
     def _load_to_table(
-            df: pd.DataFrame, table_name: str, engine: Engine, append: str="append"
+            df: pd.DataFrame,
+            table_name: str,
+            engine: Union[Engine, Connection],
+            append: str="append"
         ) -> None:
         """Loads a DataFrame into a specified SQL table.
 
         Args:
             df (pd.DataFrame): DataFrame to load.
             table_name (str): name of the table to load the data into.
-            engine (Engine): SQLAlchemy engine for database connection.
+            engine (Union[Engine, Connection]): SQLAlchemy engine or connection for database
+             connection.
             append (str, optional): action to take if the table already exists. Default: "append".
         """
         df.to_sql(name=table_name, con=engine, if_exists=append, index=False)
 
+    @staticmethod
+    def _copy_to_table(df: pd.DataFrame, table_name: str, connection: Connection) -> None:
+        """Bulk loads a DataFrame into a specified SQL table with PostgreSQL's COPY.
+
+        Args:
+            df (pd.DataFrame): DataFrame to load.
+            table_name (str): name of the table to load the data into.
+            connection (Connection): SQLAlchemy connection; its transaction is used for the COPY.
+        """
+        with connection.connection.cursor() as cur:
+            CopyLoader(cur).copy(df, table_name)
+
     def _assign_timezone(self, transaction_time: str) -> Optional[datetime]:
         """Converts a transaction time string to a timezone-aware datetime object.
+        Repeated transaction times are served from the cache of the timestamp parser.
 
         Args:
             transaction_time (str): transaction time string.
@@ -168,15 +375,9 @@ class PreLoader():
         Returns:
             Optional[datetime]: timezone-aware datetime object or None if conversion fails.
         """
-        if self._has_known_timezone(transaction_time):
-            return datetime.strptime(transaction_time, DT_WITH_TZ_FORMAT)
-
-        else:
-            for tzone in TIMEZONES.keys():
-                if tzone in transaction_time:
-                    untimezoned_time = transaction_time.replace(tzone, " ").strip()
-                    dt_time = datetime.strptime(untimezoned_time, DT_WO_TZ_FORMAT)
-                    return dt_time.astimezone(TIMEZONES.get(tzone))
+        dt_time = self.timestamp_parser.parse(transaction_time)
+        if dt_time is not None:
+            return dt_time
 
         logger.error(
             f"Can not convert timestamp: '{transaction_time}', as timezone is not in "
@@ -184,18 +385,173 @@ class PreLoader():
         )
         return None
 
-    def _extract_db(self) -> Set[str]:
-        """Extracts the set of source files that have already been processed from the database.
+    @staticmethod
+    def _assign_timezone_columnar(transaction_times: pd.Series) -> pd.Series:
+        """Converts a column of transaction time strings at once, following the rules of
+         `_assign_timezone`: UTC/GMT timestamps stay naive, handled timezones are converted to
+         timezone-aware timestamps.
+
+        Args:
+            transaction_times (pd.Series): column of transaction time strings.
+
+        Returns:
+            pd.Series: column of (timezone-aware) timestamps; NaN where conversion fails.
+        """
+        converted = np.full(len(transaction_times), None, dtype=object)
+
+        known = (
+            transaction_times.str.contains("GMT", regex=False, na=False)
+            | transaction_times.str.contains("UTC", regex=False, na=False)
+        ).to_numpy()
+        if known.any():
+            # Python's '%Z' directive only accepts UTC/GMT, so drop it and parse the rest.
+            untimezoned_times = transaction_times[known].str.replace(
+                r" (?:GMT|UTC) ", " ", regex=True
+            )
+            naive_times = pd.to_datetime(untimezoned_times, format=DT_WO_TZ_FORMAT)
+            converted[known] = naive_times.astype(object).to_numpy()
+
+        remaining = ~known
+        for tzone, tzinfo in TIMEZONES.items():
+            matched = remaining & transaction_times.str.contains(
+                tzone, regex=False, na=False
+            ).to_numpy()
+            if matched.any():
+                untimezoned_times = transaction_times[matched].str.replace(
+                    tzone, " ", regex=False
+                ).str.strip()
+                naive_times = pd.to_datetime(untimezoned_times, format=DT_WO_TZ_FORMAT)
+
+                # Tag each distinct timestamp once with `datetime.astimezone`, like the row-wise
+                #  path; pandas' own arithmetic disagrees with dateutil around DST changes.
+                codes, distinct_times = pd.factorize(naive_times)
+                aware_times = np.array(
+                    [dt_time.to_pydatetime().astimezone(tzinfo) for dt_time in distinct_times],
+                    dtype=object
+                )
+                converted[matched] = aware_times[codes]
+            remaining &= ~matched
+
+        return pd.Series(converted, index=transaction_times.index, dtype=object)
+
+    @staticmethod
+    def _get_transformed_frame(
+            df: pd.DataFrame,
+            hash_ids: pd.Series,
+            source_file: str,
+            transaction_times: pd.Series,
+            created_at: datetime
+        ) -> pd.DataFrame:
+        """Transforms a DataFrame of entries into the desired format, column by column.
+
+        Args:
+            df (pd.DataFrame): original entries.
+            hash_ids (pd.Series): fingerprints of the entries.
+            source_file (str): name of the source file.
+            transaction_times (pd.Series): converted transaction timestamps.
+            created_at (datetime): timestamp of current ETL process.
+
+        Returns:
+            pd.DataFrame: transformed entries, with the columns of the preload table.
+        """
+        transformed_df = df.rename(columns=COLUMN_MAPPING)
+        transformed_df["hash_id"] = hash_ids
+        transformed_df["source_file"] = source_file
+        transformed_df["transaction_time"] = transaction_times
+        transformed_df["created_at"] = pd.Timestamp(created_at).as_unit("ns")
+
+        return transformed_df.reindex(columns=PRELOAD_COLUMNS)
+
+    def _extract_db(self, source_files: List[str]) -> Set[str]:
+        """Extracts which of the source files have already been processed from the manifest table;
+         along with the checkpoints of the partially loaded ones, to resume them from.
+
+        Args:
+            source_files (List[str]): names of the source files to look up.
 
         Returns:
             Set[str]: set of source file names that are already in the database.
         """
         with self.psql_connection as conn:
             with conn.cursor() as cur:
-                cur.execute(pl_queries.PRELOAD_SOURCE_FILE_QUERY)
-                db_source_files = [item[0] for item in cur.fetchall()]
+                db_source_files = self.manifest.get_loaded_files(cur, source_files)
+                self.checkpoints = self.manifest.get_checkpoints(cur, source_files)
+
+        return db_source_files
+
+    def _extract_db_checksums(self, checksums: List[str]) -> Dict[str, str]:
+        """Extracts which of the content checksums belong to already loaded source files.
+
+        Args:
+            checksums (List[str]): content checksums of the new source files.
+
+        Returns:
+            Dict[str, str]: mapping of the found checksums to the names of the loaded files.
+        """
+        with self.psql_connection as conn:
+            with conn.cursor() as cur:
+                loaded_checksums = self.manifest.get_loaded_checksums(cur, checksums)
 
-        return set(db_source_files)
+        return loaded_checksums
+
+    def _record_duplicates(self, duplicate_of: Dict[str, str]) -> None:
+        """Records the source files, whose content has already been loaded under another name,
+         in the manifest table; so they are not loaded, nor looked at again.
+
+        Args:
+            duplicate_of (Dict[str, str]): mapping of duplicate source files to the names of the
+             loaded files with the same content.
+        """
+        with self.psql_connection as conn:
+            with conn.cursor() as cur:
+                self.manifest.record(
+                    cur, list(duplicate_of.keys()), pl_queries.DUPLICATE_STATUS, duplicate_of
+                )
+
+    def _record_manifest(self, source_files: List[str], connection: Connection) -> None:
+        """Records the loaded source files in the manifest table, within the load transaction.
+
+        Args:
+            source_files (List[str]): names of the loaded source files.
+            connection (Connection): SQLAlchemy connection of the load transaction.
+        """
+        with connection.connection.cursor() as cur:
+            self.manifest.record(cur, source_files, pl_queries.LOADED_STATUS)
+
+    def _checkpoint(self, source_file: str, row_offset: int, connection: Connection) -> None:
+        """Checkpoints a partially loaded source file in the manifest table, within the load
+         transaction of its chunk.
+
+        Args:
+            source_file (str): name of the source file.
+            row_offset (int): number of entries of the source file consumed with the chunk.
+            connection (Connection): SQLAlchemy connection of the load transaction.
+        """
+        with connection.connection.cursor() as cur:
+            self.manifest.checkpoint(cur, source_file, row_offset)
+
+    def _start_file(self, source_file: str) -> int:
+        """Marks the start of processing a source file; resuming it from its checkpoint, if it
+         has been partially loaded.
+
+        Args:
+            source_file (str): name of the source file.
+
+        Returns:
+            int: number of leading entries of the source file to skip; those already loaded.
+        """
+        checkpoint = self.checkpoints.get(source_file)
+        if checkpoint is None:
+            self.manifest.start(source_file)
+            return 0
+
+        if not self.manifest.resume(source_file, checkpoint):
+            return 0
+
+        logger.info(
+            f"Resuming source file: '{source_file}' after {checkpoint['checkpoint_row']} entries."
+        )
+        return checkpoint["checkpoint_row"]
 
     def _send_to_archive(self, entries: List[dict]) -> None:
         """Transmits any unconvertible entries for archiving.
@@ -205,51 +561,141 @@ class PreLoader():
         """
         self.archiver.archive(entries)
 
-    def extract(self) -> DeltaPreLoadType:
-        """Extracts data from source CSV files in the specified folder.
+    def _skip_duplicate_files(self, csv_files: List[Path]) -> List[Path]:
+        """Filters out the new source files, whose content has already been loaded under another
+         name. These are recorded as duplicates; a file with the same content as another new file
+         is deferred to the next run, when it is recognized as a duplicate of the loaded one.
+
+        Args:
+            csv_files (List[Path]): new source CSV files.
 
         Returns:
-            DeltaPreLoadType: dictionary mapping source file names to their extracted entries.
+            List[Path]: new source CSV files with new content.
+        """
+        checksums = [self.manifest.register(cf)["checksum"] for cf in csv_files]
+        loaded_checksums = self._extract_db_checksums(checksums) if checksums else {}
+
+        delta_csv_files = []
+        duplicate_of = {}
+        new_checksums = set()
+        for csv_file, checksum in zip(csv_files, checksums):
+            if checksum in loaded_checksums:
+                logger.warning(
+                    f"Skipping source file: '{csv_file.name}', as its content has already been "
+                    f"loaded from: '{loaded_checksums[checksum]}'."
+                )
+                duplicate_of[csv_file.name] = loaded_checksums[checksum]
+            elif checksum in new_checksums:
+                logger.warning(
+                    f"Deferring source file: '{csv_file.name}', as its content is the same as "
+                    "of another new source file."
+                )
+            else:
+                new_checksums.add(checksum)
+                delta_csv_files.append(csv_file)
+
+        if duplicate_of:
+            self._record_duplicates(duplicate_of)
+
+        return delta_csv_files
+
+    def _get_delta_files(self) -> List[Path]:
+        """Collects the source CSV files of the specified folder, which are not in the database.
+
+        Returns:
+            List[Path]: list of new source CSV files, in order of their names.
         """
         logger.info(f"Starting extraction from source folder: '{self.folder}'.")
-        db_source_files = self._extract_db()
 
-        csv_files = list(Path(self.folder).glob("*.csv"))
+        csv_files = sorted(Path(self.folder).glob("*.csv"))
         logger.info(f"Found {len(csv_files)} source CSV files.")
 
+        delta_csv_files = []
         if csv_files:
-            if db_source_files:
-                delta_csv_files = [cf for cf in csv_files if cf.name not in db_source_files]
-            else:
-                delta_csv_files = csv_files
-        else:
-            delta_csv_files = []
+            db_source_files = self._extract_db([cf.name for cf in csv_files])
+            delta_csv_files = self._skip_duplicate_files(
+                [cf for cf in csv_files if cf.name not in db_source_files]
+            )
 
         logger.info(f"Found {len(delta_csv_files)} new source CSV files compared to the DB.")
 
+        return delta_csv_files
+
+    def _get_delta_file_load(
+            self, df: pd.DataFrame
+        ) -> Union[List[Dict[str, Union[int, str, float]]], pd.DataFrame]:
+        """Prepares the entries read from a source file for the selected transformation mode.
+
+        Args:
+            df (pd.DataFrame): entries read from a source file.
+
+        Returns:
+            Union[List[Dict[str, Union[int, str, float]]], pd.DataFrame]: list of entries; or the
+             DataFrame itself in columnar transform mode.
+        """
+        if self.transform_mode == COLUMNAR_TRANSFORM:
+            return df
+
+        delta_file_load = []
+        for _, row in df.iterrows():
+            delta_file_load.append(row.to_dict())
+
+        return delta_file_load
+
+    def extract(self) -> Union[DeltaPreLoadType, DeltaPreLoadFrameType]:
+        """Extracts data from source CSV files in the specified folder.
+
+        Returns:
+            Union[DeltaPreLoadType, DeltaPreLoadFrameType]: dictionary mapping source file names to
+             their extracted entries; as DataFrames in columnar transform mode.
+        """
+        delta_csv_files = self._get_delta_files()
+
         delta_load = {}
         for file in delta_csv_files:
             logger.info(f"Extracting source file: '{file.name}'.")
-            df = pd.read_csv(file)
-
-            delta_file_load = []
-            for _, row in df.iterrows():
-                delta_file_load.append(row.to_dict())
+            skip_rows = self._start_file(file.name)
+            delta_file_load = self._get_delta_file_load(self.source_reader.read(file, skip_rows))
 
             logger.info(f"Extracted {len(delta_file_load)} entries from: '{file.name}'.")
+            self.manifest.add_row_count(file.name, len(delta_file_load))
             delta_load[file.name] = delta_file_load
 
         return delta_load
 
-    def transform(self, delta_load: DeltaPreLoadType) -> pd.DataFrame:
+    def transform(
+            self, delta_load: Union[DeltaPreLoadType, DeltaPreLoadFrameType]
+        ) -> pd.DataFrame:
         """Transforms the extracted entries into the desired format.
 
         Args:
-            delta_load (DeltaPreLoadType): extracted entries from source files.
+            delta_load (Union[DeltaPreLoadType, DeltaPreLoadFrameType]): extracted entries from
+             source files.
 
         Returns:
             pd.DataFrame: DataFrame containing the transformed data.
         """
+        if self.transform_mode == COLUMNAR_TRANSFORM:
+            delta_df, unconvertible_entries = self._transform_columnar(delta_load)
+        else:
+            delta_df, unconvertible_entries = self._transform_rows(delta_load)
+
+        # Archive any unconvertible entries.
+        if len(unconvertible_entries) > 0:
+            self._send_to_archive(unconvertible_entries)
+
+        return delta_df
+
+    def _transform_rows(self, delta_load: DeltaPreLoadType) -> Tuple[pd.DataFrame, List[dict]]:
+        """Transforms the extracted entries into the desired format, entry by entry.
+
+        Args:
+            delta_load (DeltaPreLoadType): extracted entries from source files.
+
+        Returns:
+            Tuple[pd.DataFrame, List[dict]]: DataFrame containing the transformed data, and the
+             list of unconvertible entries.
+        """
         delta_data = []
         unconvertible_entries = []
 
@@ -258,7 +704,7 @@ class PreLoader():
 
             for _, entry in enumerate(entries):
 
-                hash_id = self._get_md5_hash(entry)
+                hash_id = self.fingerprinter.hash_entry(entry)
                 transaction_time = self._assign_timezone(entry.get("TransactionTime"))
 
                 if transaction_time is not None:
@@ -272,42 +718,746 @@ class PreLoader():
                     unconvertible_entries.append(entry)
 
         logger.info(f"Transformed {len(delta_data)} entries.")
+        logger.debug(
+            f"Timestamp cache: {self.timestamp_parser.hits} hits, "
+            f"{self.timestamp_parser.misses} misses."
+        )
 
-        # Archive any unconvertible entries.
-        if len(unconvertible_entries) > 0:
-            self._send_to_archive(unconvertible_entries)
-
-        return pd.DataFrame(delta_data)
+        return pd.DataFrame(delta_data), unconvertible_entries
 
-    def load(self, delta_df: pd.DataFrame) -> None:
-        """Loads the transformed data into the specified SQL table.
+    def _transform_columnar(
+            self, delta_load: DeltaPreLoadFrameType
+        ) -> Tuple[pd.DataFrame, List[dict]]:
+        """Transforms the extracted entries into the desired format, whole columns at once.
+        The entries are hashed with their inferred dtypes, like the row-wise path does, and
+         transformed with the ingestion schema. Entries, which do not fit the schema, are
+         unconvertible; like the ones with unconvertible timestamps.
 
         Args:
-            delta_df (pd.DataFrame): DataFrame containing transformed data to load.
+            delta_load (DeltaPreLoadFrameType): extracted entries from source files.
+
+        Returns:
+            Tuple[pd.DataFrame, List[dict]]: DataFrame containing the transformed data, and the
+             list of unconvertible entries.
         """
-        engine = create_engine(self.psql_connection.get_connection_string())
+        delta_frames = []
+        unconvertible_frames = []
+
+        for source_file, df in delta_load.items():
+            logger.info(f"Starting transformation of: '{source_file}'")
+
+            hash_ids = self.fingerprinter.hash_frame(df)
+            typed_df, unfit = self.source_reader.to_typed(df)
+            transaction_times = self._assign_timezone_columnar(typed_df["TransactionTime"])
+            convertible = transaction_times.notna() & ~unfit
+
+            if not convertible.all():
+                for transaction_time in typed_df.loc[
+                    transaction_times.isna() & ~unfit, "TransactionTime"
+                ]:
+                    logger.error(
+                        f"Can not convert timestamp: '{transaction_time}', as timezone is not in "
+                        f"[UTC, GMT] or among the handled timezones: {list(TIMEZONES.keys())}."
+                    )
+                if unfit.any():
+                    logger.error(
+                        f"Can not convert {unfit.sum()} entries to the ingestion schema, as "
+                        "their numeric columns hold non-numeric or non-integral values."
+                    )
+                unconvertible_frames.append(df[~convertible])
+
+            delta_frames.append(self._get_transformed_frame(
+                typed_df[convertible], hash_ids[convertible], source_file,
+                transaction_times[convertible], self.created_at
+            ))
+
+        delta_df = pd.DataFrame()
+        if delta_frames:
+            delta_df = pd.concat(delta_frames, ignore_index=True)
 
-        # Load only if there is available data.
         if not delta_df.empty:
-            logger.info(f"Inserting into table '{tables.PRELOAD_TRANSACTION_TABLE}'")
-            self._load_to_table(df=delta_df, table_name=tables.PRELOAD_TRANSACTION_TABLE, engine=engine)
+            # Settle the timestamp column to the same dtype, as the row-wise path yields.
+            delta_df["transaction_time"] = delta_df["transaction_time"].infer_objects()
         else:
+            delta_df = pd.DataFrame()
+
+        logger.info(f"Transformed {len(delta_df)} entries.")
+
+        unconvertible_entries = []
+        if len(unconvertible_frames) > 0:
+            unconvertible_df = pd.concat(unconvertible_frames, ignore_index=True)
+            unconvertible_entries = unconvertible_df.to_dict("records")
+
+        return delta_df, unconvertible_entries
+
+    def _extract_transform_file(
+            self, file: Path, skip_rows: int=0
+        ) -> Tuple[pd.DataFrame, List[dict]]:
+        """Extracts and transforms a single source file; the task of a worker process.
+        Archiving is left to the main process, to keep a single writer of the archive file.
+
+        Args:
+            file (Path): source file to extract and transform.
+            skip_rows (int, optional): number of leading entries to skip; those already loaded.
+                Defaults to 0.
+
+        Returns:
+            Tuple[pd.DataFrame, List[dict]]: DataFrame containing the transformed data, and the
+             list of unconvertible entries.
+        """
+        logger.info(f"Extracting source file: '{file.name}'.")
+        delta_file_load = self._get_delta_file_load(self.source_reader.read(file, skip_rows))
+        logger.info(f"Extracted {len(delta_file_load)} entries from: '{file.name}'.")
+
+        if self.transform_mode == COLUMNAR_TRANSFORM:
+            return self._transform_columnar({file.name: delta_file_load})
+
+        return self._transform_rows({file.name: delta_file_load})
+
+    def _write_frame(self, df: pd.DataFrame, table_name: str, connection: Connection) -> str:
+        """Writes a DataFrame into a specified SQL table with the selected loader backend; falls
+         back to `to_sql`, if COPY can not encode the DataFrame.
+
+        Args:
+            df (pd.DataFrame): DataFrame to write.
+            table_name (str): name of the table to write the data into.
+            connection (Connection): SQLAlchemy connection to write the data within.
+
+        Returns:
+            str: the loader backend, which wrote the data.
+        """
+        loader = self.loader
+
+        if loader == COPY_LOADER:
+            try:
+                self._copy_to_table(df, table_name, connection)
+            except ValueError as e:
+                logger.warning(f"{e} Falling back to the '{TO_SQL_LOADER}' loader.")
+                loader = TO_SQL_LOADER
+
+        if loader == TO_SQL_LOADER:
+            self._load_to_table(df=df, table_name=table_name, engine=connection)
+
+        return loader
+
+    def _load_frame(self, df: pd.DataFrame, connection: Connection) -> None:
+        """Loads a DataFrame into the preload table with the selected loader backend, and reports
+         the throughput of the loading.
+        Entries, whose fingerprint has already been loaded, are rejected by the hash index, and
+         diverted into the duplicate table; so the preload table holds unique entries only.
+        The transaction holds the pre-load commit lock shared; so the delta loader does not read
+         the upper bound of its range, while the preload ids of the entries are not committed.
+
+        Args:
+            df (pd.DataFrame): DataFrame to load.
+            connection (Connection): SQLAlchemy connection to load the data within.
+        """
+        start = perf_counter()
+
+        with connection.connection.cursor() as cur:
+            # Held until the commit; the delta loader waits for it, before reading its range.
+            cur.execute(pl_queries.LOCK_PRELOAD_COMMITS_SHARED_CMD)
+            is_new = self.hash_index.register(cur, df)
+
+        unique_df = df[is_new]
+        duplicate_df = df[~is_new]
+
+        loader = self._write_frame(unique_df, tables.PRELOAD_TRANSACTION_TABLE, connection)
+
+        if not duplicate_df.empty:
+            self._write_frame(duplicate_df, tables.DUPLICATE_TRANSACTION_TABLE, connection)
+            for source_file, duplicate_count in duplicate_df["source_file"].value_counts().items():
+                self.manifest.add_duplicate_count(source_file, int(duplicate_count))
+            logger.info(
+                f"Diverted {len(duplicate_df)} duplicate entries into table "
+                f"'{tables.DUPLICATE_TRANSACTION_TABLE}'."
+            )
+
+        elapsed = perf_counter() - start
+        logger.info(
+            f"Loaded {len(unique_df)} entries with '{loader}' in {elapsed:.2f} s "
+            f"({len(df) / elapsed if elapsed > 0 else 0:.0f} rows/s)."
+        )
+
+    def load(self, delta_df: pd.DataFrame, source_files: Optional[List[str]]=None) -> None:
+        """Loads the transformed data into the specified SQL table, and records the source files
+         in the manifest table within the same transaction.
+
+        Args:
+            delta_df (pd.DataFrame): DataFrame containing transformed data to load.
+            source_files (Optional[List[str]], optional): names of the extracted source files.
+                Defaults to None; recording no source files.
+        """
+        if delta_df.empty and not source_files:
+            logger.info(f"No data to insert to '{tables.PRELOAD_TRANSACTION_TABLE}'.")
+            return
+
+        engine = self._get_engine()
+
+        with engine.begin() as connection:
+            # Load only if there is available data.
+            if not delta_df.empty:
+                logger.info(f"Inserting into table '{tables.PRELOAD_TRANSACTION_TABLE}'")
+                self._load_frame(delta_df, connection)
+            else:
+                logger.info(f"No data to insert to '{tables.PRELOAD_TRANSACTION_TABLE}'.")
+
+            if source_files:
+                self._record_manifest(source_files, connection)
+
+    def stream(self) -> None:
+        """Executes the ETL process chunk by chunk; reading, transforming, archiving and loading
+         one chunk of a source file at a time, to keep memory usage bounded.
+        Each chunk is loaded within its own transaction, along with the checkpoint of its source
+         file; an interrupted source file is resumed after its last committed chunk, without
+         duplicate or missing entries. The file is recorded as loaded after its last chunk.
+         The unconvertible entries of an interrupted chunk may be archived again on resumption.
+        """
+        delta_csv_files = self._get_delta_files()
+
+        engine = self._get_engine()
+
+        for file in delta_csv_files:
+            logger.info(f"Streaming source file: '{file.name}' in chunks of {self.chunk_size}.")
+            file_entry_count = 0
+            row_offset = self._start_file(file.name)
+
+            for chunk in self.source_reader.read_chunks(file, self.chunk_size, row_offset):
+                row_offset += len(chunk)
+                self.manifest.add_row_count(file.name, len(chunk))
+                delta_df = self.transform({file.name: self._get_delta_file_load(chunk)})
+
+                with engine.begin() as connection:
+                    if not delta_df.empty:
+                        self._load_frame(delta_df, connection)
+                        file_entry_count += len(delta_df)
+
+                    self._checkpoint(file.name, row_offset, connection)
+
+            with engine.begin() as connection:
+                self._record_manifest([file.name], connection)
+
+            logger.info(
+                f"Inserted {file_entry_count} entries of '{file.name}' into table "
+                f"'{tables.PRELOAD_TRANSACTION_TABLE}'."
+            )
+
+    def _submit_file(self, executor: ProcessPoolExecutor, file: Path) -> Future:
+        """Submits the extraction and transformation of a source file to a worker process.
+
+        Args:
+            executor (ProcessPoolExecutor): pool of worker processes.
+            file (Path): source file to extract and transform.
+
+        Returns:
+            Future: future of the transformed data and the unconvertible entries.
+        """
+        skip_rows = self._start_file(file.name)
+
+        return executor.submit(
+            extract_transform_file, file, self.transform_mode, self.hash_algorithm,
+            self.csv_engine, self.created_at, skip_rows
+        )
+
+    def run_parallel(self) -> None:
+        """Executes the ETL process with a pool of worker processes; extracting and transforming
+         one source file per task.
+        The transformed files are archived and loaded in the order of their names, each within a
+         single transaction; a file, whose worker failed, is not loaded at all.
+        """
+        delta_csv_files = self._get_delta_files()
+        failed_files = []
+
+        engine = self._get_engine()
+
+        with ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            # Keep only as many files in flight as there are workers, to bound memory usage.
+            pending_files = iter(delta_csv_files)
+            in_flight = deque(
+                (file, self._submit_file(executor, file))
+                for file in islice(pending_files, self.workers)
+            )
+
+            while in_flight:
+                file, future = in_flight.popleft()
+
+                next_file = next(pending_files, None)
+                if next_file is not None:
+                    in_flight.append((next_file, self._submit_file(executor, next_file)))
+
+                try:
+                    delta_df, unconvertible_entries = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to process source file: '{file.name}'; skipping it. {e}")
+                    failed_files.append(file.name)
+                    continue
+
+                self.manifest.add_row_count(file.name, len(delta_df) + len(unconvertible_entries))
+                if len(unconvertible_entries) > 0:
+                    self._send_to_archive(unconvertible_entries)
+
+                with engine.begin() as connection:
+                    if not delta_df.empty:
+                        logger.info(
+                            f"Inserting {len(delta_df)} entries of '{file.name}' into table "
+                            f"'{tables.PRELOAD_TRANSACTION_TABLE}'."
+                        )
+                        self._load_frame(delta_df, connection)
+                    else:
+                        logger.info(f"No data to insert from '{file.name}'.")
+
+                    self._record_manifest([file.name], connection)
+
+        if failed_files:
+            logger.error(f"Failed to process {len(failed_files)} source files: {failed_files}.")
+
+    def _read_batches(self, file: Path, skip_rows: int=0) -> Iterator[pd.DataFrame]:
+        """Reads a source file in batches; chunks of the chunk size, or the whole file at once.
+
+        Args:
+            file (Path): source file to read.
+            skip_rows (int, optional): number of leading entries to skip; those already loaded.
+                Defaults to 0.
+
+        Yields:
+            Iterator[pd.DataFrame]: batches of the entries of the source file.
+        """
+        if self.chunk_size is None:
+            yield self.source_reader.read(file, skip_rows)
+            return
+
+        yield from self.source_reader.read_chunks(file, self.chunk_size, skip_rows)
+
+    def _transform_batch(
+            self, source_file: str, batch: pd.DataFrame
+        ) -> Tuple[pd.DataFrame, List[dict]]:
+        """Transforms a batch of a source file; the task of the transform stage. Archiving is
+         left to the stage, to keep a single writer of the archive file.
+
+        Args:
+            source_file (str): name of the source file.
+            batch (pd.DataFrame): entries read from the source file.
+
+        Returns:
+            Tuple[pd.DataFrame, List[dict]]: DataFrame containing the transformed data, and the
+             list of unconvertible entries.
+        """
+        delta_file_load = self._get_delta_file_load(batch)
+
+        if self.transform_mode == COLUMNAR_TRANSFORM:
+            return self._transform_columnar({source_file: delta_file_load})
+
+        return self._transform_rows({source_file: delta_file_load})
+
+    def _submit_batch(
+            self,
+            executor: Union[ThreadPoolExecutor, ProcessPoolExecutor],
+            source_file: str,
+            batch: pd.DataFrame
+        ) -> asyncio.Future:
+        """Submits the transformation of a batch to the executor of the transform stage; a
+         worker process, if there are multiple workers.
+
+        Args:
+            executor (Union[ThreadPoolExecutor, ProcessPoolExecutor]): executor of the
+                transformations.
+            source_file (str): name of the source file.
+            batch (pd.DataFrame): entries read from the source file.
+
+        Returns:
+            asyncio.Future: future of the transformed data and the unconvertible entries.
+        """
+        loop = asyncio.get_running_loop()
+        self.manifest.add_row_count(source_file, len(batch))
+
+        if self.workers > 1:
+            return loop.run_in_executor(
+                executor, transform_batch, source_file, batch, self.transform_mode,
+                self.hash_algorithm, self.csv_engine, self.created_at
+            )
+
+        return loop.run_in_executor(executor, self._transform_batch, source_file, batch)
+
+    def _begin_file(self) -> Connection:
+        """Opens the load transaction of a source file; the task of the load stage.
+
+        Returns:
+            Connection: SQLAlchemy connection of the load transaction.
+        """
+        connection = self._get_engine().connect()
+        connection.begin()
+
+        return connection
+
+    def _commit_batch(self, source_file: str, row_offset: int, connection: Connection) -> None:
+        """Checkpoints a source file after a loaded chunk, commits the chunk along with it, and
+         opens the load transaction of the next chunk; the task of the load stage.
+
+        Args:
+            source_file (str): name of the source file.
+            row_offset (int): number of entries of the source file consumed with the chunk.
+            connection (Connection): SQLAlchemy connection of the load transaction.
+        """
+        self._checkpoint(source_file, row_offset, connection)
+        connection.commit()
+        connection.begin()
+
+    def _finish_file(self, source_file: str, connection: Connection) -> None:
+        """Records a loaded source file in the manifest table, and commits its load transaction;
+         the task of the load stage.
+
+        Args:
+            source_file (str): name of the loaded source file.
+            connection (Connection): SQLAlchemy connection of the load transaction.
+        """
+        try:
+            self._record_manifest([source_file], connection)
+            connection.commit()
+        finally:
+            connection.close()
+
+    async def _read_stage(
+            self,
+            files: List[Path],
+            read_queue: asyncio.Queue,
+            executor: ThreadPoolExecutor,
+            stage_times: Dict[str, float]
+        ) -> None:
+        """Reads the batches of the source files, and passes them to the transform stage along
+         with their end offsets in the source file; each source file is followed by its end
+         marker, and all of them by the end of the pipeline.
+
+        Args:
+            files (List[Path]): source files to read.
+            read_queue (asyncio.Queue): queue of the read batches.
+            executor (ThreadPoolExecutor): executor of the blocking reads.
+            stage_times (Dict[str, float]): busy times of the stages.
+        """
+        loop = asyncio.get_running_loop()
+
+        for file in files:
+            logger.info(f"Reading source file: '{file.name}'.")
+            row_offset = self._start_file(file.name)
+            batches = self._read_batches(file, row_offset)
+
+            while True:
+                start = perf_counter()
+                batch = await loop.run_in_executor(executor, next, batches, None)
+                stage_times["read"] += perf_counter() - start
+                if batch is None:
+                    break
+
+                row_offset += len(batch)
+                await read_queue.put((file.name, batch, row_offset))
+
+            await read_queue.put((file.name, None, row_offset))
+
+        await read_queue.put(None)
+
+    async def _pass_transformed(
+            self,
+            source_file: str,
+            future: Optional[asyncio.Future],
+            row_offset: int,
+            load_queue: asyncio.Queue,
+            stage_times: Dict[str, float]
+        ) -> None:
+        """Waits for the transformation of a batch, archives its unconvertible entries, and
+         passes it to the load stage; or passes the end marker of a source file.
+
+        Args:
+            source_file (str): name of the source file.
+            future (Optional[asyncio.Future]): future of the transformed batch; or None, for the
+                end marker.
+            row_offset (int): end offset of the batch in the source file.
+            load_queue (asyncio.Queue): queue of the transformed batches.
+            stage_times (Dict[str, float]): busy times of the stages.
+        """
+        delta_df = None
+        if future is not None:
+            start = perf_counter()
+            delta_df, unconvertible_entries = await future
+            stage_times["transform"] += perf_counter() - start
+
+            if len(unconvertible_entries) > 0:
+                self._send_to_archive(unconvertible_entries)
+
+        await load_queue.put((source_file, delta_df, row_offset))
+
+    async def _transform_stage(
+            self,
+            read_queue: asyncio.Queue,
+            load_queue: asyncio.Queue,
+            executor: Union[ThreadPoolExecutor, ProcessPoolExecutor],
+            stage_times: Dict[str, float]
+        ) -> None:
+        """Transforms the read batches, and passes them to the load stage in order, along with
+         the end markers. Up to as many batches are transformed at once, as there are workers.
+
+        Args:
+            read_queue (asyncio.Queue): queue of the read batches.
+            load_queue (asyncio.Queue): queue of the transformed batches.
+            executor (Union[ThreadPoolExecutor, ProcessPoolExecutor]): executor of the CPU-bound
+                transformations.
+            stage_times (Dict[str, float]): busy times of the stages.
+        """
+        in_flight = deque()
+
+        try:
+            while True:
+                item = await read_queue.get()
+                if item is None:
+                    break
+
+                source_file, batch, row_offset = item
+                future = None
+                if batch is not None:
+                    future = self._submit_batch(executor, source_file, batch)
+                in_flight.append((source_file, future, row_offset))
+
+                while len(in_flight) > self.workers:
+                    await self._pass_transformed(*in_flight.popleft(), load_queue, stage_times)
+
+            while in_flight:
+                await self._pass_transformed(*in_flight.popleft(), load_queue, stage_times)
+        finally:
+            for _, future, _ in in_flight:
+                if future is not None:
+                    future.cancel()
+
+        await load_queue.put(None)
+
+    async def _load_stage(
+            self,
+            load_queue: asyncio.Queue,
+            executor: ThreadPoolExecutor,
+            stage_times: Dict[str, float]
+        ) -> None:
+        """Loads the transformed batches; each source file within a single transaction, committed
+         at its end marker. In chunks, each chunk is committed along with the checkpoint of its
+         source file instead. The transaction of a partially loaded batch is rolled back.
+
+        Args:
+            load_queue (asyncio.Queue): queue of the transformed batches.
+            executor (ThreadPoolExecutor): executor of the blocking database writes; a single
+                thread, owning the connection of the load transaction.
+            stage_times (Dict[str, float]): busy times of the stages.
+        """
+        loop = asyncio.get_running_loop()
+        connection = None
+        entry_count = 0
+
+        try:
+            while True:
+                item = await load_queue.get()
+                if item is None:
+                    break
+
+                source_file, delta_df, row_offset = item
+                start = perf_counter()
+                if connection is None:
+                    connection = await loop.run_in_executor(executor, self._begin_file)
+
+                if delta_df is None:
+                    await loop.run_in_executor(
+                        executor, self._finish_file, source_file, connection
+                    )
+                    connection = None
+                    logger.info(
+                        f"Inserted {entry_count} entries of '{source_file}' into table "
+                        f"'{tables.PRELOAD_TRANSACTION_TABLE}'."
+                    )
+                    entry_count = 0
+                else:
+                    if not delta_df.empty:
+                        await loop.run_in_executor(
+                            executor, self._load_frame, delta_df, connection
+                        )
+                        entry_count += len(delta_df)
+
+                    if self.chunk_size is not None:
+                        await loop.run_in_executor(
+                            executor, self._commit_batch, source_file, row_offset, connection
+                        )
+
+                stage_times["load"] += perf_counter() - start
+        finally:
+            if connection is not None:
+                # Queued behind any running write of the single load thread.
+                await loop.run_in_executor(executor, connection.close)
+
+    async def run_pipeline(self) -> None:
+        """Executes the ETL process as an asyncio pipeline; reading, transforming and loading the
+         batches of the source files (whole files, or chunks of the chunk size) concurrently.
+        The stages are linked by bounded queues, and run their blocking work on their own
+         threads; the next batches are read and transformed, while the previous one is loaded.
+         With multiple workers, the batches are transformed in worker processes. Each source
+         file is loaded within a single transaction; or each chunk, along with the checkpoint
+         of its source file to resume from. A failing stage cancels the pipeline.
+
+        Raises:
+            Exception: the first exception of a failed stage.
+        """
+        delta_csv_files = self._get_delta_files()
+        if not delta_csv_files:
             logger.info(f"No data to insert to '{tables.PRELOAD_TRANSACTION_TABLE}'.")
+            return
+
+        start = perf_counter()
+        stage_times = {"read": 0.0, "transform": 0.0, "load": 0.0}
+        read_queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        load_queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+
+        transform_executor = ThreadPoolExecutor(max_workers=1)
+        if self.workers > 1:
+            transform_executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+
+        with (
+            ThreadPoolExecutor(max_workers=1) as read_executor,
+            transform_executor,
+            ThreadPoolExecutor(max_workers=1) as load_executor
+        ):
+            try:
+                async with asyncio.TaskGroup() as task_group:
+                    task_group.create_task(self._read_stage(
+                        delta_csv_files, read_queue, read_executor, stage_times
+                    ))
+                    task_group.create_task(self._transform_stage(
+                        read_queue, load_queue, transform_executor, stage_times
+                    ))
+                    task_group.create_task(self._load_stage(
+                        load_queue, load_executor, stage_times
+                    ))
+            except ExceptionGroup as e:
+                raise e.exceptions[0]
+
+        logger.info(
+            f"Pipeline finished in {perf_counter() - start:.2f} s; reading for "
+            f"{stage_times['read']:.2f} s, waiting for the transformations for "
+            f"{stage_times['transform']:.2f} s, loading for {stage_times['load']:.2f} s."
+        )
 
-        engine.dispose()
 
+def extract_transform_file(
+        file: Path,
+        transform_mode: str,
+        hash_algorithm: str,
+        csv_engine: str,
+        created_at: datetime,
+        skip_rows: int=0
+    ) -> Tuple[pd.DataFrame, List[dict]]:
+    """Extracts and transforms a single source file; the task of a worker process.
 
-def main(folder: str):
+    Args:
+        file (Path): source file to extract and transform.
+        transform_mode (str): transformation mode; either "row" or "columnar".
+        hash_algorithm (str): algorithm of the entry fingerprints; either "md5" or "blake2b".
+        csv_engine (str): parser of the source files; either "c" or "pyarrow".
+        created_at (datetime): timestamp of current ETL process.
+        skip_rows (int, optional): number of leading entries to skip; those already loaded.
+            Defaults to 0.
+
+    Returns:
+        Tuple[pd.DataFrame, List[dict]]: DataFrame containing the transformed data, and the list of
+         unconvertible entries.
+    """
+    pre_loader = PreLoader(
+        file.parent.as_posix(), transform_mode, hash_algorithm=hash_algorithm,
+        csv_engine=csv_engine
+    )
+    pre_loader.created_at = created_at
+
+    return pre_loader._extract_transform_file(file, skip_rows)
+
+
+@lru_cache(maxsize=1)
+def get_worker_pre_loader(transform_mode: str, hash_algorithm: str, csv_engine: str) -> PreLoader:
+    """Retrieves the pre-loader of a worker process of the pipeline; built once per process, to
+     keep its caches across the batches.
+
+    Args:
+        transform_mode (str): transformation mode; either "row" or "columnar".
+        hash_algorithm (str): algorithm of the entry fingerprints; either "md5" or "blake2b".
+        csv_engine (str): parser of the source files; either "c" or "pyarrow".
+
+    Returns:
+        PreLoader: the pre-loader of the worker process.
+    """
+    return PreLoader(
+        BASE_FOLDER.as_posix(), transform_mode, hash_algorithm=hash_algorithm,
+        csv_engine=csv_engine
+    )
+
+
+def transform_batch(
+        source_file: str,
+        batch: pd.DataFrame,
+        transform_mode: str,
+        hash_algorithm: str,
+        csv_engine: str,
+        created_at: datetime
+    ) -> Tuple[pd.DataFrame, List[dict]]:
+    """Transforms a batch of a source file; the task of a worker process of the pipeline.
+
+    Args:
+        source_file (str): name of the source file.
+        batch (pd.DataFrame): entries read from the source file.
+        transform_mode (str): transformation mode; either "row" or "columnar".
+        hash_algorithm (str): algorithm of the entry fingerprints; either "md5" or "blake2b".
+        csv_engine (str): parser of the source files; either "c" or "pyarrow".
+        created_at (datetime): timestamp of current ETL process.
+
+    Returns:
+        Tuple[pd.DataFrame, List[dict]]: DataFrame containing the transformed data, and the list of
+         unconvertible entries.
+    """
+    pre_loader = get_worker_pre_loader(transform_mode, hash_algorithm, csv_engine)
+    pre_loader.created_at = created_at
+
+    return pre_loader._transform_batch(source_file, batch)
+
+
+def main(
+        folder: str,
+        transform_mode: str=ROW_TRANSFORM,
+        chunk_size: Optional[int]=None,
+        loader: str=COPY_LOADER,
+        workers: int=1,
+        hash_algorithm: str=MD5_ALGORITHM,
+        csv_engine: str=C_ENGINE,
+        pipeline: bool=False
+    ):
     """Main entry point for the script.
 
     Args:
         folder (str): path to the folder containing source files.
+        transform_mode (str, optional): transformation mode; either "row" or "columnar".
+            Defaults to "row".
+        chunk_size (Optional[int], optional): number of entries to process at once.
+            Defaults to None; processing whole files.
+        loader (str, optional): loader backend; either "copy" or "to_sql". Defaults to "copy".
+        workers (int, optional): number of worker processes to extract and transform the source
+            files with. Defaults to 1.
+        hash_algorithm (str, optional): algorithm of the entry fingerprints; either "md5" or
+            "blake2b". Defaults to "md5".
+        csv_engine (str, optional): parser of the source files; either "c" or "pyarrow".
+            Defaults to "c".
+        pipeline (bool, optional): whether to overlap the stages with an asyncio pipeline.
+            Defaults to False.
     """
-    PreLoader(folder).run()
+    pre_loader = PreLoader(
+        folder, transform_mode, chunk_size, loader, workers, hash_algorithm, csv_engine, pipeline
+    )
+    pre_loader.run()
+    pre_loader.close()
 
 
 if __name__ == "__main__":
-    # Parse command line argument for folder path.
-    folder = parse_arguments()
+    # Parse command line arguments for folder path and processing options.
+    args = parse_arguments()
 
-    main(folder)
+    main(**vars(args))
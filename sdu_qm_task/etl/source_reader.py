@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Tuple
+
+import numpy as np
+import pandas as pd
+
+from sdu_qm_task.logger_conf import get_logger
+
+logger = get_logger(__file__)
+
+# Define the ingestion schema of the source CSV files.
+SOURCE_DTYPES = {
+    "UserId": "Int32",
+    "TransactionId": "Int32",
+    "TransactionTime": "string",
+    "ItemCode": "Int32",
+    "ItemDescription": "string",
+    "NumberOfItemsPurchased": "Int32",
+    "CostPerItem": "float64",
+    "Country": "category"
+}
+SOURCE_COLUMNS = list(SOURCE_DTYPES.keys())
+
+# Define the available CSV parser engines.
+C_ENGINE = "c"
+PYARROW_ENGINE = "pyarrow"
+CSV_ENGINES = [C_ENGINE, PYARROW_ENGINE]
+
+
+class SourceReader():
+    """Class responsible for reading the source CSV files.
+    Only the source columns are parsed, with the dtypes pandas infers, so the entries are hashed
+     and archived with the same values as before; optionally with the multithreaded pyarrow
+     parser. The declared ingestion schema, of compact nullable integers, strings and
+     categories, is applied by `to_typed` where the typed columns are used.
+    """
+    def __init__(self, engine: str=C_ENGINE) -> None:
+        """Initializes the SourceReader class with the CSV parser engine.
+        Falls back to the C parser, if pyarrow is not installed.
+
+        Args:
+            engine (str, optional): CSV parser engine; either "c" or "pyarrow". Defaults to "c".
+
+        Raises:
+            ValueError: raised if the CSV parser engine is unknown.
+        """
+        logger.debug(f"Initiated {self.__class__.__name__} class.")
+
+        if engine not in CSV_ENGINES:
+            raise ValueError(f"Unknown CSV engine: '{engine}', expected one of: {CSV_ENGINES}.")
+
+        if engine == PYARROW_ENGINE and find_spec("pyarrow") is None:
+            logger.warning(
+                f"The '{PYARROW_ENGINE}' CSV engine is not installed; "
+                f"falling back to the '{C_ENGINE}' engine."
+            )
+            engine = C_ENGINE
+
+        self.engine = engine
+
+    @staticmethod
+    def _get_common_dtype(dtypes: Iterable[object]) -> object:
+        """Determines the dtype of a column, whose parts are parsed into the given dtypes; as
+         pandas combines the parts of a file, which its parser reads one by one.
+
+        Args:
+            dtypes (Iterable[object]): dtypes of the parts of the column.
+
+        Returns:
+            object: common dtype of the column; e.g. float64 for int64 and float64 parts.
+        """
+        return pd.concat([pd.Series(dtype=dtype) for dtype in dtypes]).dtype
+
+    def get_file_dtypes(self, file: Path, chunk_size: int) -> Dict[str, object]:
+        """Determines the dtypes pandas infers for the source columns of a whole file, in a
+         first pass chunk by chunk; e.g. float64 for an integer column with a missing value in
+         any of the chunks.
+
+        Args:
+            file (Path): source file to read.
+            chunk_size (int): number of entries per chunk.
+
+        Returns:
+            Dict[str, object]: mapping of the source columns to their dtypes in the whole file.
+        """
+        chunk_dtypes = {column: set() for column in SOURCE_COLUMNS}
+        with pd.read_csv(
+            file, usecols=SOURCE_COLUMNS, engine=C_ENGINE, chunksize=chunk_size
+        ) as chunks:
+            for chunk in chunks:
+                for column, dtype in chunk.dtypes.items():
+                    chunk_dtypes[column].add(dtype)
+
+        return {
+            column: self._get_common_dtype(dtypes)
+            for column, dtypes in chunk_dtypes.items() if dtypes
+        }
+
+    def read(self, file: Path, skip_rows: int=0) -> pd.DataFrame:
+        """Reads a whole source file.
+        A text column, whose parts pandas parsed into numbers and strings, is parsed into
+         strings again; like a chunked read does, so the entries hash the same either way. Note,
+         that the numbers of such a column were hashed as numbers before the chunked reads.
+
+        Args:
+            file (Path): source file to read.
+            skip_rows (int, optional): number of leading entries to skip; e.g. the entries of a
+                resumed source file, which are already loaded. The dtypes are still inferred
+                from all the entries. Defaults to 0.
+
+        Returns:
+            pd.DataFrame: entries of the source file, with the inferred dtypes.
+        """
+        df = pd.read_csv(file, usecols=SOURCE_COLUMNS, engine=self.engine)
+
+        if self.engine == PYARROW_ENGINE:
+            # The pyarrow parser reads missing text values as None; the C parser as NaN.
+            for column in df.select_dtypes(include=object).columns:
+                df[column] = df[column].where(df[column].notna(), np.nan)
+        else:
+            mixed_columns = [
+                column for column in df.select_dtypes(include=object).columns
+                if pd.api.types.infer_dtype(df[column], skipna=True) not in ("string", "empty")
+            ]
+            if mixed_columns:
+                df = pd.read_csv(
+                    file, usecols=SOURCE_COLUMNS, dtype=dict.fromkeys(mixed_columns, object),
+                    engine=C_ENGINE
+                )
+
+        return df.iloc[skip_rows:] if skip_rows else df
+
+    def read_chunks(
+            self, file: Path, chunk_size: int, skip_rows: int=0
+        ) -> Iterator[pd.DataFrame]:
+        """Reads a source file chunk by chunk; always with the C parser, as the pyarrow parser
+         does not read in chunks.
+        Each chunk is parsed with the dtypes of the whole file, determined in a first pass; so
+         the entries of a chunk hash the same as in a whole-file read, whatever the chunk size.
+        The skipped entries are counted as parsed records, rather than lines of the file, so
+         blank lines and quoted line breaks do not shift the resumed position.
+
+        Args:
+            file (Path): source file to read.
+            chunk_size (int): number of entries per chunk.
+            skip_rows (int, optional): number of leading entries to skip; e.g. the entries of a
+                resumed source file, which are already loaded. The dtypes are still inferred
+                from all the entries. Defaults to 0.
+
+        Yields:
+            Iterator[pd.DataFrame]: chunks of the source file, with the dtypes of the whole file.
+        """
+        # Inferred from the skipped entries too, so a resumed read parses as an uninterrupted one.
+        dtypes = self.get_file_dtypes(file, chunk_size)
+
+        with pd.read_csv(
+            file, usecols=SOURCE_COLUMNS, dtype=dtypes, engine=C_ENGINE, chunksize=chunk_size
+        ) as chunks:
+            for chunk in chunks:
+                if skip_rows >= len(chunk):
+                    skip_rows -= len(chunk)
+                    continue
+
+                yield chunk.iloc[skip_rows:]
+                skip_rows = 0
+
+    @staticmethod
+    def to_typed(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series]:
+        """Converts the entries to the ingestion schema. The entries, whose numeric columns hold
+         non-numeric, non-integral (for integers) or out of range values, do not fit the schema;
+         they are flagged, and their unfit values are missing in the typed entries.
+
+        Args:
+            df (pd.DataFrame): entries with the inferred dtypes.
+
+        Returns:
+            Tuple[pd.DataFrame, pd.Series]: entries typed by the ingestion schema, and the mask
+             of the entries, which do not fit the schema.
+        """
+        typed_df = df.copy()
+        unfit = pd.Series(False, index=df.index)
+
+        for column, dtype in SOURCE_DTYPES.items():
+            if not pd.api.types.is_numeric_dtype(dtype):
+                typed_df[column] = df[column].astype(dtype)
+                continue
+
+            values = pd.to_numeric(df[column], errors="coerce")
+            invalid = values.isna() & df[column].notna()
+            if pd.api.types.is_integer_dtype(dtype):
+                limits = np.iinfo(pd.api.types.pandas_dtype(dtype).numpy_dtype)
+                invalid |= values.notna() & (
+                    (values % 1 != 0) | (values < limits.min) | (values > limits.max)
+                )
+
+            unfit |= invalid
+            typed_df[column] = values.mask(invalid).astype(dtype)
+
+        return typed_df, unfit
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+
+from datetime import datetime
+from dateutil import tz
+from functools import lru_cache
+from typing import Optional
+
+from sdu_qm_task.logger_conf import get_logger
+
+logger = get_logger(__file__)
+
+# Define date/time formats for parsing.
+DT_WO_TZ_FORMAT = "%a %b %d %H:%M:%S %Y"
+DT_WITH_TZ_FORMAT = "%a %b %d %H:%M:%S %Z %Y"
+
+# Define a mapping of known and handled timezones.
+TIMEZONES = {" IST ": tz.gettz('Europe/Dublin')}
+
+# Define the timezone names, which are parsed as naive timestamps.
+KNOWN_TIMEZONES = ["GMT", "UTC"]
+
+# Define the default number of distinct transaction times kept in the cache.
+DEFAULT_CACHE_SIZE = 65_536
+
+# Define the fixed layout of `DT_WITH_TZ_FORMAT`, e.g.: "Fri Jul 05 14:10:00 IST 2019".
+FIXED_LAYOUT_LENGTH = 28
+FIXED_LAYOUT_SEPARATORS = {3: " ", 7: " ", 10: " ", 13: ":", 16: ":", 19: " ", 23: " "}
+FIXED_LAYOUT_DIGITS = [(8, 10), (11, 13), (14, 16), (17, 19), (24, 28)]
+WEEKDAYS = {"Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"}
+MONTHS = {
+    month: number for number, month in enumerate(
+        ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"],
+        start=1
+    )
+}
+
+
+class TimestampParser():
+    """Class responsible for converting transaction time strings to (timezone-aware) datetime
+     objects. Conversions are memoized by the raw string in a bounded LRU cache, so the parsing
+     cost scales with the number of distinct transaction times instead of the number of entries.
+    """
+    def __init__(self, cache_size: int=DEFAULT_CACHE_SIZE) -> None:
+        """Initializes the TimestampParser class with the size of its cache.
+
+        Args:
+            cache_size (int, optional): maximum number of distinct transaction times kept in the
+             cache; least recently used ones are evicted first. Defaults to DEFAULT_CACHE_SIZE.
+
+        Raises:
+            ValueError: raised if the cache size is smaller than 1.
+        """
+        logger.debug(f"Initiated {self.__class__.__name__} class.")
+
+        if cache_size < 1:
+            raise ValueError(f"Cache size must be a positive integer, got: {cache_size}.")
+
+        self.cache_size = cache_size
+        self._cached_parse = lru_cache(maxsize=cache_size)(self._parse)
+
+    @property
+    def hits(self) -> int:
+        """Number of transaction times served from the cache.
+        """
+        return self._cached_parse.cache_info().hits
+
+    @property
+    def misses(self) -> int:
+        """Number of transaction times parsed, as they were not in the cache.
+        """
+        return self._cached_parse.cache_info().misses
+
+    def clear(self) -> None:
+        """Empties the cache and resets its hit/miss counters.
+        """
+        self._cached_parse.cache_clear()
+
+    @staticmethod
+    def _has_known_timezone(transaction_time: str) -> bool:
+        """Checks if the transaction time string has a known timezone.
+
+        Args:
+            transaction_time (str): transaction time string.
+
+        Returns:
+            bool: True if the timezone is known; otherwise, False.
+        """
+        return any(
+            transaction_time.find(timezone_name) != -1 for timezone_name in KNOWN_TIMEZONES
+        )
+
+    @staticmethod
+    def _has_fixed_layout(transaction_time: str) -> bool:
+        """Checks if the transaction time string strictly follows the fixed layout of
+         `DT_WITH_TZ_FORMAT`: zero-padded numbers and English weekday/month abbreviations.
+
+        Args:
+            transaction_time (str): transaction time string.
+
+        Returns:
+            bool: True if the string has the fixed layout; otherwise, False.
+        """
+        return (
+            len(transaction_time) == FIXED_LAYOUT_LENGTH
+            and all(
+                transaction_time[position] == separator
+                for position, separator in FIXED_LAYOUT_SEPARATORS.items()
+            )
+            and all(transaction_time[start:end].isdigit() for start, end in FIXED_LAYOUT_DIGITS)
+            and transaction_time[:3] in WEEKDAYS
+            and transaction_time[4:7] in MONTHS
+        )
+
+    @staticmethod
+    def _parse_fixed_layout(transaction_time: str) -> Optional[datetime]:
+        """Converts a transaction time string of the fixed layout by slicing its fields.
+
+        Args:
+            transaction_time (str): transaction time string of the fixed layout.
+
+        Returns:
+            Optional[datetime]: (timezone-aware) datetime object or None if the fast path does
+             not apply, e.g. the timezone is not handled or a field is out of range.
+        """
+        timezone_name = transaction_time[20:23]
+        tzinfo = TIMEZONES.get(transaction_time[19:24])
+        if timezone_name not in KNOWN_TIMEZONES and tzinfo is None:
+            return None
+
+        try:
+            dt_time = datetime(
+                int(transaction_time[24:28]),
+                MONTHS[transaction_time[4:7]],
+                int(transaction_time[8:10]),
+                int(transaction_time[11:13]),
+                int(transaction_time[14:16]),
+                int(transaction_time[17:19])
+            )
+        except ValueError:
+            return None
+
+        if timezone_name in KNOWN_TIMEZONES:
+            return dt_time
+
+        return dt_time.astimezone(tzinfo)
+
+    def _parse(self, transaction_time: str) -> Optional[datetime]:
+        """Converts a transaction time string to a (timezone-aware) datetime object.
+        Strings of the fixed layout take the fast path; the rest is parsed with `strptime`.
+
+        Args:
+            transaction_time (str): transaction time string.
+
+        Returns:
+            Optional[datetime]: (timezone-aware) datetime object or None if the timezone is
+             not handled.
+        """
+        if self._has_fixed_layout(transaction_time):
+            dt_time = self._parse_fixed_layout(transaction_time)
+            if dt_time is not None:
+                return dt_time
+
+        if self._has_known_timezone(transaction_time):
+            return datetime.strptime(transaction_time, DT_WITH_TZ_FORMAT)
+
+        for tzone, tzinfo in TIMEZONES.items():
+            if tzone in transaction_time:
+                untimezoned_time = transaction_time.replace(tzone, " ").strip()
+                dt_time = datetime.strptime(untimezoned_time, DT_WO_TZ_FORMAT)
+                return dt_time.astimezone(tzinfo)
+
+        return None
+
+    def parse(self, transaction_time: str) -> Optional[datetime]:
+        """Converts a transaction time string to a (timezone-aware) datetime object, reusing the
+         result of an earlier conversion of the same string.
+
+        Args:
+            transaction_time (str): transaction time string.
+
+        Returns:
+            Optional[datetime]: (timezone-aware) datetime object or None if the timezone is
+             not handled.
+        """
+        return self._cached_parse(transaction_time)
@@ -0,0 +1,23 @@
+from sdu_qm_task.queries.table_names import DIM_DATE_TABLE
+
+# Generates the calendar between two dates (inclusive) in one statement; the ids follow the
+#  YYYYMMDD convention, computed arithmetically.
+GENERATE_DIM_DATE_CMD = f"""
+INSERT INTO {DIM_DATE_TABLE}(id, date, year, quarter, month, day)
+SELECT
+    CAST(
+        EXTRACT(YEAR FROM calendar_day) * 10000
+        + EXTRACT(MONTH FROM calendar_day) * 100
+        + EXTRACT(DAY FROM calendar_day)
+        AS INTEGER
+    ) AS id,
+    CAST(calendar_day AS DATE) AS date,
+    EXTRACT(YEAR FROM calendar_day) AS year,
+    CONCAT('Q', EXTRACT(QUARTER FROM calendar_day)) AS quarter,
+    EXTRACT(MONTH FROM calendar_day) AS month,
+    EXTRACT(DAY FROM calendar_day) AS day
+FROM generate_series(
+    CAST(%(start_date)s AS DATE), CAST(%(end_date)s AS DATE), INTERVAL '1 day'
+) AS calendar_day
+ON CONFLICT (id) DO NOTHING;
+"""
@@ -0,0 +1,49 @@
+from sdu_qm_task.queries.table_names import (
+    DELTA_LOAD_STATE_TABLE,
+    CHANGE_FEED_OFFSET_TABLE,
+    FACT_TRANSLATION_TABLE
+)
+
+# Retrieves the last committed batch id; the watermark of the fact table, which is only advanced
+#  once all entries of its batch (i.e. of the delta_loader run) are committed.
+COMMITTED_BATCH_QUERY = f"""
+SELECT COALESCE(MAX(last_preload_id), 0)
+FROM {DELTA_LOAD_STATE_TABLE}
+WHERE target_table = '{FACT_TRANSLATION_TABLE}'
+"""
+
+CONSUMER_OFFSET_QUERY = f"""
+SELECT last_batch_id
+FROM {CHANGE_FEED_OFFSET_TABLE}
+WHERE consumer = %(consumer)s
+"""
+
+# Retrieves the fact entries of the batches after the offset of a consumer (exclusive), up to the
+#  last committed batch (inclusive); in order of their batches.
+CHANGE_FEED_QUERY = f"""
+SELECT
+    hash_id,
+    transaction_id,
+    user_id,
+    date_id,
+    transaction_time,
+    item_id,
+    item_quantity,
+    cost_per_item,
+    total_cost,
+    location_id,
+    created_at,
+    batch_id
+FROM {FACT_TRANSLATION_TABLE}
+WHERE batch_id > %(last_batch_id)s AND batch_id <= %(upper_batch_id)s
+ORDER BY batch_id
+"""
+
+UPDATE_OFFSET_CMD = f"""
+INSERT INTO {CHANGE_FEED_OFFSET_TABLE} (consumer, last_batch_id, updated_at)
+VALUES (%(consumer)s, %(upper_batch_id)s, NOW())
+ON CONFLICT (consumer) DO UPDATE
+SET
+    last_batch_id = EXCLUDED.last_batch_id,
+    updated_at = EXCLUDED.updated_at;
+"""
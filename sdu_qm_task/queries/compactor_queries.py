@@ -0,0 +1,41 @@
+from sdu_qm_task.queries.table_names import (
+    PRELOAD_TRANSACTION_TABLE,
+    DELTA_LOAD_STATE_TABLE,
+    FACT_TRANSLATION_TABLE
+)
+
+# Removes a batch of the preload entries, which are promoted into the fact table (below the
+#  watermark) and older than the retention window, in order of their ids; and returns them for
+#  the cold store.
+COMPACT_PRELOAD_CMD = f"""
+DELETE FROM {PRELOAD_TRANSACTION_TABLE}
+WHERE id IN (
+    SELECT id
+    FROM {PRELOAD_TRANSACTION_TABLE}
+    WHERE
+        id <= COALESCE(
+            (
+                SELECT last_preload_id
+                FROM {DELTA_LOAD_STATE_TABLE}
+                WHERE target_table = '{FACT_TRANSLATION_TABLE}'
+            ),
+            0
+        )
+        AND created_at < %(cutoff)s
+    ORDER BY id
+    LIMIT %(batch_size)s
+)
+RETURNING
+    id,
+    hash_id,
+    source_file,
+    transaction_id,
+    user_id,
+    transaction_time,
+    item_code,
+    item_description,
+    item_quantity,
+    cost_per_item,
+    country,
+    created_at;
+"""
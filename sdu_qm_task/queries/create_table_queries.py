@@ -1,8 +1,15 @@
 from sdu_qm_task.queries.table_names import (
     PRELOAD_TRANSACTION_TABLE,
+    DUPLICATE_TRANSACTION_TABLE,
+    PRELOAD_MANIFEST_TABLE,
+    PRELOAD_HASH_INDEX_TABLE,
+    DELTA_LOAD_STATE_TABLE,
+    CHANGE_FEED_OFFSET_TABLE,
+    UNIQUE_DELTA_PRELOAD_TABLE,
     DIM_DATE_TABLE,
     DIM_ITEM_TABLE,
     DIM_LOCATION_TABLE,
+    LOCATION_ALIAS_TABLE,
     FACT_TRANSLATION_TABLE
 )
 
@@ -24,6 +31,101 @@ CREATE TABLE IF NOT EXISTS {PRELOAD_TRANSACTION_TABLE} (
 );
 """
 
+CREATE_DUPLICATE_TRANSACTION = f"""
+CREATE TABLE IF NOT EXISTS {DUPLICATE_TRANSACTION_TABLE} (
+    id INTEGER GENERATED ALWAYS AS IDENTITY,
+    hash_id CHAR(32) NOT NULL,
+    source_file VARCHAR(100) NOT NULL,
+    transaction_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    transaction_time TIMESTAMP NOT NULL,
+    item_code INTEGER NOT NULL,
+    item_description VARCHAR(255),
+    item_quantity INTEGER NOT NULL,
+    cost_per_item DECIMAL NOT NULL,
+    country VARCHAR(100),
+    created_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (id)
+);
+"""
+
+CREATE_PRELOAD_MANIFEST = f"""
+CREATE TABLE IF NOT EXISTS {PRELOAD_MANIFEST_TABLE} (
+    id INTEGER GENERATED ALWAYS AS IDENTITY,
+    source_file VARCHAR(100) NOT NULL,
+    file_size BIGINT,
+    file_mtime TIMESTAMP,
+    checksum CHAR(32),
+    row_count INTEGER,
+    duplicate_count INTEGER,
+    checkpoint_row INTEGER,
+    load_status VARCHAR(20) NOT NULL,
+    duplicate_of VARCHAR(100),
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP,
+    created_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (id),
+    CONSTRAINT uq_manifest_source_file
+        UNIQUE (source_file)
+);
+"""
+
+CREATE_PRELOAD_MANIFEST_CHECKSUM_INDEX = f"""
+CREATE INDEX IF NOT EXISTS idx_manifest_checksum
+    ON {PRELOAD_MANIFEST_TABLE} (checksum);
+"""
+
+# Adds the columns introduced after the manifest table was created.
+ALTER_PRELOAD_MANIFEST_DUPLICATE_COUNT = f"""
+ALTER TABLE {PRELOAD_MANIFEST_TABLE}
+    ADD COLUMN IF NOT EXISTS duplicate_count INTEGER;
+"""
+
+ALTER_PRELOAD_MANIFEST_CHECKPOINT_ROW = f"""
+ALTER TABLE {PRELOAD_MANIFEST_TABLE}
+    ADD COLUMN IF NOT EXISTS checkpoint_row INTEGER;
+"""
+
+# Registers the source files loaded before the manifest table existed; without their file
+#  properties, and with the number of loaded (not read) entries as row count.
+BACKFILL_PRELOAD_MANIFEST = f"""
+INSERT INTO {PRELOAD_MANIFEST_TABLE} (
+    source_file, row_count, load_status, started_at, finished_at, created_at
+)
+SELECT
+    source_file,
+    COUNT(*) AS row_count,
+    'loaded' AS load_status,
+    MIN(created_at) AS started_at,
+    MAX(created_at) AS finished_at,
+    MIN(created_at) AS created_at
+FROM {PRELOAD_TRANSACTION_TABLE}
+GROUP BY source_file
+ON CONFLICT (source_file) DO NOTHING;
+"""
+
+CREATE_PRELOAD_HASH_INDEX = f"""
+CREATE TABLE IF NOT EXISTS {PRELOAD_HASH_INDEX_TABLE} (
+    hash_id CHAR(32) NOT NULL,
+    source_file VARCHAR(100) NOT NULL,
+    created_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (hash_id)
+);
+"""
+
+# Registers the fingerprints of the entries loaded before the hash index table existed; the
+#  first load of each fingerprint is kept.
+BACKFILL_PRELOAD_HASH_INDEX = f"""
+INSERT INTO {PRELOAD_HASH_INDEX_TABLE} (hash_id, source_file, created_at)
+SELECT DISTINCT ON (hash_id)
+    hash_id,
+    source_file,
+    created_at
+FROM {PRELOAD_TRANSACTION_TABLE}
+ORDER BY hash_id, created_at
+ON CONFLICT (hash_id) DO NOTHING;
+"""
+
 CREATE_DIM_DATE = f"""
 CREATE TABLE IF NOT EXISTS {DIM_DATE_TABLE} (
     id INTEGER,
@@ -54,6 +156,36 @@ CREATE TABLE IF NOT EXISTS {DIM_LOCATION_TABLE} (
 );
 """
 
+CREATE_DIM_LOCATION_COUNTRY_NAME_INDEX = f"""
+CREATE UNIQUE INDEX IF NOT EXISTS uq_location_country_name
+    ON {DIM_LOCATION_TABLE} (country_name);
+"""
+
+CREATE_LOCATION_ALIAS = f"""
+CREATE TABLE IF NOT EXISTS {LOCATION_ALIAS_TABLE} (
+    raw_country VARCHAR(100) NOT NULL,
+    location_id INTEGER NOT NULL,
+    created_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (raw_country),
+    CONSTRAINT fk_alias_location
+        FOREIGN KEY (location_id)
+            REFERENCES {DIM_LOCATION_TABLE}(id)
+);
+"""
+
+# Maps the raw country names resolved before the alias table existed; these were stored under
+#  their raw names, while the unresolved ones are resolved again, once.
+BACKFILL_LOCATION_ALIAS = f"""
+INSERT INTO {LOCATION_ALIAS_TABLE} (raw_country, location_id, created_at)
+SELECT country_name, id, NOW()
+FROM {DIM_LOCATION_TABLE}
+WHERE country_name <> 'UNKNOWN'
+ON CONFLICT (raw_country) DO NOTHING;
+"""
+
+# The fact table is range-partitioned by its date id into monthly partitions, created by the
+#  partition function ahead of the loaded entries; its primary key must contain the partition key.
+#  The batch id is the upper preload id of the delta_loader run, which promoted the entry.
 CREATE_FACT_TRANSCTION = f"""
 CREATE TABLE IF NOT EXISTS {FACT_TRANSLATION_TABLE} (
     hash_id CHAR(32) NOT NULL,
@@ -67,7 +199,8 @@ CREATE TABLE IF NOT EXISTS {FACT_TRANSLATION_TABLE} (
     total_cost DECIMAL NOT NULL,
     location_id INTEGER NOT NULL,
     created_at TIMESTAMP NOT NULL,
-    PRIMARY KEY (hash_id),
+    batch_id INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (hash_id, date_id),
     CONSTRAINT fk_date
         FOREIGN KEY (date_id)
             REFERENCES {DIM_DATE_TABLE}(id),
@@ -77,5 +210,64 @@ CREATE TABLE IF NOT EXISTS {FACT_TRANSLATION_TABLE} (
     CONSTRAINT fk_location
         FOREIGN KEY (location_id)
             REFERENCES {DIM_LOCATION_TABLE}(id)
+) PARTITION BY RANGE (date_id);
+"""
+
+# Adds the batch id to the fact table created before the change feed; its entries are promoted
+#  in the batch 0.
+ALTER_FACT_TRANSACTION_BATCH_ID = f"""
+ALTER TABLE {FACT_TRANSLATION_TABLE}
+    ADD COLUMN IF NOT EXISTS batch_id INTEGER NOT NULL DEFAULT 0;
+"""
+
+CREATE_DELTA_LOAD_STATE = f"""
+CREATE TABLE IF NOT EXISTS {DELTA_LOAD_STATE_TABLE} (
+    target_table VARCHAR(100) NOT NULL,
+    last_preload_id INTEGER NOT NULL,
+    updated_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (target_table)
+);
+"""
+
+# Holds the last batch id of the fact table, which each change feed consumer has consumed.
+CREATE_CHANGE_FEED_OFFSET = f"""
+CREATE TABLE IF NOT EXISTS {CHANGE_FEED_OFFSET_TABLE} (
+    consumer VARCHAR(100) NOT NULL,
+    last_batch_id INTEGER NOT NULL,
+    updated_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (consumer)
+);
+"""
+
+# Sets the watermark of the fact table loaded before the state table existed; to the last preload
+#  entry created up to its latest promoted entry.
+BACKFILL_DELTA_LOAD_STATE = f"""
+INSERT INTO {DELTA_LOAD_STATE_TABLE} (target_table, last_preload_id, updated_at)
+SELECT
+    '{FACT_TRANSLATION_TABLE}' AS target_table,
+    COALESCE(MAX(id), 0) AS last_preload_id,
+    NOW() AS updated_at
+FROM {PRELOAD_TRANSACTION_TABLE}
+WHERE created_at <= (SELECT MAX(created_at) FROM {FACT_TRANSLATION_TABLE})
+ON CONFLICT (target_table) DO NOTHING;
+"""
+
+# Holds the unique delta of a delta_loader run; unlogged, as it is rebuilt from the preload table
+#  by every run.
+CREATE_UNIQUE_DELTA_PRELOAD = f"""
+CREATE UNLOGGED TABLE IF NOT EXISTS {UNIQUE_DELTA_PRELOAD_TABLE} (
+    id INTEGER NOT NULL,
+    hash_id CHAR(32) NOT NULL,
+    source_file VARCHAR(100) NOT NULL,
+    transaction_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    transaction_time TIMESTAMP NOT NULL,
+    item_code INTEGER NOT NULL,
+    item_description VARCHAR(255),
+    item_quantity INTEGER NOT NULL,
+    cost_per_item DECIMAL NOT NULL,
+    country VARCHAR(100),
+    created_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (hash_id)
 );
 """
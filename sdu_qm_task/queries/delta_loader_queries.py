@@ -1,61 +1,144 @@
 from sdu_qm_task.queries.table_names import (
     PRELOAD_TRANSACTION_TABLE,
+    DELTA_LOAD_STATE_TABLE,
+    UNIQUE_DELTA_PRELOAD_TABLE,
     DIM_DATE_TABLE,
     DIM_ITEM_TABLE,
     DIM_LOCATION_TABLE,
+    LOCATION_ALIAS_TABLE,
     FACT_TRANSLATION_TABLE
 )
+from sdu_qm_task.queries.pre_loader_queries import PRELOAD_COMMIT_LOCK_KEY
 
-UNIQUE_DELTA_PRELOAD_TABLE = "unique_delta_preload"
-
-DELTA_QUERY = f"""
-WITH fact_sub AS (
-    SELECT MAX(created_at) AS max_created_date
-    FROM {FACT_TRANSLATION_TABLE}
-), {UNIQUE_DELTA_PRELOAD_TABLE} AS (
-    SELECT *
-    FROM (
-        SELECT
-            *,
-            ROW_NUMBER() OVER(PARTITION BY hash_id ORDER BY created_at) AS row_num
-        FROM {PRELOAD_TRANSACTION_TABLE}
-    )
-    WHERE
-        row_num = 1
-        AND CASE
-            WHEN (SELECT max_created_date FROM fact_sub) IS NULL THEN TRUE
-            ELSE (SELECT max_created_date FROM fact_sub) < created_at
-        END
-)"""
+# Waits for the pre-loads in flight to commit, and holds the new ones back until the end of the
+#  transaction; so no preload id below the upper bound of the delta range is committed later.
+LOCK_PRELOAD_COMMITS_CMD = f"""
+SELECT pg_advisory_xact_lock({PRELOAD_COMMIT_LOCK_KEY});
+"""
+
+# Define the advisory lock, which serializes the delta_loader runs; as they share the staging
+#  table, from staging the delta to advancing the watermark. It is held by the session of a
+#  connection of its own, as the run spans several transactions and connections.
+DELTA_RUN_LOCK_KEY = f"hashtext('{UNIQUE_DELTA_PRELOAD_TABLE}')"
+
+TRY_LOCK_DELTA_RUN_QUERY = f"""
+SELECT pg_try_advisory_lock({DELTA_RUN_LOCK_KEY});
+"""
+
+LOCK_DELTA_RUN_CMD = f"""
+SELECT pg_advisory_lock({DELTA_RUN_LOCK_KEY});
+"""
+
+UNLOCK_DELTA_RUN_CMD = f"""
+SELECT pg_advisory_unlock({DELTA_RUN_LOCK_KEY});
+"""
+
+# Retrieves the watermark (the last promoted preload id) and the upper bound of the delta; both
+#  are looked up by primary key, regardless of the size of the history.
+DELTA_RANGE_QUERY = f"""
+SELECT
+    COALESCE(
+        (
+            SELECT last_preload_id
+            FROM {DELTA_LOAD_STATE_TABLE}
+            WHERE target_table = '{FACT_TRANSLATION_TABLE}'
+        ),
+        0
+    ) AS last_preload_id,
+    COALESCE((SELECT MAX(id) FROM {PRELOAD_TRANSACTION_TABLE}), 0) AS max_preload_id
+"""
+
+# Materializes the unique delta once per run into the staging table; read by all later steps.
+TRUNCATE_DELTA_CMD = f"""
+TRUNCATE {UNIQUE_DELTA_PRELOAD_TABLE};
+"""
+
+STAGE_DELTA_CMD = f"""
+INSERT INTO {UNIQUE_DELTA_PRELOAD_TABLE} (
+    id,
+    hash_id,
+    source_file,
+    transaction_id,
+    user_id,
+    transaction_time,
+    item_code,
+    item_description,
+    item_quantity,
+    cost_per_item,
+    country,
+    created_at
+)
+SELECT DISTINCT ON (hash_id)
+    id,
+    hash_id,
+    source_file,
+    transaction_id,
+    user_id,
+    transaction_time,
+    item_code,
+    item_description,
+    item_quantity,
+    cost_per_item,
+    country,
+    created_at
+FROM {PRELOAD_TRANSACTION_TABLE}
+WHERE
+    id > %(last_preload_id)s
+    AND id <= %(max_preload_id)s
+ORDER BY hash_id, id;
+"""
+
+ANALYZE_DELTA_CMD = f"""
+ANALYZE {UNIQUE_DELTA_PRELOAD_TABLE};
+"""
 
 COUNT_DELTA_QUERY = f"""
-{DELTA_QUERY}
 SELECT COUNT(*)
 FROM {UNIQUE_DELTA_PRELOAD_TABLE}
 """
 
+# Retrieves the raw country names, which have not been resolved yet.
 LOCATION_QUERY = f"""
-{DELTA_QUERY}
 SELECT DISTINCT country
-FROM {UNIQUE_DELTA_PRELOAD_TABLE}
-WHERE country NOT IN (
-    SELECT DISTINCT(country_name)
-    FROM {DIM_LOCATION_TABLE}
-)
+FROM {UNIQUE_DELTA_PRELOAD_TABLE} AS pt
+WHERE
+    country IS NOT NULL
+    AND NOT EXISTS(
+        SELECT raw_country
+        FROM {LOCATION_ALIAS_TABLE}
+        WHERE raw_country = pt.country
+    )
+ORDER BY country
 """
 
-LOCATION_INSERT_CMD = f"""
-INSERT INTO {DIM_LOCATION_TABLE}({{columns}})
-SELECT '{{values}}'
+# Inserts all new locations at once; `%s` is expanded to the VALUES list by `execute_values`.
+# Existing names are filtered before insertion, so no identity values are consumed by them; the
+#  unique constraint on the name resolves the concurrent insertions. The locations are inserted
+#  in the given order, so their ids do not depend on the query plan.
+LOCATION_UPSERT_CMD = f"""
+INSERT INTO {DIM_LOCATION_TABLE}(country_code, country_name, continent)
+SELECT new_location.country_code, new_location.country_name, new_location.continent
+FROM (VALUES %s) AS new_location(position, country_code, country_name, continent)
 WHERE NOT EXISTS(
     SELECT country_name
     FROM {DIM_LOCATION_TABLE}
-    WHERE country_name = '{{country_name}}'
-);
+    WHERE country_name = new_location.country_name
+)
+ORDER BY new_location.position
+ON CONFLICT (country_name) DO NOTHING;
+"""
+
+# Maps the resolved raw country names to the ids of their locations; `%s` is expanded to the
+#  VALUES list by `execute_values`.
+ALIAS_UPSERT_CMD = f"""
+INSERT INTO {LOCATION_ALIAS_TABLE}(raw_country, location_id, created_at)
+SELECT new_alias.raw_country, dl.id, NOW()
+FROM (VALUES %s) AS new_alias(raw_country, country_name)
+JOIN {DIM_LOCATION_TABLE} AS dl ON new_alias.country_name = dl.country_name
+ON CONFLICT (raw_country) DO NOTHING;
 """
 
 ITEM_INSERT_CMD = f"""
-{DELTA_QUERY}
 INSERT INTO {DIM_ITEM_TABLE}(id, description)
 SELECT
     item_code,
@@ -64,49 +147,110 @@ FROM {UNIQUE_DELTA_PRELOAD_TABLE}
 ON CONFLICT (id) DO NOTHING
 """
 
-DATE_INSERT_CMD = f"""
-{DELTA_QUERY}, pre_transaction_date AS (
+# Retrieves the date range of the staged delta, and the number of its days missing from the
+#  calendar; by the YYYYMMDD ids of the primary key, so gaps inside the calendar are found too.
+CALENDAR_COVERAGE_QUERY = f"""
+WITH delta_range AS (
     SELECT
-        CAST(
-            CONCAT(
-                EXTRACT(YEAR FROM transaction_time),
-                LPAD(EXTRACT(MONTH FROM transaction_time)::TEXT, 2, '0'),
-                LPAD(EXTRACT(DAY FROM transaction_time)::TEXT, 2, '0')
-            ) AS INTEGER
-        ) AS id,
-        CAST(transaction_time AS DATE) AS date,
-        EXTRACT(YEAR FROM transaction_time) AS year,
-        CONCAT('Q', EXTRACT(QUARTER FROM transaction_time)) AS quarter,
-        EXTRACT(MONTH FROM transaction_time) AS month,
-        EXTRACT(DAY FROM transaction_time) AS day
+        CAST(MIN(transaction_time) AS DATE) AS min_date,
+        CAST(MAX(transaction_time) AS DATE) AS max_date
     FROM {UNIQUE_DELTA_PRELOAD_TABLE}
 )
-INSERT INTO {DIM_DATE_TABLE}(id, date, year, quarter, month, day)
-SELECT id, date, year, quarter, month, day
-FROM pre_transaction_date
-ON CONFLICT (id) DO NOTHING
+SELECT
+    min_date,
+    max_date,
+    (
+        SELECT COUNT(*)
+        FROM generate_series(min_date, max_date, INTERVAL '1 day') AS calendar_day
+        WHERE NOT EXISTS (
+            SELECT 1
+            FROM {DIM_DATE_TABLE}
+            WHERE id = CAST(TO_CHAR(calendar_day, 'YYYYMMDD') AS INTEGER)
+        )
+    ) AS missing_day_count
+FROM delta_range
 """
 
-FACT_INSERT_CMD = f"""
-{DELTA_QUERY}
-INSERT INTO {FACT_TRANSLATION_TABLE}
+# Assembles the fact entries of the staged delta; tagged with the batch id of the run.
+FACT_SELECT = f"""
 SELECT
     hash_id,
     transaction_id,
     user_id,
-    dd.id AS date_id,
+    CAST(
+        EXTRACT(YEAR FROM transaction_time) * 10000
+        + EXTRACT(MONTH FROM transaction_time) * 100
+        + EXTRACT(DAY FROM transaction_time)
+        AS INTEGER
+    ) AS date_id,
     transaction_time,
     di.id AS item_id,
     item_quantity,
     cost_per_item,
     (item_quantity * cost_per_item) AS total_cost,
-    CASE
-        WHEN dl.id IS NOT NULL THEN dl.id
-        ELSE (SELECT id FROM {DIM_LOCATION_TABLE} WHERE country_name = 'UNKNOWN') END
-    AS location_id,
-    created_at
+    COALESCE(la.location_id, du.id) AS location_id,
+    pt.created_at,
+    CAST(%(batch_id)s AS INTEGER) AS batch_id
 FROM {UNIQUE_DELTA_PRELOAD_TABLE} AS pt
-LEFT JOIN {DIM_DATE_TABLE} AS dd ON CAST(pt.transaction_time AS DATE) = dd.date
 LEFT JOIN {DIM_ITEM_TABLE} AS di ON pt.item_code = di.id
-LEFT JOIN {DIM_LOCATION_TABLE} AS dl ON pt.country = dl.country_name;
+LEFT JOIN {LOCATION_ALIAS_TABLE} AS la ON pt.country = la.raw_country
+LEFT JOIN {DIM_LOCATION_TABLE} AS du ON du.country_name = 'UNKNOWN'
+"""
+
+# The conflicts are checked on any unique constraint; on the (hash_id, date_id) primary key of the
+#  partitioned fact table, as well as on the hash_id primary key of a not partitioned one.
+FACT_INSERT_CMD = f"""
+INSERT INTO {FACT_TRANSLATION_TABLE}
+{FACT_SELECT.strip()}
+ON CONFLICT DO NOTHING;
+"""
+
+# Promotes a shard of the staged delta; the entries of a preload id range (lower bound exclusive,
+#  upper bound inclusive).
+FACT_SHARD_INSERT_CMD = f"""
+INSERT INTO {FACT_TRANSLATION_TABLE}
+{FACT_SELECT.strip()}
+WHERE pt.id > %(lower_id)s AND pt.id <= %(upper_id)s
+ON CONFLICT DO NOTHING;
+"""
+
+# Retrieves the staged delta for assembling the fact entries on the client.
+FACT_SOURCE_QUERY = f"""
+SELECT
+    hash_id,
+    transaction_id,
+    user_id,
+    transaction_time,
+    item_code,
+    item_quantity,
+    cost_per_item,
+    country,
+    created_at
+FROM {UNIQUE_DELTA_PRELOAD_TABLE}
+"""
+
+LOCATION_KEYS_QUERY = f"""
+SELECT raw_country, location_id
+FROM {LOCATION_ALIAS_TABLE}
+WHERE raw_country = ANY(%(raw_countries)s)
+"""
+
+UNKNOWN_LOCATION_KEY_QUERY = f"""
+SELECT id FROM {DIM_LOCATION_TABLE} WHERE country_name = 'UNKNOWN'
+"""
+
+# Guards the COPY of the fact entries; as COPY can not skip conflicts, a conflicting load is
+#  rolled back to the savepoint, and repeated with the conflict-skipping insert.
+FACT_COPY_SAVEPOINT_CMD = "SAVEPOINT fact_copy"
+ROLLBACK_FACT_COPY_CMD = "ROLLBACK TO SAVEPOINT fact_copy"
+RELEASE_FACT_COPY_CMD = "RELEASE SAVEPOINT fact_copy"
+
+# Advances the watermark to the upper bound of the promoted delta.
+UPDATE_WATERMARK_CMD = f"""
+INSERT INTO {DELTA_LOAD_STATE_TABLE} (target_table, last_preload_id, updated_at)
+VALUES ('{FACT_TRANSLATION_TABLE}', %(max_preload_id)s, NOW())
+ON CONFLICT (target_table) DO UPDATE
+SET
+    last_preload_id = EXCLUDED.last_preload_id,
+    updated_at = EXCLUDED.updated_at;
 """
@@ -0,0 +1,116 @@
+from sdu_qm_task.queries.table_names import (
+    PRELOAD_TRANSACTION_TABLE,
+    SECONDARY_INDEX_VERSION_TABLE,
+    DIM_DATE_TABLE,
+    LOCATION_ALIAS_TABLE,
+    FACT_TRANSLATION_TABLE
+)
+
+# Define the secondary indexes, as their tables and indexed columns, by the version which
+#  introduced them; a changed set of indexes is released as a new version, never by editing an
+#  applied one. `dim_location(country_name)` is indexed by its unique index already.
+SECONDARY_INDEXES = {
+    1: [
+        (PRELOAD_TRANSACTION_TABLE, ["hash_id"]),
+        (PRELOAD_TRANSACTION_TABLE, ["created_at"]),
+        (PRELOAD_TRANSACTION_TABLE, ["source_file"]),
+        (DIM_DATE_TABLE, ["date"]),
+        (LOCATION_ALIAS_TABLE, ["location_id"]),
+        (FACT_TRANSLATION_TABLE, ["date_id"]),
+        (FACT_TRANSLATION_TABLE, ["item_id"]),
+        (FACT_TRANSLATION_TABLE, ["location_id"])
+    ],
+    # Serves the change feed, reading the fact entries of the new batches.
+    2: [
+        (FACT_TRANSLATION_TABLE, ["batch_id"])
+    ]
+}
+SECONDARY_INDEX_VERSION = max(SECONDARY_INDEXES)
+
+CREATE_SECONDARY_INDEX_VERSION = f"""
+CREATE TABLE IF NOT EXISTS {SECONDARY_INDEX_VERSION_TABLE} (
+    version INTEGER NOT NULL,
+    applied_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (version)
+);
+"""
+
+APPLIED_INDEX_VERSION_QUERY = f"""
+SELECT COALESCE(MAX(version), 0) FROM {SECONDARY_INDEX_VERSION_TABLE};
+"""
+
+RECORD_INDEX_VERSION_CMD = f"""
+INSERT INTO {SECONDARY_INDEX_VERSION_TABLE} (version, applied_at)
+VALUES (%(version)s, NOW())
+ON CONFLICT (version) DO NOTHING;
+"""
+
+# Forgets the applied versions from the given one on; so their indexes are built again, e.g. on a
+#  recreated table. The existing indexes are kept by their builds.
+RESET_INDEX_VERSION_CMD = f"""
+DELETE FROM {SECONDARY_INDEX_VERSION_TABLE} WHERE version >= %(version)s;
+"""
+
+# Retrieves the kind of a table; 'p' for a partitioned one.
+TABLE_KIND_QUERY = """
+SELECT relkind FROM pg_class WHERE oid = TO_REGCLASS(%(table)s);
+"""
+
+# Retrieves, if an index is left invalid; e.g. by a failed concurrent build.
+INVALID_INDEX_QUERY = """
+SELECT NOT indisvalid FROM pg_index WHERE indexrelid = TO_REGCLASS(%(index_name)s);
+"""
+
+# Builds an index without blocking the writes to its table; can not run inside a transaction.
+CREATE_INDEX_CONCURRENTLY_CMD = """
+CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} ON {table} ({columns});
+"""
+
+DROP_INDEX_CONCURRENTLY_CMD = """
+DROP INDEX CONCURRENTLY IF EXISTS {index_name};
+"""
+
+# Creates the index of a partitioned table on the parent only; it stays invalid until the indexes
+#  of all partitions are attached to it, and is cloned to the partitions created afterwards.
+CREATE_PARTITIONED_INDEX_CMD = """
+CREATE INDEX IF NOT EXISTS {index_name} ON ONLY {table} ({columns});
+"""
+
+# Retrieves the partitions of a table, which have no index attached to the given parent index.
+UNINDEXED_PARTITIONS_QUERY = """
+SELECT partition.relname
+FROM pg_inherits AS inheritance
+JOIN pg_class AS partition ON partition.oid = inheritance.inhrelid
+WHERE inheritance.inhparent = TO_REGCLASS(%(table)s)
+    AND NOT EXISTS (
+        SELECT 1
+        FROM pg_inherits AS index_inheritance
+        JOIN pg_index AS partition_index ON partition_index.indexrelid = index_inheritance.inhrelid
+        WHERE index_inheritance.inhparent = TO_REGCLASS(%(index_name)s)
+            AND partition_index.indrelid = partition.oid
+    )
+ORDER BY partition.relname;
+"""
+
+ATTACH_INDEX_CMD = """
+ALTER INDEX {index_name} ATTACH PARTITION {partition_index_name};
+"""
+
+# Retrieves the validity and the number of scans of the given indexes; the scans of a partitioned
+#  index are the scans of the indexes of its partitions. An index, which does not exist, has no
+#  validity.
+INDEX_STATUS_QUERY = """
+SELECT
+    expected.index_name,
+    pi.indisvalid AS is_valid,
+    (
+        SELECT COALESCE(SUM(s.idx_scan), 0)
+        FROM pg_stat_user_indexes AS s
+        WHERE s.indexrelid = pc.oid
+            OR s.indexrelid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = pc.oid)
+    ) AS scan_count
+FROM UNNEST(CAST(%(index_names)s AS TEXT[])) AS expected(index_name)
+LEFT JOIN pg_class AS pc ON pc.relname = expected.index_name AND pc.relkind IN ('i', 'I')
+LEFT JOIN pg_index AS pi ON pi.indexrelid = pc.oid
+ORDER BY expected.index_name;
+"""
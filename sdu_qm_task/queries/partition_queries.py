@@ -0,0 +1,107 @@
+from sdu_qm_task.queries.table_names import FACT_TRANSLATION_TABLE
+
+# Define the function, which creates the monthly partitions of the fact table.
+CREATE_FACT_PARTITIONS_FUNCTION_NAME = f"create_{FACT_TRANSLATION_TABLE}_partitions"
+
+# Define the default partition of the fact table; holding the entries of the months, which have
+#  no partition yet, until their partition is created.
+FACT_DEFAULT_PARTITION = f"{FACT_TRANSLATION_TABLE}_default"
+
+# Define the name, under which a fact table created before its partitioning is migrated.
+UNPARTITIONED_FACT_TABLE = f"{FACT_TRANSLATION_TABLE}_unpartitioned"
+
+# Creates the default partition, and the missing monthly partitions of the fact table between two
+#  dates (inclusive); named after their months (e.g. `fact_transaction_p201901`), and bounded by
+#  the YYYYMMDD ids of the first days of their months. The entries of a month, which fell into
+#  the default partition, are moved into its new partition; which is attached afterwards, as a
+#  range can not be created while the default partition holds entries of it. Returns the number
+#  of created partitions; or NULL, if the fact table is not partitioned (i.e. created before its
+#  partitioning, and not migrated yet).
+CREATE_FACT_PARTITIONS_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION {CREATE_FACT_PARTITIONS_FUNCTION_NAME}(
+    start_date DATE, end_date DATE
+)
+RETURNS INTEGER AS $$
+DECLARE
+    month_start DATE := CAST(DATE_TRUNC('month', start_date) AS DATE);
+    partition_name TEXT;
+    lower_bound TEXT;
+    upper_bound TEXT;
+    created_count INTEGER := 0;
+BEGIN
+    IF (
+        SELECT relkind FROM pg_class WHERE oid = TO_REGCLASS('{FACT_TRANSLATION_TABLE}')
+    ) IS DISTINCT FROM 'p' THEN
+        RETURN NULL;
+    END IF;
+
+    IF TO_REGCLASS('{FACT_DEFAULT_PARTITION}') IS NULL THEN
+        CREATE TABLE {FACT_DEFAULT_PARTITION} PARTITION OF {FACT_TRANSLATION_TABLE} DEFAULT;
+    END IF;
+
+    WHILE month_start <= end_date LOOP
+        partition_name := '{FACT_TRANSLATION_TABLE}_p' || TO_CHAR(month_start, 'YYYYMM');
+        lower_bound := TO_CHAR(month_start, 'YYYYMMDD');
+        upper_bound := TO_CHAR(month_start + INTERVAL '1 month', 'YYYYMMDD');
+        IF TO_REGCLASS(partition_name) IS NULL THEN
+            EXECUTE FORMAT(
+                'CREATE TABLE %I (LIKE {FACT_TRANSLATION_TABLE} INCLUDING DEFAULTS)',
+                partition_name
+            );
+            EXECUTE FORMAT(
+                'WITH moved AS ('
+                '    DELETE FROM {FACT_DEFAULT_PARTITION}'
+                '    WHERE date_id >= %s AND date_id < %s RETURNING *'
+                ') INSERT INTO %I SELECT * FROM moved',
+                lower_bound, upper_bound, partition_name
+            );
+            EXECUTE FORMAT(
+                'ALTER TABLE {FACT_TRANSLATION_TABLE} ATTACH PARTITION %I '
+                'FOR VALUES FROM (%s) TO (%s)',
+                partition_name, lower_bound, upper_bound
+            );
+            created_count := created_count + 1;
+        END IF;
+        month_start := CAST(month_start + INTERVAL '1 month' AS DATE);
+    END LOOP;
+
+    RETURN created_count;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+CREATE_FACT_PARTITIONS_CMD = f"""
+SELECT {CREATE_FACT_PARTITIONS_FUNCTION_NAME}(
+    CAST(%(start_date)s AS DATE), CAST(%(end_date)s AS DATE)
+);
+"""
+
+# Renames a fact table created before its partitioning, along with its primary key index; so the
+#  partitioned fact table can be created under their names.
+RENAME_UNPARTITIONED_FACT_CMD = f"""
+ALTER TABLE {FACT_TRANSLATION_TABLE} RENAME TO {UNPARTITIONED_FACT_TABLE};
+ALTER INDEX IF EXISTS {FACT_TRANSLATION_TABLE}_pkey RENAME TO {UNPARTITIONED_FACT_TABLE}_pkey;
+"""
+
+# Retrieves the first and last date of the entries of the renamed fact table.
+UNPARTITIONED_FACT_DATE_RANGE_QUERY = f"""
+SELECT
+    TO_DATE(CAST(MIN(date_id) AS TEXT), 'YYYYMMDD'),
+    TO_DATE(CAST(MAX(date_id) AS TEXT), 'YYYYMMDD')
+FROM {UNPARTITIONED_FACT_TABLE};
+"""
+
+COPY_UNPARTITIONED_FACT_CMD = f"""
+INSERT INTO {FACT_TRANSLATION_TABLE} (
+    hash_id, transaction_id, user_id, date_id, transaction_time, item_id, item_quantity,
+    cost_per_item, total_cost, location_id, created_at, batch_id
+)
+SELECT
+    hash_id, transaction_id, user_id, date_id, transaction_time, item_id, item_quantity,
+    cost_per_item, total_cost, location_id, created_at, batch_id
+FROM {UNPARTITIONED_FACT_TABLE};
+"""
+
+DROP_UNPARTITIONED_FACT_CMD = f"""
+DROP TABLE {UNPARTITIONED_FACT_TABLE};
+"""
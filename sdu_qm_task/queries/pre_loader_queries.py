@@ -1,6 +1,102 @@
-from sdu_qm_task.queries.table_names import PRELOAD_TRANSACTION_TABLE
+from sdu_qm_task.queries.table_names import (
+    PRELOAD_HASH_INDEX_TABLE,
+    PRELOAD_MANIFEST_TABLE,
+    PRELOAD_TRANSACTION_TABLE
+)
 
-PRELOAD_SOURCE_FILE_QUERY = f"""
-    SELECT DISTINCT source_file
-    FROM {PRELOAD_TRANSACTION_TABLE};
+# Define the load statuses of the source files in the manifest table.
+LOADED_STATUS = "loaded"
+DUPLICATE_STATUS = "duplicate"
+LOADING_STATUS = "loading"
+
+# Define the advisory lock, which serializes the pre-load commits against the upper bound of the
+#  delta range; as the preload ids become visible at commit, not in their order. Each pre-load
+#  transaction holds it shared until it commits; the delta loader takes it exclusively, to read
+#  the upper bound once the pre-loads in flight are committed.
+PRELOAD_COMMIT_LOCK_KEY = f"hashtext('{PRELOAD_TRANSACTION_TABLE}')"
+
+LOCK_PRELOAD_COMMITS_SHARED_CMD = f"""
+SELECT pg_advisory_xact_lock_shared({PRELOAD_COMMIT_LOCK_KEY});
+"""
+
+# Retrieves which of the source files are completed; a partially loaded file is resumed instead.
+MANIFEST_SOURCE_FILE_QUERY = f"""
+    SELECT source_file
+    FROM {PRELOAD_MANIFEST_TABLE}
+    WHERE
+        source_file = ANY(%(source_files)s)
+        AND load_status <> '{LOADING_STATUS}';
+"""
+
+# Retrieves the checkpoints of the partially loaded source files.
+MANIFEST_CHECKPOINT_QUERY = f"""
+    SELECT source_file, checksum, checkpoint_row, duplicate_count, started_at
+    FROM {PRELOAD_MANIFEST_TABLE}
+    WHERE
+        source_file = ANY(%(source_files)s)
+        AND load_status = '{LOADING_STATUS}';
+"""
+
+MANIFEST_CHECKSUM_QUERY = f"""
+    SELECT checksum, source_file
+    FROM {PRELOAD_MANIFEST_TABLE}
+    WHERE
+        checksum = ANY(%(checksums)s)
+        AND load_status = '{LOADED_STATUS}';
+"""
+
+# Records a source file; its checkpoint is overwritten until the file is completed.
+INSERT_MANIFEST_QUERY = f"""
+    INSERT INTO {PRELOAD_MANIFEST_TABLE} (
+        source_file,
+        file_size,
+        file_mtime,
+        checksum,
+        row_count,
+        duplicate_count,
+        checkpoint_row,
+        load_status,
+        duplicate_of,
+        started_at,
+        finished_at,
+        created_at
+    )
+    VALUES (
+        %(source_file)s,
+        %(file_size)s,
+        %(file_mtime)s,
+        %(checksum)s,
+        %(row_count)s,
+        %(duplicate_count)s,
+        %(checkpoint_row)s,
+        %(load_status)s,
+        %(duplicate_of)s,
+        %(started_at)s,
+        %(finished_at)s,
+        %(created_at)s
+    )
+    ON CONFLICT (source_file) DO UPDATE
+    SET
+        file_size = EXCLUDED.file_size,
+        file_mtime = EXCLUDED.file_mtime,
+        checksum = EXCLUDED.checksum,
+        row_count = EXCLUDED.row_count,
+        duplicate_count = EXCLUDED.duplicate_count,
+        checkpoint_row = EXCLUDED.checkpoint_row,
+        load_status = EXCLUDED.load_status,
+        duplicate_of = EXCLUDED.duplicate_of,
+        started_at = EXCLUDED.started_at,
+        finished_at = EXCLUDED.finished_at,
+        created_at = EXCLUDED.created_at
+    WHERE {PRELOAD_MANIFEST_TABLE}.load_status = '{LOADING_STATUS}';
+"""
+
+# Registers a batch of fingerprints; only the new ones are inserted and returned.
+INSERT_HASH_INDEX_QUERY = f"""
+    INSERT INTO {PRELOAD_HASH_INDEX_TABLE} (hash_id, source_file, created_at)
+    SELECT hash_id, source_file, %(created_at)s
+    FROM UNNEST(%(hash_ids)s::CHAR(32)[], %(source_files)s::VARCHAR(100)[])
+        AS batch(hash_id, source_file)
+    ON CONFLICT (hash_id) DO NOTHING
+    RETURNING hash_id;
 """
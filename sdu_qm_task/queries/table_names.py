@@ -2,8 +2,19 @@
 PRELOAD_TRANSACTION_TABLE = "preload_transaction"
 DUPLICATE_TRANSACTION_TABLE = "duplicate_transaction"
 
+# Bookkeeping tables
+PRELOAD_MANIFEST_TABLE = "preload_manifest"
+PRELOAD_HASH_INDEX_TABLE = "preload_hash_index"
+DELTA_LOAD_STATE_TABLE = "delta_load_state"
+SECONDARY_INDEX_VERSION_TABLE = "secondary_index_version"
+CHANGE_FEED_OFFSET_TABLE = "change_feed_offset"
+
+# Staging tables
+UNIQUE_DELTA_PRELOAD_TABLE = "unique_delta_preload"
+
 # Refined tables
 DIM_DATE_TABLE = "dim_date"
 DIM_ITEM_TABLE = "dim_item"
 DIM_LOCATION_TABLE = "dim_location"
+LOCATION_ALIAS_TABLE = "location_alias"
 FACT_TRANSLATION_TABLE = "fact_transaction"
@@ -72,3 +72,12 @@ def test_archive(monkeypatch, archiver, archive_folder, archive_file, entries):
 
     assert archive_file.exists()
     assert pd.read_csv(archive_file).to_dict() == entries.to_dict()
+
+
+def test_save_to_archive_appends(archiver, archive_file, entries):
+    archiver._save_to_archive(archive_file, entries)
+    archiver._save_to_archive(archive_file, entries)
+
+    assert pd.read_csv(archive_file).to_dict() == pd.concat(
+        [entries, entries], ignore_index=True
+    ).to_dict()
@@ -0,0 +1,147 @@
+from datetime import datetime
+import gzip
+
+import pandas as pd
+import pytest
+
+from sdu_qm_task.etl.change_feed import ChangeFeed, START_OFFSET
+from sdu_qm_task.queries import change_feed_queries as cf_queries
+
+
+COLUMNS = ["hash_id", "created_at", "batch_id"]
+
+
+class FakeCursor():
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.executed = []
+        self.description = [(column,) for column in COLUMNS]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        pass
+
+    def execute(self, query, params=None):
+        self.executed.append((query, params))
+
+    def fetchone(self):
+        return self.rows.pop(0)
+
+    def fetchmany(self, size):
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return batch
+
+
+class FakeConnection():
+    def __init__(self, cursor, feed_cursor):
+        self._cursor = cursor
+        self.feed_cursor = feed_cursor
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        pass
+
+    def cursor(self, name=None):
+        return self.feed_cursor if name is not None else self._cursor
+
+
+@pytest.fixture
+def created_at():
+    return datetime(2024, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def feed_rows(created_at):
+    return [("a", created_at, 20), ("b", created_at, 20), ("c", created_at, 25)]
+
+
+@pytest.mark.parametrize("consumer, itersize, output", [
+    ("", 10, "frame"), ("c" * 101, 10, "frame"), ("export", 0, "frame"), ("export", 10, "csv")
+])
+def test_invalid_options(consumer, itersize, output):
+    with pytest.raises(ValueError):
+        ChangeFeed(consumer, itersize, output)
+
+
+def test_read_streams_batches(feed_rows):
+    cursor = FakeCursor([None, (25,)])
+    feed_cursor = FakeCursor(feed_rows)
+    change_feed = ChangeFeed("export", itersize=2)
+    change_feed.psql_connection = FakeConnection(cursor, feed_cursor)
+
+    batches = list(change_feed.read())
+
+    # A new consumer reads from the start; up to the last committed batch.
+    expected_range = {"consumer": "export", "last_batch_id": START_OFFSET, "upper_batch_id": 25}
+    assert feed_cursor.executed == [(cf_queries.CHANGE_FEED_QUERY, expected_range)]
+    assert [len(batch) for batch in batches] == [2, 1]
+    assert batches[0].columns.tolist() == COLUMNS
+    assert change_feed.pending_range == expected_range
+
+    change_feed.commit()
+
+    assert cursor.executed[-1] == (cf_queries.UPDATE_OFFSET_CMD, expected_range)
+    assert change_feed.pending_range is None
+
+
+def test_read_records(feed_rows, created_at):
+    change_feed = ChangeFeed("export", output="records")
+    change_feed.psql_connection = FakeConnection(FakeCursor([(20,), (25,)]), FakeCursor(feed_rows))
+
+    assert list(change_feed.read()) == [[
+        {"hash_id": "a", "created_at": created_at, "batch_id": 20},
+        {"hash_id": "b", "created_at": created_at, "batch_id": 20},
+        {"hash_id": "c", "created_at": created_at, "batch_id": 25}
+    ]]
+
+
+def test_read_without_new_batches():
+    feed_cursor = FakeCursor([])
+    change_feed = ChangeFeed("export")
+    change_feed.psql_connection = FakeConnection(FakeCursor([(25,), (25,)]), feed_cursor)
+
+    assert list(change_feed.read()) == []
+    assert feed_cursor.executed == []
+    assert change_feed.pending_range is None
+
+
+def test_interrupted_read_is_not_committed(feed_rows):
+    cursor = FakeCursor([(0,), (25,)])
+    change_feed = ChangeFeed("export", itersize=1)
+    change_feed.psql_connection = FakeConnection(cursor, FakeCursor(feed_rows))
+
+    batches = change_feed.read()
+    next(batches)
+    batches.close()
+    change_feed.commit()
+
+    assert change_feed.pending_range is None
+    assert all(query != cf_queries.UPDATE_OFFSET_CMD for query, _ in cursor.executed)
+
+
+def test_export(tmp_path, feed_rows):
+    cursor = FakeCursor([(0,), (25,)])
+    change_feed = ChangeFeed("export", itersize=2)
+    change_feed.psql_connection = FakeConnection(cursor, FakeCursor(feed_rows))
+
+    export_file = change_feed.export(tmp_path.as_posix())
+
+    assert export_file == tmp_path / "export" / "fact_transaction_0000000020-0000000025.csv.gz"
+    assert [path.name for path in export_file.parent.iterdir()] == [export_file.name]
+    with gzip.open(export_file, "rt") as file:
+        export_df = pd.read_csv(file)
+    assert export_df["hash_id"].tolist() == ["a", "b", "c"]
+    # The offset is advanced, once the export file is complete.
+    assert cursor.executed[-1][0] == cf_queries.UPDATE_OFFSET_CMD
+
+
+def test_export_without_new_batches(tmp_path):
+    change_feed = ChangeFeed("export")
+    change_feed.psql_connection = FakeConnection(FakeCursor([(25,), (25,)]), FakeCursor([]))
+
+    assert change_feed.export(tmp_path.as_posix()) is None
+    assert list((tmp_path / "export").iterdir()) == []
@@ -0,0 +1,91 @@
+from datetime import datetime
+import gzip
+
+import pandas as pd
+import pytest
+
+from sdu_qm_task.etl.compactor import PreloadCompactor
+from sdu_qm_task.queries import compactor_queries as cp_queries
+
+
+COLUMNS = ["id", "hash_id", "created_at"]
+
+
+class FakeCursor():
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.executed = []
+        self.description = [(column,) for column in COLUMNS]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        pass
+
+    def execute(self, query, params=None):
+        self.executed.append((query, params))
+
+    def fetchall(self):
+        return self.batches.pop(0) if self.batches else []
+
+
+class FakeConnection():
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.commit_count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        pass
+
+    def cursor(self):
+        return self._cursor
+
+    def commit(self):
+        self.commit_count += 1
+
+
+@pytest.fixture
+def created_at():
+    return datetime(2024, 1, 1, 12, 0, 0)
+
+
+@pytest.mark.parametrize("retention_days, batch_size", [(-1, 10), (7, 0)])
+def test_invalid_options(retention_days, batch_size):
+    with pytest.raises(ValueError):
+        PreloadCompactor(retention_days, batch_size)
+
+
+def test_run_compacts_in_batches(tmp_path, created_at):
+    cursor = FakeCursor([
+        [(2, "b", created_at), (1, "a", created_at)],
+        [(3, "c", created_at)]
+    ])
+    compactor = PreloadCompactor(retention_days=0, batch_size=2, folder=tmp_path.as_posix())
+    compactor.psql_connection = connection = FakeConnection(cursor)
+
+    assert compactor.run() == 3
+
+    # A full batch is followed by the next one; each batch is committed after its file.
+    assert [query for query, _ in cursor.executed] == [cp_queries.COMPACT_PRELOAD_CMD] * 2
+    assert cursor.executed[0][1]["batch_size"] == 2
+    assert connection.commit_count == 2
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "preload_transaction_0000000001-0000000002.csv.gz",
+        "preload_transaction_0000000003-0000000003.csv.gz"
+    ]
+    with gzip.open(tmp_path / "preload_transaction_0000000001-0000000002.csv.gz", "rt") as file:
+        cold_df = pd.read_csv(file)
+    assert cold_df["hash_id"].tolist() == ["a", "b"]
+
+
+def test_run_without_compactable_entries(tmp_path):
+    compactor = PreloadCompactor(folder=tmp_path.as_posix())
+    compactor.psql_connection = FakeConnection(FakeCursor([]))
+
+    assert compactor.run() == 0
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,102 @@
+from datetime import datetime
+
+from dateutil import tz
+import pandas as pd
+import pytest
+
+from sdu_qm_task.etl.copy_loader import CopyLoader
+from sdu_qm_task.etl.pre_loader import PreLoader
+
+
+class FakeCursor():
+    def __init__(self, session_timezone):
+        self.session_timezone = session_timezone
+        self.copied = []
+
+    def execute(self, query):
+        pass
+
+    def fetchone(self):
+        return (self.session_timezone,)
+
+    def copy_expert(self, command, buffer):
+        self.copied.append((command, buffer.read()))
+
+
+@pytest.fixture
+def cursor():
+    return FakeCursor("UTC")
+
+
+@pytest.fixture
+def copy_loader(cursor):
+    return CopyLoader(cursor)
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        "transaction_time": [
+            datetime(2019, 7, 5, 14, 10, tzinfo=tz.gettz("Europe/Dublin")),
+            datetime(2019, 2, 5, 13, 10)
+        ],
+        "item_description": ["TAB\tAND \\ BACKSLASH", None],
+        "cost_per_item": [5.18, float("nan")],
+        "item_quantity": [6, 12]
+    })
+
+
+def test_unsupported_session_timezone():
+    with pytest.raises(ValueError):
+        CopyLoader(FakeCursor("Not/A_Timezone"))
+
+
+def test_encode_frame(copy_loader, df):
+    assert copy_loader._encode_frame(df).read() == (
+        "2019-07-05 13:10:00\tTAB\\tAND \\\\ BACKSLASH\t5.18\t6\n"
+        "2019-02-05 13:10:00\t\\N\t\\N\t12\n"
+    )
+
+
+def test_encode_whole_floats(copy_loader):
+    df = pd.DataFrame({
+        "user_id": [325794.0, float("nan")],
+        "cost_per_item": [5.18, 2.0]
+    })
+
+    # Integer columns read as floats are encoded without fractions; others are kept.
+    assert copy_loader._encode_frame(df).read() == "325794\t5.18\n\\N\t2.0\n"
+
+
+def test_encode_row_mode_entries_with_missing_integer_in_dropped_entry(
+        monkeypatch, tmp_path, copy_loader
+    ):
+    # The user id is missing only in the entry with an unknown timezone, which is archived.
+    source_file = tmp_path / "source_file_1.csv"
+    source_file.write_text(
+        "UserId,TransactionId,TransactionTime,ItemCode,ItemDescription,"
+        "NumberOfItemsPurchased,CostPerItem,Country\n"
+        "325794,6365337,Tue Feb 05 13:10:00 IST 2019,472731,DOORSTOP,6,5.18,United Kingdom\n"
+        ",6365338,Tue Feb 05 13:10:00 XAB 2019,472732,DOORSTOP,6,5.18,United Kingdom\n"
+    )
+    monkeypatch.setattr(PreLoader, "_send_to_archive", lambda self, entries: None)
+    pre_loader = PreLoader(tmp_path.as_posix())
+
+    df = pre_loader.source_reader.read(source_file)
+    delta_df = pre_loader.transform({source_file.name: pre_loader._get_delta_file_load(df)})
+
+    assert df["UserId"].dtype.kind == "f"
+    assert copy_loader._encode_frame(
+        delta_df[["user_id", "transaction_id", "item_code", "item_quantity", "cost_per_item"]]
+    ).read() == "325794\t6365337\t472731\t6\t5.18\n"
+
+
+def test_copy(copy_loader, cursor, df):
+    assert copy_loader.copy(df, "table_name") == 2
+    assert cursor.copied[0][0] == (
+        "COPY table_name (transaction_time, item_description, cost_per_item, item_quantity) "
+        "FROM STDIN"
+    )
+
+    assert copy_loader.copy(df.iloc[:0], "table_name") == 0
+    assert len(cursor.copied) == 1
@@ -0,0 +1,50 @@
+import pandas as pd
+import pytest
+
+from sdu_qm_task.etl.country_resolver import CountryResolver, UNKNOWN_LOCATION
+
+
+@pytest.fixture(scope="module")
+def resolver():
+    return CountryResolver(aliases={"EIRE": "IRL"})
+
+
+@pytest.mark.parametrize("country_name, expected_location", [
+    ("United Kingdom", ("United Kingdom", "GBR", "Europe")),
+    ("united kingdom", ("united kingdom", "GBR", "Europe")),
+    ("GB", ("GB", "GBR", "Europe")),
+    ("USA", ("USA", "USA", "North America")),
+    ("826", ("826", "GBR", "Europe")),
+    ("Korea, Republic of", ("Korea, Republic of", "KOR", "Asia")),
+    ("Cote d'Ivoire", ("Cote d'Ivoire", "CIV", "Africa")),
+    ("Guinea Bissau", ("Guinea Bissau", "GNB", "Africa")),
+    ("EIRE", ("EIRE", "IRL", "Europe")),
+    ("Atlantis", UNKNOWN_LOCATION),
+    ("", UNKNOWN_LOCATION),
+    (None, UNKNOWN_LOCATION),
+])
+def test_resolve(resolver, country_name, expected_location):
+    assert resolver.resolve(country_name) == expected_location
+
+
+def test_resolve_series(resolver):
+    country_names = pd.Series(["USA", "Atlantis", "USA", None], index=[5, 6, 7, 8])
+
+    locations = resolver.resolve_series(country_names)
+
+    assert locations.index.tolist() == [5, 6, 7, 8]
+    assert locations["country_code"].tolist() == ["USA", "N/A", "USA", "N/A"]
+    assert locations["continent"].tolist() == [
+        "North America", "UNKNOWN", "North America", "UNKNOWN"
+    ]
+
+
+def test_resolve_caches_distinct_names(resolver):
+    resolver.resolve_series(pd.Series(["France", "France", "Mars"]))
+
+    assert {"France", "Mars"} <= set(resolver.cache.keys())
+
+
+def test_unknown_alias():
+    with pytest.raises(ValueError):
+        CountryResolver(aliases={"Atlantis": "XYZ"})
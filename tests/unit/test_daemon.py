@@ -0,0 +1,95 @@
+from pathlib import Path
+import tempfile
+
+import pytest
+
+from sdu_qm_task.daemon import PipelineDaemon
+
+
+@pytest.fixture
+def temp_folder():
+    with tempfile.TemporaryDirectory() as td:
+        yield Path(td)
+
+
+@pytest.fixture
+def daemon(temp_folder):
+    return PipelineDaemon(
+        source_folder=temp_folder.as_posix(),
+        folder=temp_folder.as_posix(),
+        interval=0.01,
+        lock_file=Path(temp_folder, "daemon.lock").as_posix()
+    )
+
+
+@pytest.fixture
+def stage_calls(daemon, monkeypatch):
+    calls = []
+
+    def fail():
+        calls.append("pre_loader")
+        raise RuntimeError("Stage failed.")
+
+    monkeypatch.setattr(daemon, "_feed", lambda: calls.append("feeder"))
+    monkeypatch.setattr(daemon, "_pre_load", fail)
+    monkeypatch.setattr(daemon.delta_loader, "run", lambda: calls.append("delta_loader"))
+    monkeypatch.setattr(daemon.compactor, "run", lambda: calls.append("compactor"))
+    return calls
+
+
+def test_stages_share_connection(daemon):
+    assert daemon.psql_connection.persistent
+    assert daemon.pre_loader.psql_connection is daemon.psql_connection
+    assert daemon.delta_loader.psql_connection is daemon.psql_connection
+    assert daemon.compactor.psql_connection is daemon.psql_connection
+
+
+def test_tick_survives_failing_stage(daemon, stage_calls):
+    timings = daemon.tick(1)
+
+    assert stage_calls == ["feeder", "pre_loader", "delta_loader", "compactor"]
+    assert list(timings.keys()) == ["feeder", "pre_loader", "delta_loader", "compactor", "total"]
+    assert all(seconds >= 0 for seconds in timings.values())
+
+
+def test_run_given_ticks(daemon, stage_calls):
+    daemon.run(ticks=2)
+
+    assert stage_calls == ["feeder", "pre_loader", "delta_loader", "compactor"] * 2
+
+
+def test_run_stopped(daemon, stage_calls):
+    daemon.stop()
+    daemon.run(ticks=2)
+
+    assert stage_calls == []
+
+
+def test_lock_prevents_overlapping_daemons(daemon, stage_calls):
+    lock = daemon._acquire_lock()
+    assert lock is not None
+
+    daemon.run(ticks=1)
+    assert stage_calls == []
+    lock.close()
+
+    lock = daemon._acquire_lock()
+    assert lock is not None
+    lock.close()
+
+
+def test_invalid_interval(temp_folder):
+    with pytest.raises(ValueError):
+        PipelineDaemon(temp_folder.as_posix(), temp_folder.as_posix(), interval=0)
+
+
+def test_compaction_skipped_after_failed_delta_load(daemon, stage_calls, monkeypatch):
+    def fail():
+        stage_calls.append("delta_loader")
+        raise RuntimeError("Stage failed.")
+
+    monkeypatch.setattr(daemon.delta_loader, "run", fail)
+
+    daemon.tick(1)
+
+    assert stage_calls == ["feeder", "pre_loader", "delta_loader"]
@@ -1,19 +1,247 @@
+from datetime import date
+
 import pytest
 
+from sdu_qm_task.db_init import db_initializer as db_init_module
 from sdu_qm_task.db_init.db_initializer import DBInitializer
+from sdu_qm_task.queries import calendar_queries as cal_queries
 from sdu_qm_task.queries import create_table_queries as ct_queries
+from sdu_qm_task.queries import index_queries as ix_queries
+from sdu_qm_task.queries import partition_queries as pt_queries
 
 
 @pytest.fixture
 def expected_command_list():
     return [
         ct_queries.CREATE_PRELOAD_TRANSACTION,
+        ct_queries.CREATE_DUPLICATE_TRANSACTION,
+        ct_queries.CREATE_PRELOAD_MANIFEST,
+        ct_queries.ALTER_PRELOAD_MANIFEST_DUPLICATE_COUNT,
+        ct_queries.ALTER_PRELOAD_MANIFEST_CHECKPOINT_ROW,
+        ct_queries.CREATE_PRELOAD_MANIFEST_CHECKSUM_INDEX,
+        ct_queries.BACKFILL_PRELOAD_MANIFEST,
+        ct_queries.CREATE_PRELOAD_HASH_INDEX,
+        ct_queries.BACKFILL_PRELOAD_HASH_INDEX,
         ct_queries.CREATE_DIM_DATE,
         ct_queries.CREATE_DIM_ITEM,
         ct_queries.CREATE_DIM_LOCATION,
-        ct_queries.CREATE_FACT_TRANSCTION
+        ct_queries.CREATE_DIM_LOCATION_COUNTRY_NAME_INDEX,
+        ct_queries.CREATE_LOCATION_ALIAS,
+        ct_queries.BACKFILL_LOCATION_ALIAS,
+        ct_queries.CREATE_FACT_TRANSCTION,
+        ct_queries.ALTER_FACT_TRANSACTION_BATCH_ID,
+        pt_queries.CREATE_FACT_PARTITIONS_FUNCTION,
+        ct_queries.CREATE_DELTA_LOAD_STATE,
+        ct_queries.BACKFILL_DELTA_LOAD_STATE,
+        ct_queries.CREATE_CHANGE_FEED_OFFSET,
+        ct_queries.CREATE_UNIQUE_DELTA_PRELOAD,
+        ix_queries.CREATE_SECONDARY_INDEX_VERSION
     ]
 
 
 def test_get_commands(expected_command_list):
     assert DBInitializer()._get_commands() == expected_command_list
+
+
+def test_invalid_calendar_range():
+    with pytest.raises(ValueError):
+        DBInitializer(calendar_start="2019-01-01", calendar_end="2018-12-31")
+
+
+def test_invalid_partitions_ahead():
+    with pytest.raises(ValueError):
+        DBInitializer(partitions_ahead=-1)
+
+
+def test_generate_calendar():
+    class FakeCursor():
+        rowcount = 365
+
+        def execute(self, query, params):
+            self.executed = (query, params)
+
+    cursor = FakeCursor()
+    DBInitializer(calendar_start="2019-01-01", calendar_end="2019-12-31").generate_calendar(cursor)
+
+    assert cursor.executed == (
+        cal_queries.GENERATE_DIM_DATE_CMD,
+        {"start_date": date(2019, 1, 1), "end_date": date(2019, 12, 31)}
+    )
+
+
+@pytest.mark.parametrize("today, partitions_ahead, expected_range", [
+    (date(2019, 5, 17), 3, (date(2019, 5, 1), date(2019, 8, 1))),
+    (date(2019, 11, 2), 2, (date(2019, 11, 1), date(2020, 1, 1))),
+    (date(2019, 12, 31), 0, (date(2019, 12, 1), date(2019, 12, 1))),
+])
+def test_create_partitions(monkeypatch, today, partitions_ahead, expected_range):
+    class FakeDate(date):
+        @classmethod
+        def today(cls):
+            return today
+
+    class FakeCursor():
+        def execute(self, query, params):
+            self.executed = (query, params)
+
+        def fetchone(self):
+            return (1,)
+
+    monkeypatch.setattr(db_init_module, "date", FakeDate)
+    cursor = FakeCursor()
+    DBInitializer(partitions_ahead=partitions_ahead).create_partitions(cursor)
+
+    start_date, end_date = expected_range
+    assert cursor.executed == (
+        pt_queries.CREATE_FACT_PARTITIONS_CMD,
+        {"start_date": start_date, "end_date": end_date}
+    )
+
+
+class FakeIndexCursor():
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.executed = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        pass
+
+    def execute(self, query, params=None):
+        self.executed.append(query)
+
+    def fetchone(self):
+        return self.rows.pop(0)
+
+    def fetchall(self):
+        return self.rows.pop(0)
+
+
+def test_migrate_fact_table():
+    cursor = FakeIndexCursor([("r",), (date(2018, 12, 1), date(2019, 2, 14)), None])
+    cursor.rowcount = 3
+
+    DBInitializer().migrate_fact_table(cursor)
+
+    assert cursor.executed == [
+        ix_queries.TABLE_KIND_QUERY,
+        pt_queries.RENAME_UNPARTITIONED_FACT_CMD,
+        ct_queries.CREATE_FACT_TRANSCTION,
+        pt_queries.UNPARTITIONED_FACT_DATE_RANGE_QUERY,
+        pt_queries.CREATE_FACT_PARTITIONS_CMD,
+        pt_queries.COPY_UNPARTITIONED_FACT_CMD,
+        pt_queries.DROP_UNPARTITIONED_FACT_CMD,
+        ix_queries.RESET_INDEX_VERSION_CMD
+    ]
+
+
+@pytest.mark.parametrize("table_kind", [("p",), None])
+def test_migrate_fact_table_skips_partitioned_table(table_kind):
+    cursor = FakeIndexCursor([table_kind])
+
+    DBInitializer().migrate_fact_table(cursor)
+
+    assert cursor.executed == [ix_queries.TABLE_KIND_QUERY]
+
+
+def test_get_index_name():
+    assert DBInitializer._get_index_name("fact_transaction", ["date_id"]) == (
+        "idx_fact_transaction_date_id"
+    )
+
+
+def test_create_index_rebuilds_invalid_index():
+    cursor = FakeIndexCursor([("r",), (True,)])
+
+    DBInitializer()._create_index(cursor, "dim_date", ["date"])
+
+    assert cursor.executed == [
+        ix_queries.TABLE_KIND_QUERY,
+        ix_queries.INVALID_INDEX_QUERY,
+        ix_queries.DROP_INDEX_CONCURRENTLY_CMD.format(index_name="idx_dim_date_date"),
+        ix_queries.CREATE_INDEX_CONCURRENTLY_CMD.format(
+            index_name="idx_dim_date_date", table="dim_date", columns="date"
+        )
+    ]
+
+
+def test_create_index_of_partitioned_table():
+    cursor = FakeIndexCursor([("p",), [("fact_transaction_p201901",)], None])
+
+    DBInitializer()._create_index(cursor, "fact_transaction", ["item_id"])
+
+    # The parent is indexed on its own, and the index of each partition is built concurrently.
+    assert cursor.executed == [
+        ix_queries.TABLE_KIND_QUERY,
+        ix_queries.CREATE_PARTITIONED_INDEX_CMD.format(
+            index_name="idx_fact_transaction_item_id", table="fact_transaction", columns="item_id"
+        ),
+        ix_queries.UNINDEXED_PARTITIONS_QUERY,
+        ix_queries.INVALID_INDEX_QUERY,
+        ix_queries.CREATE_INDEX_CONCURRENTLY_CMD.format(
+            index_name="idx_fact_transaction_p201901_item_id",
+            table="fact_transaction_p201901",
+            columns="item_id"
+        ),
+        ix_queries.ATTACH_INDEX_CMD.format(
+            index_name="idx_fact_transaction_item_id",
+            partition_index_name="idx_fact_transaction_p201901_item_id"
+        )
+    ]
+
+
+def test_create_indexes_skips_applied_versions(monkeypatch):
+    class FakeConnection():
+        autocommit = False
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *_):
+            pass
+
+        def cursor(self):
+            return cursor
+
+    monkeypatch.setattr(
+        ix_queries, "SECONDARY_INDEXES", {1: [("dim_date", ["date"])], 2: [("dim_item", ["id"])]}
+    )
+    cursor = FakeIndexCursor([(1,), ("r",), None])
+    db_initializer = DBInitializer()
+    db_initializer.psql_connection = connection = FakeConnection()
+
+    db_initializer.create_indexes()
+
+    assert connection.autocommit
+    assert ix_queries.CREATE_INDEX_CONCURRENTLY_CMD.format(
+        index_name="idx_dim_item_id", table="dim_item", columns="id"
+    ) in cursor.executed
+    assert cursor.executed[-1] == ix_queries.RECORD_INDEX_VERSION_CMD
+    assert not any("idx_dim_date_date" in query for query in cursor.executed)
+
+
+def test_check_indexes(monkeypatch):
+    class FakeConnection():
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *_):
+            pass
+
+        def cursor(self):
+            return FakeIndexCursor([[
+                ("idx_dim_date_date", True, 0),
+                ("idx_dim_item_id", None, 0),
+                ("idx_dim_location_id", False, 0),
+                ("idx_fact_transaction_item_id", True, 12)
+            ]])
+
+    db_initializer = DBInitializer()
+    db_initializer.psql_connection = FakeConnection()
+
+    assert db_initializer.check_indexes() == {
+        "missing": ["idx_dim_item_id", "idx_dim_location_id"],
+        "unused": ["idx_dim_date_date"]
+    }
@@ -1,8 +1,15 @@
 import pytest
 
-from datetime import date
+from datetime import date, datetime
+from decimal import Decimal
 
-from sdu_qm_task.etl.delta_loader import DeltaLoader
+import pandas as pd
+
+from sdu_qm_task.etl import delta_loader as dl_module
+from sdu_qm_task.etl.delta_loader import FACT_COLUMNS, DeltaLoader
+from sdu_qm_task.queries import calendar_queries as cal_queries
+from sdu_qm_task.queries import delta_loader_queries as dl_queries
+from sdu_qm_task.queries import partition_queries as pt_queries
 
 
 @pytest.fixture
@@ -17,3 +24,366 @@ def test_date():
 
 def test_get_dateid_from_date(delta_loader, test_date):
     assert delta_loader._get_dateid_from_date(test_date) == 20250101
+
+
+class FakeCursor():
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.executed = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        pass
+
+    rowcount = 0
+
+    def execute(self, query, params=None):
+        self.executed.append((query, params))
+
+    def fetchone(self):
+        return self.rows.pop(0)
+
+
+class FakeConnection():
+    def __init__(self, cursor):
+        self._cursor = cursor
+        cursor.connection = self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        pass
+
+    def cursor(self):
+        return self._cursor
+
+    def commit(self):
+        self._cursor.executed.append((COMMIT, None))
+
+
+# Marks the commits of the fake connection among the executed queries.
+COMMIT = "COMMIT"
+
+
+@pytest.fixture
+def delta_range():
+    return {"last_preload_id": 10, "max_preload_id": 25}
+
+
+@pytest.mark.parametrize("fails", [False, True])
+def test_run_waits_for_run_in_progress(monkeypatch, delta_loader, fails):
+    cursor = FakeCursor([(False,)])
+    lock_connection = FakeConnection(cursor)
+    monkeypatch.setattr(dl_module, "PSQLConnection", lambda **config: lock_connection)
+
+    def load(unique_loc_df):
+        cursor.executed.append(("load", None))
+        if fails:
+            raise RuntimeError("Load failed.")
+
+    monkeypatch.setattr(
+        delta_loader, "extract", lambda: cursor.executed.append(("extract", None)) or pd.DataFrame()
+    )
+    monkeypatch.setattr(delta_loader, "load", load)
+
+    if fails:
+        with pytest.raises(RuntimeError):
+            delta_loader.run()
+    else:
+        delta_loader.run()
+
+    # The run starts once the run in progress released the lock; and releases it, even if failed.
+    assert lock_connection.autocommit
+    assert [query for query, _ in cursor.executed] == [
+        dl_queries.TRY_LOCK_DELTA_RUN_QUERY,
+        dl_queries.LOCK_DELTA_RUN_CMD,
+        "extract",
+        "load",
+        dl_queries.UNLOCK_DELTA_RUN_CMD
+    ]
+
+
+def test_get_delta_range(delta_loader, delta_range):
+    cursor = FakeCursor([(10, 25)])
+
+    assert delta_loader._get_delta_range(cursor) == delta_range
+    # The upper bound is read once the pre-loads in flight are committed.
+    assert cursor.executed == [
+        (dl_queries.LOCK_PRELOAD_COMMITS_CMD, None),
+        (dl_queries.DELTA_RANGE_QUERY, None)
+    ]
+
+
+def test_stage_delta(delta_loader, delta_range):
+    cursor = FakeCursor([(10, 25)])
+    FakeConnection(cursor)
+
+    assert delta_loader._stage_delta(cursor) == delta_range
+    # The pre-loads held back are released, before the delta is staged.
+    assert cursor.executed == [
+        (dl_queries.LOCK_PRELOAD_COMMITS_CMD, None),
+        (dl_queries.DELTA_RANGE_QUERY, None),
+        (COMMIT, None),
+        (dl_queries.TRUNCATE_DELTA_CMD, None),
+        (dl_queries.STAGE_DELTA_CMD, delta_range),
+        (dl_queries.ANALYZE_DELTA_CMD, None)
+    ]
+
+
+def test_load_advances_watermark(delta_loader, delta_range):
+    cursor = FakeCursor([
+        (15,), (date(2019, 1, 1), date(2019, 1, 2), 0), (0,)
+    ])
+    delta_loader.psql_connection = FakeConnection(cursor)
+    delta_loader.delta_range = delta_range
+
+    delta_loader.load(pd.DataFrame(columns=["country_code", "country_name", "continent"]))
+
+    # The staged delta of the extraction is read by all steps, and is not reused afterwards.
+    assert cursor.executed == [
+        (dl_queries.COUNT_DELTA_QUERY, None),
+        (dl_queries.ITEM_INSERT_CMD, None),
+        (dl_queries.CALENDAR_COVERAGE_QUERY, None),
+        (
+            pt_queries.CREATE_FACT_PARTITIONS_CMD,
+            {"start_date": date(2019, 1, 1), "end_date": date(2019, 1, 2)}
+        ),
+        (COMMIT, None),
+        (dl_queries.FACT_INSERT_CMD, {"batch_id": 25}),
+        (dl_queries.UPDATE_WATERMARK_CMD, delta_range)
+    ]
+    assert delta_loader.delta_range is None
+
+
+def test_load_keeps_watermark_without_new_entries(delta_loader):
+    cursor = FakeCursor([(25, 25), (0,)])
+    delta_loader.psql_connection = FakeConnection(cursor)
+
+    delta_loader.load(pd.DataFrame())
+
+    # The delta is staged, if not extracted before.
+    assert [query for query, _ in cursor.executed] == [
+        dl_queries.LOCK_PRELOAD_COMMITS_CMD,
+        dl_queries.DELTA_RANGE_QUERY,
+        COMMIT,
+        dl_queries.TRUNCATE_DELTA_CMD,
+        dl_queries.STAGE_DELTA_CMD,
+        dl_queries.ANALYZE_DELTA_CMD,
+        dl_queries.COUNT_DELTA_QUERY
+    ]
+
+
+@pytest.mark.parametrize("missing_day_count, extended", [
+    (0, False),
+    (1, True),
+])
+def test_ensure_calendar(delta_loader, missing_day_count, extended):
+    cursor = FakeCursor([(date(2019, 1, 1), date(2019, 1, 2), missing_day_count)])
+
+    assert delta_loader._ensure_calendar(cursor) == (date(2019, 1, 1), date(2019, 1, 2))
+
+    extensions = [
+        params for query, params in cursor.executed if query == cal_queries.GENERATE_DIM_DATE_CMD
+    ]
+    assert extensions == (
+        [{"start_date": date(2019, 1, 1), "end_date": date(2019, 1, 2)}] if extended else []
+    )
+
+
+def test_ensure_partitions_skips_empty_delta(delta_loader):
+    cursor = FakeCursor([])
+
+    delta_loader._ensure_partitions(cursor, None, None)
+
+    assert cursor.executed == []
+
+
+def test_upsert_locations(monkeypatch, delta_loader):
+    calls = []
+    monkeypatch.setattr(
+        dl_module, "execute_values",
+        lambda cur, query, rows, page_size: calls.append((query, rows, page_size))
+    )
+    unique_loc_df = pd.DataFrame({
+        "country_name": ["Côte d'Ivoire", "UNKNOWN"],
+        "continent": ["Africa", "UNKNOWN"],
+        "country_code": ["CIV", "N/A"]
+    })
+
+    delta_loader._upsert_locations(FakeCursor([]), unique_loc_df)
+
+    # All locations are sent at once, in order, and without string formatting.
+    assert calls == [(
+        dl_queries.LOCATION_UPSERT_CMD,
+        [(0, "CIV", "Côte d'Ivoire", "Africa"), (1, "N/A", "UNKNOWN", "UNKNOWN")],
+        2
+    )]
+
+
+def test_upsert_no_locations(monkeypatch, delta_loader):
+    calls = []
+    monkeypatch.setattr(dl_module, "execute_values", lambda *args, **kwargs: calls.append(args))
+
+    delta_loader._upsert_locations(FakeCursor([]), pd.DataFrame())
+
+    assert calls == []
+
+
+def test_transform_keeps_raw_country(delta_loader):
+    delta_loc_df = pd.DataFrame({"country": ["Atlantis", "United Kingdom"]})
+
+    unique_loc_df = delta_loader.transform(delta_loc_df)
+
+    assert unique_loc_df["raw_country"].tolist() == ["Atlantis", "United Kingdom"]
+    assert unique_loc_df["country_name"].tolist() == ["UNKNOWN", "United Kingdom"]
+
+
+def test_upsert_aliases(monkeypatch, delta_loader):
+    calls = []
+    monkeypatch.setattr(
+        dl_module, "execute_values",
+        lambda cur, query, rows, page_size: calls.append((query, rows, page_size))
+    )
+    unique_loc_df = pd.DataFrame({
+        "raw_country": ["Atlantis", "United Kingdom"],
+        "country_code": ["N/A", "GBR"],
+        "country_name": ["UNKNOWN", "United Kingdom"],
+        "continent": ["UNKNOWN", "Europe"]
+    })
+
+    delta_loader._upsert_aliases(FakeCursor([]), unique_loc_df)
+
+    # Unresolved raw country names are mapped too, so they are not resolved again.
+    assert calls == [(
+        dl_queries.ALIAS_UPSERT_CMD,
+        [("Atlantis", "UNKNOWN"), ("United Kingdom", "United Kingdom")],
+        2
+    )]
+
+
+def test_invalid_fact_loader():
+    with pytest.raises(ValueError):
+        DeltaLoader(fact_loader="bulk")
+
+
+def test_load_facts_with_sql(delta_loader):
+    cursor = FakeCursor([])
+
+    delta_loader._load_facts(cursor, 25)
+
+    assert cursor.executed == [(dl_queries.FACT_INSERT_CMD, {"batch_id": 25})]
+
+
+def test_assemble_facts(monkeypatch):
+    delta_loader = DeltaLoader(fact_loader="copy")
+    monkeypatch.setattr(delta_loader.dimension_cache, "location_ids", {"France": 3})
+    monkeypatch.setattr(delta_loader.dimension_cache, "unknown_location_id", 1)
+    monkeypatch.setattr(delta_loader.dimension_cache, "refresh", lambda cur, countries: None)
+    delta_df = pd.DataFrame({
+        "hash_id": ["a", "b"],
+        "transaction_id": [10, 11],
+        "user_id": [20, 21],
+        "transaction_time": [datetime(2019, 2, 1, 10, 0), datetime(2019, 2, 2, 11, 30)],
+        "item_code": [470291, 470292],
+        "item_quantity": [6, -3],
+        "cost_per_item": [Decimal("3.45"), Decimal("0.10")],
+        "country": ["France", None],
+        "created_at": [datetime(2024, 1, 1)] * 2
+    })
+
+    fact_df = delta_loader._assemble_facts(FakeCursor([]), delta_df, 25)
+
+    assert fact_df.columns.tolist() == FACT_COLUMNS
+    assert fact_df["date_id"].tolist() == [20190201, 20190202]
+    assert fact_df["item_id"].tolist() == [470291, 470292]
+    # The total costs are exact, like the DECIMAL product of the database.
+    assert fact_df["total_cost"].tolist() == [Decimal("20.70"), Decimal("-0.30")]
+    assert fact_df["location_id"].tolist() == [3, 1]
+    assert fact_df["batch_id"].tolist() == [25, 25]
+
+
+@pytest.mark.parametrize("workers, fact_loader", [(0, "sql"), (2, "copy"), (4, "sql")])
+def test_invalid_workers(workers, fact_loader):
+    with pytest.raises(ValueError):
+        DeltaLoader(fact_loader=fact_loader, workers=workers)
+
+
+@pytest.mark.parametrize("pool_size, workers, valid", [
+    ("1", 1, True),
+    ("2", 1, True),
+    ("4", 2, True),
+    ("4", 3, False),
+])
+def test_workers_within_pool_size(monkeypatch, pool_size, workers, valid):
+    monkeypatch.setenv("POSTGRES_POOL_SIZE", pool_size)
+
+    # A run without shards needs no connections beyond the pool's own limit.
+    if valid:
+        assert DeltaLoader(workers=workers).workers == workers
+    else:
+        with pytest.raises(ValueError, match="plus 2 must not exceed"):
+            DeltaLoader(workers=workers)
+
+
+def test_get_shards(monkeypatch, delta_range):
+    monkeypatch.setenv("POSTGRES_POOL_SIZE", "6")
+
+    # The shards are disjoint, and cover the whole delta range.
+    assert DeltaLoader(workers=4)._get_shards(delta_range) == [
+        {"lower_id": 10, "upper_id": 13},
+        {"lower_id": 13, "upper_id": 17},
+        {"lower_id": 17, "upper_id": 21},
+        {"lower_id": 21, "upper_id": 25}
+    ]
+    assert DeltaLoader(workers=4)._get_shards({"last_preload_id": 10, "max_preload_id": 12}) == [
+        {"lower_id": 10, "upper_id": 11},
+        {"lower_id": 11, "upper_id": 12}
+    ]
+
+
+def test_promote_shards(monkeypatch, delta_range):
+    delta_loader = DeltaLoader(workers=3)
+    shards = []
+    monkeypatch.setattr(
+        delta_loader, "_promote_shard", lambda shard, batch_id: shards.append(shard) or batch_id
+    )
+
+    delta_loader._promote_shards(delta_range)
+
+    assert sorted(shard["lower_id"] for shard in shards) == [10, 15, 20]
+
+
+def test_promote_shards_fails_if_any_shard_fails(monkeypatch, delta_range):
+    delta_loader = DeltaLoader(workers=3)
+
+    def promote_shard(shard, batch_id):
+        if shard["lower_id"] == 15:
+            raise ValueError("Shard failed.")
+        return 5
+
+    monkeypatch.setattr(delta_loader, "_promote_shard", promote_shard)
+
+    with pytest.raises(RuntimeError):
+        delta_loader._promote_shards(delta_range)
+
+
+def test_load_keeps_watermark_if_shards_fail(monkeypatch, delta_range):
+    delta_loader = DeltaLoader(workers=2)
+    cursor = FakeCursor([
+        (15,), (date(2019, 1, 1), date(2019, 1, 2), 0), (0,)
+    ])
+    delta_loader.psql_connection = FakeConnection(cursor)
+    delta_loader.delta_range = delta_range
+
+    def promote_shards(delta_range):
+        raise RuntimeError("Shards failed.")
+
+    monkeypatch.setattr(delta_loader, "_promote_shards", promote_shards)
+
+    with pytest.raises(RuntimeError):
+        delta_loader.load(pd.DataFrame(columns=["country_code", "country_name", "continent"]))
+
+    assert dl_queries.UPDATE_WATERMARK_CMD not in [query for query, _ in cursor.executed]
@@ -0,0 +1,65 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from sdu_qm_task.etl.dimension_cache import DimensionCache
+from sdu_qm_task.queries import delta_loader_queries as dl_queries
+
+
+class FakeCursor():
+    def __init__(self, location_ids, unknown_location_id=99):
+        self.location_ids = location_ids
+        self.unknown_location_id = unknown_location_id
+        self.executed = []
+
+    def execute(self, query, params=None):
+        self.executed.append((query, params))
+
+    def fetchall(self):
+        raw_countries = self.executed[-1][1]["raw_countries"]
+        return [
+            (country, self.location_ids[country])
+            for country in raw_countries if country in self.location_ids
+        ]
+
+    def fetchone(self):
+        return (self.unknown_location_id,)
+
+
+@pytest.fixture
+def raw_countries():
+    return pd.Series(["France", None, "Atlantis", "France", "United Kingdom"])
+
+
+def test_refresh_looks_up_uncached_countries(raw_countries):
+    cache = DimensionCache()
+    cursor = FakeCursor({"France": 1, "United Kingdom": 2})
+
+    cache.refresh(cursor, raw_countries)
+    cache.refresh(cursor, raw_countries)
+
+    # Cached countries are not looked up again; the unresolved ones are, as they may be mapped.
+    assert cursor.executed == [
+        (
+            dl_queries.LOCATION_KEYS_QUERY,
+            {"raw_countries": ["France", "Atlantis", "United Kingdom"]}
+        ),
+        (dl_queries.UNKNOWN_LOCATION_KEY_QUERY, None),
+        (dl_queries.LOCATION_KEYS_QUERY, {"raw_countries": ["Atlantis"]})
+    ]
+    assert cache.location_ids == {"France": 1, "United Kingdom": 2}
+    assert cache.unknown_location_id == 99
+
+
+def test_get_location_ids(raw_countries):
+    cache = DimensionCache()
+    cache.refresh(FakeCursor({"France": 1, "United Kingdom": 2}), raw_countries)
+
+    assert cache.get_location_ids(raw_countries).tolist() == [1, 99, 99, 1, 2]
+
+
+def test_get_date_ids():
+    transaction_times = pd.Series([datetime(2018, 1, 2, 23, 59), datetime(2019, 12, 31, 0, 0)])
+
+    assert DimensionCache.get_date_ids(transaction_times).tolist() == [20180102, 20191231]
@@ -0,0 +1,95 @@
+from hashlib import md5
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from sdu_qm_task.etl.fingerprint import Fingerprinter
+from sdu_qm_task.etl.source_reader import SourceReader
+
+
+@pytest.fixture
+def entries():
+    return [
+        {
+            "UserId": 325794,
+            "TransactionId": 6365337,
+            "TransactionTime": "Tue Feb 05 13:10:00 XAB 2019",
+            "ItemCode": 472731,
+            "ItemDescription": "RETROSPOT BABUSHKA DOORSTOP",
+            "NumberOfItemsPurchased": 6,
+            "CostPerItem": 5.18,
+            "Country": "United Kingdom"
+        },
+        {
+            "UserId": -1,
+            "TransactionId": 6365338,
+            "TransactionTime": "Tue Feb 05 13:10:00 IST 2019",
+            "ItemCode": 472732,
+            "ItemDescription": float("nan"),
+            "NumberOfItemsPurchased": 12,
+            "CostPerItem": float("nan"),
+            "Country": "Côte d'Ivoire \"quoted\"\t"
+        },
+        {
+            "UserId": 0,
+            "TransactionId": 6365339,
+            "TransactionTime": "Tue Feb 05 13:10:00 GMT 2019",
+            "ItemCode": 472733,
+            "ItemDescription": None,
+            "NumberOfItemsPurchased": 1,
+            "CostPerItem": 1e-05,
+            "Country": "Ireland"
+        },
+    ]
+
+
+@pytest.mark.parametrize("algorithm", ["md5", "blake2b"])
+def test_hash_frame_matches_hash_entry(entries, algorithm):
+    fingerprinter = Fingerprinter(algorithm)
+    hashes = fingerprinter.hash_frame(pd.DataFrame(entries))
+
+    assert hashes.tolist() == [fingerprinter.hash_entry(entry) for entry in entries]
+    assert all(len(hash_id) == 32 for hash_id in hashes)
+
+
+def test_md5_is_compatible(entries):
+    hashes = Fingerprinter("md5").hash_frame(pd.DataFrame(entries))
+
+    assert hashes.tolist() == [md5(json.dumps(entry).encode()).hexdigest() for entry in entries]
+    assert hashes[0] == "8873eda206710fe16793055907649a32"
+
+
+def test_blake2b_ignores_column_order(entries):
+    df = pd.DataFrame(entries)
+    fingerprinter = Fingerprinter("blake2b")
+
+    pd.testing.assert_series_equal(
+        fingerprinter.hash_frame(df), fingerprinter.hash_frame(df[df.columns[::-1]])
+    )
+
+
+def test_hash_typed_frame(tmp_path, entries):
+    source_file = Path(tmp_path, "source_file_1.csv")
+    pd.DataFrame(entries).to_csv(source_file, index=False)
+    # Leave an integer column with a missing value, which pandas infers as float64.
+    source_file.write_text(source_file.read_text().replace(",12,", ",,"))
+
+    fingerprinter = Fingerprinter()
+    expected_hashes = [
+        fingerprinter.hash_entry(entry) for entry in pd.read_csv(source_file).to_dict("records")
+    ]
+
+    typed_df, _ = SourceReader.to_typed(SourceReader().read(source_file))
+
+    assert fingerprinter.hash_frame(typed_df).tolist() == expected_hashes
+
+
+def test_hash_empty_frame(entries):
+    assert Fingerprinter().hash_frame(pd.DataFrame(entries).iloc[:0]).empty
+
+
+def test_invalid_algorithm():
+    with pytest.raises(ValueError):
+        Fingerprinter("sha1")
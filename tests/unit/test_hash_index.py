@@ -0,0 +1,71 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from sdu_qm_task.etl.hash_index import HashIndex
+from sdu_qm_task.queries import pre_loader_queries as pl_queries
+
+
+class FakeCursor():
+    def __init__(self, loaded_hash_ids=None):
+        self.loaded_hash_ids = set(loaded_hash_ids or [])
+        self.executed = []
+        self.rows = []
+
+    def execute(self, query, params):
+        self.executed.append((query, params))
+        self.rows = []
+        for hash_id in params["hash_ids"]:
+            if hash_id not in self.loaded_hash_ids:
+                self.loaded_hash_ids.add(hash_id)
+                self.rows.append((hash_id,))
+
+    def fetchall(self):
+        return self.rows
+
+
+@pytest.fixture
+def created_at():
+    return datetime(2024, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def hash_index(created_at):
+    return HashIndex(created_at, batch_size=2)
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        "hash_id": ["a", "b", "a", "c", "d"],
+        "source_file": ["source_file_1.csv"] * 3 + ["source_file_2.csv"] * 2
+    })
+
+
+def test_register(hash_index, df, created_at):
+    cursor = FakeCursor(loaded_hash_ids=["c"])
+
+    is_new = hash_index.register(cursor, df)
+
+    assert is_new.tolist() == [True, True, False, False, True]
+    assert is_new.index.equals(df.index)
+
+    # The distinct fingerprints are registered in batches.
+    assert [params["hash_ids"] for _, params in cursor.executed] == [["a", "b"], ["c", "d"]]
+    query, params = cursor.executed[0]
+    assert query == pl_queries.INSERT_HASH_INDEX_QUERY
+    assert params["source_files"] == ["source_file_1.csv", "source_file_1.csv"]
+    assert params["created_at"] == created_at
+
+
+def test_register_again(hash_index, df):
+    cursor = FakeCursor()
+    hash_index.register(cursor, df)
+
+    assert not hash_index.register(cursor, df).any()
+
+
+def test_invalid_batch_size(created_at):
+    with pytest.raises(ValueError):
+        HashIndex(created_at, batch_size=0)
@@ -13,11 +13,6 @@ def valid_country_name():
     return "United Kingdom"
 
 
-@pytest.fixture
-def valid_alpha2():
-    return "GB"
-
-
 @pytest.fixture
 def invalid_location(invalid_country_name):
     return Location(invalid_country_name)
@@ -28,18 +23,6 @@ def invalid_country_name():
     return "Atlantis"
 
 
-@pytest.fixture
-def invalid_alpha2():
-    return "XY"
-
-
-def test_code_to_continent(valid_location, invalid_location, valid_alpha2, invalid_alpha2):
-    assert valid_location._code_to_continent(valid_alpha2) == "Europe"
-
-    with pytest.raises(KeyError):
-        invalid_location._code_to_continent(invalid_alpha2)
-
-
 def test_get_location_info(
         valid_location,
         invalid_location,
@@ -0,0 +1,153 @@
+from datetime import datetime
+import hashlib
+from pathlib import Path
+
+import pytest
+
+from sdu_qm_task.etl.manifest import Manifest
+from sdu_qm_task.queries import pre_loader_queries as pl_queries
+
+
+class FakeCursor():
+    def __init__(self, rows=None, columns=None):
+        self.rows = rows or []
+        self.executed = []
+        self.description = [(column,) for column in columns or []]
+
+    def execute(self, query, params):
+        self.executed.append((query, params))
+
+    def executemany(self, query, params):
+        self.executed.append((query, list(params)))
+
+    def fetchall(self):
+        return self.rows
+
+
+@pytest.fixture
+def created_at():
+    return datetime(2024, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def manifest(created_at):
+    return Manifest(created_at)
+
+
+@pytest.fixture
+def source_file(tmp_path):
+    source_file = Path(tmp_path, "source_file_1.csv")
+    source_file.write_text("UserId,TransactionId\n325794,6365337\n")
+    return source_file
+
+
+def test_register(manifest, source_file, created_at):
+    entry = manifest.register(source_file)
+
+    assert entry["source_file"] == "source_file_1.csv"
+    assert entry["file_size"] == source_file.stat().st_size
+    assert entry["checksum"] == hashlib.md5(source_file.read_bytes()).hexdigest()
+    assert entry["created_at"] == created_at
+    assert entry["load_status"] is None
+
+
+def test_row_count(manifest, source_file):
+    manifest.register(source_file)
+    manifest.start(source_file.name)
+    manifest.add_row_count(source_file.name, 2)
+    manifest.add_row_count(source_file.name, 3)
+
+    assert manifest.entries[source_file.name]["row_count"] == 5
+    assert manifest.entries[source_file.name]["started_at"] is not None
+
+
+def test_duplicate_count(manifest, source_file):
+    manifest.register(source_file)
+    manifest.start(source_file.name)
+    manifest.add_duplicate_count(source_file.name, 2)
+
+    assert manifest.entries[source_file.name]["duplicate_count"] == 2
+
+
+@pytest.fixture
+def checkpoint(source_file, created_at):
+    return {
+        "source_file": source_file.name,
+        "checksum": hashlib.md5(source_file.read_bytes()).hexdigest(),
+        "checkpoint_row": 1,
+        "duplicate_count": 1,
+        "started_at": created_at
+    }
+
+
+def test_resume(manifest, source_file, checkpoint, created_at):
+    manifest.register(source_file)
+
+    assert manifest.resume(source_file.name, checkpoint)
+    entry = manifest.entries[source_file.name]
+    assert (entry["row_count"], entry["duplicate_count"], entry["checkpoint_row"]) == (1, 1, 1)
+    assert entry["started_at"] == created_at
+
+
+def test_resume_changed_file(manifest, source_file, checkpoint):
+    manifest.register(source_file)
+
+    # A source file, which changed since its checkpoint, is started over.
+    assert not manifest.resume(source_file.name, {**checkpoint, "checksum": "0" * 32})
+    entry = manifest.entries[source_file.name]
+    assert (entry["row_count"], entry["duplicate_count"], entry["checkpoint_row"]) == (0, 0, 0)
+
+
+def test_get_checkpoints(checkpoint):
+    columns = list(checkpoint.keys())
+    cursor = FakeCursor([tuple(checkpoint.values())], columns)
+
+    assert Manifest.get_checkpoints(cursor, ["source_file_1.csv"]) == {
+        "source_file_1.csv": checkpoint
+    }
+    assert cursor.executed == [(
+        pl_queries.MANIFEST_CHECKPOINT_QUERY, {"source_files": ["source_file_1.csv"]}
+    )]
+
+
+def test_checkpoint(manifest, source_file):
+    cursor = FakeCursor()
+    manifest.register(source_file)
+    manifest.start(source_file.name)
+    manifest.add_row_count(source_file.name, 1)
+    manifest.checkpoint(cursor, source_file.name, 1)
+
+    query, params = cursor.executed[0]
+    assert query == pl_queries.INSERT_MANIFEST_QUERY
+    assert params["load_status"] == pl_queries.LOADING_STATUS
+    assert params["checkpoint_row"] == 1
+    assert params["finished_at"] is None
+
+
+def test_get_loaded_files():
+    cursor = FakeCursor([("source_file_1.csv",)])
+
+    assert Manifest.get_loaded_files(cursor, ["source_file_1.csv", "source_file_2.csv"]) == {
+        "source_file_1.csv"
+    }
+    assert cursor.executed == [(
+        pl_queries.MANIFEST_SOURCE_FILE_QUERY,
+        {"source_files": ["source_file_1.csv", "source_file_2.csv"]}
+    )]
+
+
+def test_record(manifest, source_file):
+    cursor = FakeCursor()
+    manifest.register(source_file)
+    manifest.start(source_file.name)
+    manifest.record(
+        cursor, [source_file.name], pl_queries.DUPLICATE_STATUS,
+        {source_file.name: "source_file_0.csv"}
+    )
+
+    query, params = cursor.executed[0]
+    assert query == pl_queries.INSERT_MANIFEST_QUERY
+    assert params[0]["load_status"] == pl_queries.DUPLICATE_STATUS
+    assert params[0]["duplicate_of"] == "source_file_0.csv"
+    assert params[0]["finished_at"] is not None
+    assert params[0]["checkpoint_row"] == params[0]["row_count"]
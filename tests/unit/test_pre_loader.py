@@ -1,9 +1,14 @@
+from contextlib import nullcontext
 from datetime import datetime
 from pathlib import Path
 
+import pandas as pd
 import pytest
 
+from sdu_qm_task.connect import PSQLConnection
 from sdu_qm_task.etl.pre_loader import PreLoader
+from sdu_qm_task.queries import pre_loader_queries as pl_queries
+from sdu_qm_task.queries import table_names as tables
 
 
 @pytest.fixture(scope="function")
@@ -95,3 +100,454 @@ def test_has_known_timezone(pre_loader, valid_ts, valid_gmt_ts, valid_utc_ts, in
     assert pre_loader._has_known_timezone(valid_ts) is False
 
     assert pre_loader._has_known_timezone(invalid_ts) is False
+
+
+@pytest.fixture
+def columnar_pre_loader(folder, pre_loader):
+    columnar_pre_loader = PreLoader(folder, transform_mode="columnar")
+    columnar_pre_loader.created_at = pre_loader.created_at
+
+    return columnar_pre_loader
+
+
+@pytest.fixture
+def entries(entry, valid_ts, valid_utc_ts, valid_gmt_ts, invalid_ts):
+    summer_ts = valid_ts.replace("Feb", "Jul")
+    return [
+        {**entry, "TransactionTime": transaction_time, "TransactionId": index}
+        for index, transaction_time in enumerate(
+            [valid_ts, summer_ts, valid_utc_ts, invalid_ts, valid_gmt_ts]
+        )
+    ]
+
+
+def test_assign_timezone_columnar(pre_loader, entries):
+    transaction_times = pd.Series([entry["TransactionTime"] for entry in entries])
+    converted = pre_loader._assign_timezone_columnar(transaction_times)
+
+    for transaction_time, converted_time in zip(transaction_times, converted):
+        expected_time = pre_loader._assign_timezone(transaction_time)
+
+        if expected_time is None:
+            assert pd.isna(converted_time)
+        else:
+            assert converted_time == expected_time
+            assert converted_time.tzinfo == expected_time.tzinfo
+
+
+def test_transform_columnar(monkeypatch, pre_loader, columnar_pre_loader, entries, source_file):
+    monkeypatch.setattr(PreLoader, "_send_to_archive", lambda self, entries: None)
+
+    row_df = pre_loader.transform({source_file: entries})
+    columnar_df = columnar_pre_loader.transform({source_file: pd.DataFrame(entries)})
+
+    assert len(columnar_df) == len(entries) - 1
+    # The columnar path loads the entries with the ingestion schema.
+    pd.testing.assert_frame_equal(columnar_df, row_df.astype(columnar_df.dtypes.to_dict()))
+
+
+def test_transform_columnar_archives_unfit_entries(
+        monkeypatch, pre_loader, columnar_pre_loader, entries, source_file
+    ):
+    archived_entries = []
+    monkeypatch.setattr(PreLoader, "_send_to_archive", lambda self, e: archived_entries.extend(e))
+    df = pd.DataFrame(entries).astype({"NumberOfItemsPurchased": "float64"})
+    df.loc[0, "NumberOfItemsPurchased"] = 6.5
+
+    columnar_df = columnar_pre_loader.transform({source_file: df})
+
+    # The non-integral quantity is archived, like the unconvertible timestamp; not raised.
+    assert columnar_df["transaction_id"].tolist() == [1, 2, 4]
+    assert [entry["TransactionId"] for entry in archived_entries] == [0, 3]
+    assert columnar_df["hash_id"].tolist() == pre_loader.transform({
+        source_file: df.to_dict("records")
+    })["hash_id"].tolist()[1:]
+
+
+def test_invalid_transform_mode(folder):
+    with pytest.raises(ValueError):
+        PreLoader(folder, transform_mode="unknown")
+
+
+class FakeConnection():
+    def __init__(self, events):
+        self.events = events
+
+    def begin(self):
+        self.events.append("begin")
+
+    def commit(self):
+        self.events.append("commit")
+
+    def close(self):
+        self.events.append("close")
+
+
+class FakeEngine():
+    def __init__(self, events):
+        self.events = events
+
+    def begin(self):
+        return nullcontext(self)
+
+    def connect(self):
+        return FakeConnection(self.events)
+
+
+class FakeDatabase():
+    def __init__(self):
+        self.events = []
+        self.archived_entries = []
+        self.checkpoints = []
+        self.engine = FakeEngine(self.events)
+
+
+@pytest.fixture
+def fake_database(monkeypatch):
+    # Nothing is loaded yet; the manifest records and the checkpoints are added to the events of
+    #  the transactions they are committed in.
+    fake_database = FakeDatabase()
+    monkeypatch.setattr(PSQLConnection, "get_engine", lambda self: fake_database.engine)
+    monkeypatch.setattr(PreLoader, "_extract_db", lambda self, source_files: set())
+    monkeypatch.setattr(PreLoader, "_extract_db_checksums", lambda self, checksums: {})
+    monkeypatch.setattr(
+        PreLoader, "_record_manifest", lambda self, files, con: fake_database.events.append(files)
+    )
+    monkeypatch.setattr(
+        PreLoader, "_send_to_archive", lambda self, e: fake_database.archived_entries.extend(e)
+    )
+
+    def checkpoint(self, source_file, row_offset, connection):
+        fake_database.checkpoints.append(row_offset)
+        fake_database.events.append(row_offset)
+
+    monkeypatch.setattr(PreLoader, "_checkpoint", checkpoint)
+
+    return fake_database
+
+
+@pytest.fixture
+def loaded_frames(monkeypatch, fake_database):
+    loaded_frames = []
+    monkeypatch.setattr(PreLoader, "_load_frame", lambda self, df, con: loaded_frames.append(df))
+
+    return loaded_frames
+
+
+@pytest.mark.parametrize("transform_mode", ["row", "columnar"])
+def test_stream(
+    tmp_path, pre_loader, entries, fake_database, loaded_frames, transform_mode
+):
+    source_file = Path(tmp_path, "source_file_1.csv")
+    pd.DataFrame(entries).to_csv(source_file, index=False)
+
+    streaming_pre_loader = PreLoader(tmp_path.as_posix(), transform_mode, chunk_size=2)
+    streaming_pre_loader.created_at = pre_loader.created_at
+    streaming_pre_loader.run()
+
+    assert len(loaded_frames) == 3
+    assert fake_database.archived_entries == [entries[3]]
+    # Each chunk is committed along with the checkpoint of its end offset.
+    assert fake_database.checkpoints == [2, 4, 5]
+
+    expected_df = pre_loader.transform({source_file.name: entries})
+    # The ingestion schema reads the countries as categories.
+    streamed_df = pd.concat(loaded_frames, ignore_index=True).astype({"country": object})
+    pd.testing.assert_frame_equal(streamed_df, expected_df, check_dtype=False)
+
+
+@pytest.mark.parametrize("transform_mode", ["row", "columnar"])
+@pytest.mark.parametrize("chunk_size", [1, 2])
+def test_stream_hashes_missing_value_in_later_chunk(
+    tmp_path, pre_loader, entries, loaded_frames, transform_mode, chunk_size
+):
+    # The quantity is missing only in the last chunk, so the whole column is parsed as floats.
+    entries[4]["NumberOfItemsPurchased"] = None
+    source_file = Path(tmp_path, "source_file_1.csv")
+    pd.DataFrame(entries).astype({"NumberOfItemsPurchased": "Int64"}).to_csv(
+        source_file, index=False
+    )
+
+    PreLoader(tmp_path.as_posix(), transform_mode, chunk_size=chunk_size).run()
+    streamed_hash_ids = pd.concat(loaded_frames)["hash_id"].tolist()
+
+    loaded_frames.clear()
+    PreLoader(tmp_path.as_posix(), transform_mode).run()
+    whole_file_hash_ids = pd.concat(loaded_frames)["hash_id"].tolist()
+
+    # The entries hash as in a whole-file load, whatever chunk they are read in.
+    assert streamed_hash_ids == whole_file_hash_ids
+    whole_file_entries = pd.read_csv(source_file).to_dict("records")
+    assert whole_file_hash_ids == [
+        pre_loader._get_md5_hash(entry)
+        for index, entry in enumerate(whole_file_entries) if index != 3
+    ]
+
+
+@pytest.mark.parametrize("pipeline", [False, True])
+def test_stream_resumes_from_checkpoint(
+    monkeypatch, tmp_path, pre_loader, entries, fake_database, loaded_frames, pipeline
+):
+    source_file = Path(tmp_path, "source_file_1.csv")
+    pd.DataFrame(entries).to_csv(source_file, index=False)
+
+    checkpoint = {
+        "source_file": source_file.name,
+        "checksum": pre_loader.manifest._get_checksum(source_file),
+        "checkpoint_row": 2,
+        "duplicate_count": 1,
+        "started_at": pre_loader.created_at
+    }
+
+    def extract_db(self, source_files):
+        self.checkpoints = {source_file.name: checkpoint}
+        return set()
+
+    monkeypatch.setattr(PreLoader, "_extract_db", extract_db)
+
+    resumed_pre_loader = PreLoader(tmp_path.as_posix(), chunk_size=2, pipeline=pipeline)
+    resumed_pre_loader.run()
+
+    # Only the entries after the checkpoint are read; the counts continue from it.
+    resumed_df = pd.concat(loaded_frames, ignore_index=True)
+    assert resumed_df["transaction_id"].tolist() == [2, 4]
+    assert fake_database.checkpoints == [4, 5]
+    manifest_entry = resumed_pre_loader.manifest.entries[source_file.name]
+    assert manifest_entry["row_count"] == len(entries)
+    assert manifest_entry["duplicate_count"] == 1
+    assert manifest_entry["started_at"] == pre_loader.created_at
+
+
+@pytest.mark.parametrize("pipeline", [False, True])
+@pytest.mark.parametrize("chunk_size", [None, 2])
+def test_resumed_load_hashes_as_uninterrupted_load(
+    monkeypatch, tmp_path, pre_loader, entries, loaded_frames, chunk_size, pipeline
+):
+    # The quantity is missing only in an entry before the checkpoint.
+    entries[0]["NumberOfItemsPurchased"] = None
+    source_file = Path(tmp_path, "source_file_1.csv")
+    pd.DataFrame(entries).astype({"NumberOfItemsPurchased": "Int64"}).to_csv(
+        source_file, index=False
+    )
+
+    checkpoints = {}
+
+    def extract_db(self, source_files):
+        self.checkpoints = checkpoints
+        return set()
+
+    monkeypatch.setattr(PreLoader, "_extract_db", extract_db)
+
+    PreLoader(tmp_path.as_posix()).run()
+    uninterrupted_df = pd.concat(loaded_frames)
+
+    loaded_frames.clear()
+    checkpoints[source_file.name] = {
+        "source_file": source_file.name,
+        "checksum": pre_loader.manifest._get_checksum(source_file),
+        "checkpoint_row": 2,
+        "duplicate_count": 0,
+        "started_at": pre_loader.created_at
+    }
+    PreLoader(tmp_path.as_posix(), chunk_size=chunk_size, pipeline=pipeline).run()
+    resumed_df = pd.concat(loaded_frames)
+
+    # The entries after the checkpoint hash as in an uninterrupted whole-file load.
+    assert resumed_df["transaction_id"].tolist() == [2, 4]
+    assert resumed_df["hash_id"].tolist() == uninterrupted_df["hash_id"].tolist()[2:]
+
+
+@pytest.mark.parametrize("transform_mode", ["row", "columnar"])
+@pytest.mark.parametrize("chunk_size", [None, 1])
+def test_stream_hashes_mixed_text_column_as_strings(
+    monkeypatch, tmp_path, pre_loader, entries, loaded_frames, transform_mode, chunk_size
+):
+    entries[1]["ItemDescription"] = "123"
+    source_file = Path(tmp_path, "source_file_1.csv")
+    pd.DataFrame(entries).to_csv(source_file, index=False)
+    read_csv = pd.read_csv
+
+    def fake_read_csv(*args, **kwargs):
+        df = read_csv(*args, **kwargs)
+        if "dtype" not in kwargs and "chunksize" not in kwargs:
+            # pandas parses a large file in parts; a numeric part of a text column is mixed in.
+            df.loc[1, "ItemDescription"] = 123
+        return df
+
+    monkeypatch.setattr(pd, "read_csv", fake_read_csv)
+
+    PreLoader(tmp_path.as_posix(), transform_mode, chunk_size=chunk_size).run()
+    hash_id = pd.concat(loaded_frames).set_index("transaction_id").loc[1, "hash_id"]
+
+    # The description is hashed as a string, whatever the read; unlike the mixed-in number of
+    #  the whole-file read, which the entry was hashed with before the chunked reads.
+    assert hash_id == "f3a02f4ac66b63744fcdd628e7b2fac7"
+    assert hash_id != pre_loader._get_md5_hash(
+        {**read_csv(source_file).to_dict("records")[1], "ItemDescription": 123}
+    )
+
+
+def test_invalid_chunk_size(folder):
+    with pytest.raises(ValueError):
+        PreLoader(folder, chunk_size=0)
+
+
+def test_run_parallel(tmp_path, pre_loader, entries, fake_database, loaded_frames):
+    pd.DataFrame(entries).to_csv(Path(tmp_path, "source_file_1.csv"), index=False)
+    pd.DataFrame(entries[::-1]).to_csv(Path(tmp_path, "source_file_2.csv"), index=False)
+    # A source file without timestamps fails in its worker.
+    pd.DataFrame(entries).drop(columns="TransactionTime").to_csv(
+        Path(tmp_path, "source_file_0.csv"), index=False
+    )
+
+    parallel_pre_loader = PreLoader(tmp_path.as_posix(), workers=2)
+    parallel_pre_loader.created_at = pre_loader.created_at
+    parallel_pre_loader.run()
+
+    assert [df.source_file.unique().tolist() for df in loaded_frames] == [
+        ["source_file_1.csv"], ["source_file_2.csv"]
+    ]
+    assert fake_database.archived_entries == [entries[3], entries[3]]
+
+    expected_df = pre_loader.transform({"source_file_1.csv": entries})
+    pd.testing.assert_frame_equal(loaded_frames[0], expected_df)
+
+
+def test_invalid_workers(folder):
+    with pytest.raises(ValueError):
+        PreLoader(folder, workers=0)
+
+    with pytest.raises(ValueError):
+        PreLoader(folder, chunk_size=10, workers=2)
+
+    # The pipeline transforms the chunks in the worker processes.
+    assert PreLoader(folder, chunk_size=10, workers=2, pipeline=True).workers == 2
+
+
+@pytest.mark.parametrize("transform_mode", ["row", "columnar"])
+def test_run_pipeline(
+    tmp_path, pre_loader, entries, fake_database, loaded_frames, transform_mode
+):
+    source_file = Path(tmp_path, "source_file_1.csv")
+    pd.DataFrame(entries).to_csv(source_file, index=False)
+
+    pipelined_pre_loader = PreLoader(
+        tmp_path.as_posix(), transform_mode, chunk_size=2, pipeline=True
+    )
+    pipelined_pre_loader.created_at = pre_loader.created_at
+    pipelined_pre_loader.run()
+
+    # Each chunk is committed along with its checkpoint; the source file is recorded at its end.
+    assert len(loaded_frames) == 3
+    assert fake_database.events == [
+        "begin", 2, "commit", "begin", 4, "commit", "begin", 5, "commit", "begin",
+        ["source_file_1.csv"], "commit", "close"
+    ]
+    assert fake_database.archived_entries == [entries[3]]
+    assert pipelined_pre_loader.manifest.entries["source_file_1.csv"]["row_count"] == len(entries)
+
+    expected_df = pre_loader.transform({source_file.name: entries})
+    pipelined_df = pd.concat(loaded_frames, ignore_index=True).astype({"country": object})
+    pd.testing.assert_frame_equal(pipelined_df, expected_df, check_dtype=False)
+
+
+def test_run_pipeline_rolls_back_failed_file(monkeypatch, tmp_path, entries, fake_database):
+    pd.DataFrame(entries).to_csv(Path(tmp_path, "source_file_1.csv"), index=False)
+
+    def load_frame(self, df, con):
+        raise ValueError("Load failed.")
+
+    monkeypatch.setattr(PreLoader, "_load_frame", load_frame)
+
+    with pytest.raises(ValueError):
+        PreLoader(tmp_path.as_posix(), chunk_size=2, pipeline=True).run()
+
+    # The connection is closed without a commit; rolling back the file.
+    assert fake_database.events == ["begin", "close"]
+
+
+def test_skip_duplicate_files(monkeypatch, tmp_path, pre_loader, entries):
+    for source_file in ["source_file_1.csv", "source_file_2.csv", "source_file_3.csv"]:
+        pd.DataFrame(entries).to_csv(Path(tmp_path, source_file), index=False)
+    pd.DataFrame(entries[:2]).to_csv(Path(tmp_path, "source_file_4.csv"), index=False)
+    pd.DataFrame(entries[2:]).to_csv(Path(tmp_path, "source_file_5.csv"), index=False)
+
+    loaded_checksum = pre_loader.manifest._get_checksum(Path(tmp_path, "source_file_4.csv"))
+    recorded_duplicates = {}
+    monkeypatch.setattr(
+        PreLoader, "_extract_db", lambda self, source_files: {"source_file_1.csv"}
+    )
+    monkeypatch.setattr(
+        PreLoader, "_extract_db_checksums",
+        lambda self, checksums: {loaded_checksum: "source_file_0.csv"}
+    )
+    monkeypatch.setattr(
+        PreLoader, "_record_duplicates", lambda self, d: recorded_duplicates.update(d)
+    )
+
+    delta_csv_files = PreLoader(tmp_path.as_posix())._get_delta_files()
+
+    # source_file_3.csv has the same content as source_file_2.csv; it is deferred.
+    assert [file.name for file in delta_csv_files] == ["source_file_2.csv", "source_file_5.csv"]
+    assert recorded_duplicates == {"source_file_4.csv": "source_file_0.csv"}
+
+
+class FakeHashIndexCursor():
+    def __init__(self):
+        self.hash_ids = set()
+        self.rows = []
+
+    def execute(self, query, params=None):
+        if query != pl_queries.INSERT_HASH_INDEX_QUERY:
+            return
+
+        # Inserts the fingerprints into the hash index; returning only the new ones.
+        self.rows = [(hash_id,) for hash_id in params["hash_ids"] if hash_id not in self.hash_ids]
+        self.hash_ids.update(params["hash_ids"])
+
+    def fetchall(self):
+        return self.rows
+
+
+class FakeDBAPIConnection():
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def cursor(self):
+        return nullcontext(self._cursor)
+
+
+@pytest.mark.parametrize("transform_mode", ["row", "columnar"])
+def test_chunked_reload_is_diverted_to_duplicates(
+    monkeypatch, tmp_path, entries, fake_database, transform_mode
+):
+    # The quantity is missing only in the last chunk of the reload.
+    entries[4]["NumberOfItemsPurchased"] = None
+    pd.DataFrame(entries).astype({"NumberOfItemsPurchased": "Int64"}).to_csv(
+        Path(tmp_path, "source_file_1.csv"), index=False
+    )
+
+    fake_database.engine.connection = FakeDBAPIConnection(FakeHashIndexCursor())
+    written_frames = []
+    monkeypatch.setattr(
+        PreLoader, "_write_frame",
+        lambda self, df, table_name, con: written_frames.append((table_name, df))
+    )
+
+    PreLoader(tmp_path.as_posix(), transform_mode).run()
+    loaded_tables = {table_name for table_name, df in written_frames if not df.empty}
+    assert loaded_tables == {tables.PRELOAD_TRANSACTION_TABLE}
+
+    written_frames.clear()
+    PreLoader(tmp_path.as_posix(), transform_mode, chunk_size=2).run()
+
+    # Reloaded in chunks, every entry has the fingerprint of the whole-file load.
+    assert all(
+        df.empty for table_name, df in written_frames
+        if table_name == tables.PRELOAD_TRANSACTION_TABLE
+    )
+    duplicate_df = pd.concat([
+        df for table_name, df in written_frames
+        if table_name == tables.DUPLICATE_TRANSACTION_TABLE
+    ])
+    assert duplicate_df["transaction_id"].tolist() == [0, 1, 2, 4]
@@ -0,0 +1,127 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sdu_qm_task.etl.source_reader import SOURCE_COLUMNS, SOURCE_DTYPES, SourceReader
+
+
+@pytest.fixture
+def source_file(tmp_path):
+    source_file = Path(tmp_path, "source_file_1.csv")
+    source_file.write_text(
+        "UserId,TransactionId,TransactionTime,ItemCode,ItemDescription,"
+        "NumberOfItemsPurchased,CostPerItem,Country,Unused\n"
+        "325794,6365337,Tue Feb 05 13:10:00 IST 2019,472731,RETROSPOT BABUSHKA DOORSTOP,"
+        "6,5.18,United Kingdom,x\n"
+        "-1,6365338,Tue Feb 05 13:10:00 GMT 2019,472732,,,1.25,,y\n"
+    )
+    return source_file
+
+
+@pytest.fixture
+def source_reader():
+    return SourceReader()
+
+
+def test_read(source_reader, source_file):
+    df = source_reader.read(source_file)
+
+    # Only the source columns are read, with the dtypes pandas infers.
+    pd.testing.assert_frame_equal(df, pd.read_csv(source_file).drop(columns="Unused"))
+
+
+def test_read_chunks(source_reader, source_file):
+    chunks = list(source_reader.read_chunks(source_file, 1))
+
+    assert len(chunks) == 2
+    assert list(chunks[0].columns) == SOURCE_COLUMNS
+
+
+def test_read_chunks_file_dtypes(source_reader, source_file):
+    # The quantity is missing in the second chunk only; the description is numeric in it.
+    source_file.write_text(source_file.read_text().replace(",,,1.25,", ",123,,1.25,"))
+
+    chunks = list(source_reader.read_chunks(source_file, 1))
+
+    # Every chunk has the dtypes of the whole file, not those inferred from its own entries.
+    pd.testing.assert_frame_equal(
+        pd.concat(chunks), source_reader.read(source_file), check_index_type=False
+    )
+    assert chunks[0]["NumberOfItemsPurchased"].dtype == np.float64
+    assert chunks[1]["ItemDescription"].tolist() == ["123"]
+
+
+def test_read_mixed_text_column(source_reader, source_file, monkeypatch):
+    source_file.write_text(source_file.read_text().replace(",,,1.25,", ",123,,1.25,"))
+    read_csv = pd.read_csv
+
+    def fake_read_csv(*args, **kwargs):
+        df = read_csv(*args, **kwargs)
+        if "dtype" not in kwargs:
+            # pandas parses a large file in parts; a numeric part of a text column is mixed in.
+            df.loc[1, "ItemDescription"] = 123
+        return df
+
+    monkeypatch.setattr(pd, "read_csv", fake_read_csv)
+
+    df = source_reader.read(source_file)
+
+    # The column is parsed into strings, as in a chunked read.
+    assert df["ItemDescription"].tolist() == ["RETROSPOT BABUSHKA DOORSTOP", "123"]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2])
+def test_read_chunks_skip_rows(source_reader, source_file, chunk_size):
+    # A blank line is not counted as a skipped entry.
+    source_file.write_text(source_file.read_text().replace("\n-1,", "\n\n-1,"))
+
+    chunks = list(source_reader.read_chunks(source_file, chunk_size, skip_rows=1))
+
+    assert [len(chunk) for chunk in chunks] == [1]
+    assert chunks[0]["TransactionId"].tolist() == [6365338]
+    assert list(source_reader.read_chunks(source_file, chunk_size, skip_rows=2)) == []
+
+
+def test_read_skip_rows(source_reader, source_file):
+    df = source_reader.read(source_file, skip_rows=1)
+
+    assert df["TransactionId"].tolist() == [6365338]
+
+
+def test_read_pyarrow(source_reader, source_file):
+    pytest.importorskip("pyarrow")
+
+    pyarrow_df = SourceReader("pyarrow").read(source_file)
+
+    pd.testing.assert_frame_equal(pyarrow_df, source_reader.read(source_file))
+    # Missing text values are NaN, as read by the C parser; not None.
+    assert pyarrow_df["ItemDescription"].tolist()[1] is np.nan
+
+
+def test_to_typed(source_reader, source_file):
+    typed_df, unfit = source_reader.to_typed(source_reader.read(source_file))
+
+    assert {column: str(dtype) for column, dtype in typed_df.dtypes.items()} == SOURCE_DTYPES
+    assert typed_df["UserId"].tolist() == [325794, -1]
+    assert not unfit.any()
+
+
+def test_to_typed_flags_unfit_entries(source_reader, source_file):
+    source_file.write_text(
+        source_file.read_text().replace(",6,", ",6.5,").replace("-1,", "abc,")
+        + "325795,6365339,Tue Feb 05 13:10:00 IST 2019,472733,,1,1.25,,z\n"
+    )
+
+    typed_df, unfit = source_reader.to_typed(source_reader.read(source_file))
+
+    # Non-integral and non-numeric values do not fit the schema; they are not raised.
+    assert unfit.tolist() == [True, True, False]
+    assert typed_df["NumberOfItemsPurchased"].isna().tolist() == [True, True, False]
+    assert typed_df["UserId"].tolist()[1:] == [pd.NA, 325795]
+
+
+def test_invalid_engine():
+    with pytest.raises(ValueError):
+        SourceReader("python")
@@ -0,0 +1,71 @@
+from datetime import datetime
+
+from dateutil import tz
+import pytest
+
+from sdu_qm_task.etl.timestamp_parser import TimestampParser
+
+
+@pytest.fixture
+def parser():
+    return TimestampParser(cache_size=2)
+
+
+@pytest.mark.parametrize("transaction_time", [
+    "Tue Feb 05 13:10:00 IST 2019",
+    "Sun Mar 31 01:30:00 IST 2019",
+    "Sun Oct 27 01:30:00 IST 2019",
+    "Tue Feb 05 13:10:00 UTC 2019",
+    "Tue Feb 05 13:10:00 GMT 2019",
+    "Tue Feb 5 13:10:00 GMT 2019",
+    "Tue Feb 05 13:10:00 XAB 2019",
+])
+def test_fixed_layout_matches_strptime(parser, transaction_time):
+    converted_time = parser.parse(transaction_time)
+
+    if "IST" in transaction_time:
+        expected_time = datetime.strptime(
+            transaction_time.replace(" IST ", " "), "%a %b %d %H:%M:%S %Y"
+        ).astimezone(tz.gettz("Europe/Dublin"))
+    elif "XAB" in transaction_time:
+        expected_time = None
+    else:
+        expected_time = datetime.strptime(transaction_time, "%a %b %d %H:%M:%S %Z %Y")
+
+    assert converted_time == expected_time
+    if expected_time is not None:
+        assert converted_time.tzinfo == expected_time.tzinfo
+
+
+def test_out_of_range_field_raises(parser):
+    with pytest.raises(ValueError):
+        parser.parse("Thu Feb 30 13:10:00 GMT 2019")
+
+
+def test_cache_counters(parser):
+    parser.parse("Tue Feb 05 13:10:00 IST 2019")
+    parser.parse("Tue Feb 05 13:10:00 IST 2019")
+    parser.parse("Tue Feb 05 13:11:00 IST 2019")
+
+    assert (parser.hits, parser.misses) == (1, 2)
+
+    parser.clear()
+    assert (parser.hits, parser.misses) == (0, 0)
+
+
+def test_cache_evicts_least_recently_used(parser):
+    parser.parse("Tue Feb 05 13:10:00 IST 2019")
+    parser.parse("Tue Feb 05 13:11:00 IST 2019")
+    parser.parse("Tue Feb 05 13:10:00 IST 2019")
+    parser.parse("Tue Feb 05 13:12:00 IST 2019")
+
+    # The least recently used entry was evicted; the recently used one was kept.
+    parser.parse("Tue Feb 05 13:10:00 IST 2019")
+    parser.parse("Tue Feb 05 13:11:00 IST 2019")
+
+    assert (parser.hits, parser.misses) == (2, 4)
+
+
+def test_invalid_cache_size():
+    with pytest.raises(ValueError):
+        TimestampParser(cache_size=0)